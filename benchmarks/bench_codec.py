@@ -0,0 +1,198 @@
+"""Micro-benchmarks of the message codec.
+
+Times read_message for every server message, template rendering and
+cached build_message for every client message, checksum functions and
+conversion helpers, and compares them with the checked-in baseline.
+
+Timings are normalized by a pure Python calibration loop timed alternately
+with every benchmark in the same run, so the baseline can be compared
+across machines of different speed. A benchmark regresses when its
+normalized time exceeds the baseline by more than the threshold.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_codec             # compare with baseline
+    python -m benchmarks.bench_codec --update    # record new baseline
+"""
+import argparse
+import json
+from pathlib import Path
+import statistics
+import sys
+import timeit
+
+from custom_components.beny_wifi.communication import _TEMPLATES, build_message, read_message
+from custom_components.beny_wifi.const import (
+    CHARGER_COMMAND,
+    CLIENT_MESSAGE,
+    REQUEST_TYPE,
+    SERVER_MESSAGE,
+    calculate_checksum,
+    validate_checksum,
+)
+from custom_components.beny_wifi.conversions import (
+    convert_pin_to_hex,
+    convert_schedule,
+    convert_serial_to_hex,
+    convert_timer,
+    convert_weekdays_to_dict,
+    convert_weekdays_to_hex,
+    get_hex,
+    get_ip,
+    get_model,
+)
+
+BASELINE_FILE = Path(__file__).with_name("baseline.json")
+DEFAULT_THRESHOLD = 1.3
+REPEAT = 15 # samples of every benchmark, median is compared
+SAMPLE_TIME = 0.05 # seconds of one sample
+
+PIN = convert_pin_to_hex(52020)
+
+SERVER_FRAMES = {
+    SERVER_MESSAGE.HANDSHAKE: "55aa10001103075BCD15c0a801220d0504",
+    SERVER_MESSAGE.SEND_MODEL: "55aa1000200400014243502d4154314e2d4c00000000000000000000011a01df",
+    SERVER_MESSAGE.SEND_VALUES_1P: "55aa10001e70000a00e6001704d27d06000000000000001000000000000d",
+    SERVER_MESSAGE.SEND_VALUES_3P: "55aa100023700d0d0d00e500e500e2005b00af5f06000000000000000f0000000003f6",
+    SERVER_MESSAGE.SEND_DLB: "55aa7b00117b00000000000a0014000529",
+    SERVER_MESSAGE.ACCESS_DENIED: "55aa10000870ff86",
+    SERVER_MESSAGE.SEND_SETTINGS: "55aa100020710201000155000f00197f0c22173b00000101000114060000023f",
+}
+
+CLIENT_PARAMS = {
+    CLIENT_MESSAGE.POLL_DEVICES: {"pin": PIN, "serial": convert_serial_to_hex(123456789)},
+    CLIENT_MESSAGE.REQUEST_DATA: {"pin": PIN, "request_type": get_hex(REQUEST_TYPE.VALUES.value)},
+    CLIENT_MESSAGE.REQUEST_DLB: {"pin": PIN, "request_type": get_hex(REQUEST_TYPE.DLB.value)},
+    CLIENT_MESSAGE.SEND_CHARGER_COMMAND: {"pin": PIN, "charger_command": get_hex(CHARGER_COMMAND.START.value)},
+    CLIENT_MESSAGE.SET_TIMER: {"pin": PIN, **convert_timer("08:00", "10:30")},
+    CLIENT_MESSAGE.RESET_TIMER: {"pin": PIN},
+    CLIENT_MESSAGE.REQUEST_SETTINGS: {"pin": PIN},
+    CLIENT_MESSAGE.SET_SCHEDULE: {"pin": PIN, **convert_schedule([True] * 5 + [False] * 2, "08:00", "10:30")},
+    CLIENT_MESSAGE.SET_MAX_MONTHLY_CONSUMPTION: {"pin": PIN, "maximum_consumption": get_hex(500, 4)},
+    CLIENT_MESSAGE.SET_MAX_SESSION_CONSUMPTION: {"pin": PIN, "maximum_consumption": get_hex(20)},
+    CLIENT_MESSAGE.SET_MAX_CURRENT: {"pin": PIN, "max_current": get_hex(16)},
+}
+
+
+def calibration() -> int:
+    """Pure Python reference workload of hex formatting, parsing and dict access like the codec."""
+    total = 0
+    values = {}
+    for i in range(1000):
+        digits = f"{i:04x}"
+        total += int(digits, 16)
+        values[digits] = total
+    return len(values)
+
+
+def benchmarks() -> dict:
+    """Return benchmarked callables by name."""
+    cases = {}
+    for message, frame in SERVER_FRAMES.items():
+        cases[f"read_message[{message.name}]"] = lambda frame=frame: read_message(frame)
+    for message, params in CLIENT_PARAMS.items():
+        # build_message caches frames of repeated params, render times the template itself
+        cases[f"render[{message.name}]"] = lambda template=_TEMPLATES[message], params=params: template.render(params)
+        cases[f"build_message_cached[{message.name}]"] = (
+            lambda message=message, params=params: build_message(message, params)
+        )
+
+    values = SERVER_FRAMES[SERVER_MESSAGE.SEND_VALUES_3P]
+    handshake = SERVER_FRAMES[SERVER_MESSAGE.HANDSHAKE]
+    model = SERVER_FRAMES[SERVER_MESSAGE.SEND_MODEL]
+    cases.update({
+        "calculate_checksum": lambda: calculate_checksum(values),
+        "validate_checksum": lambda: validate_checksum(values),
+        "get_model": lambda: get_model(model),
+        "get_ip": lambda: get_ip(handshake),
+        "convert_timer": lambda: convert_timer("08:00", "10:30"),
+        "convert_schedule": lambda: convert_schedule([True] * 5 + [False] * 2, "08:00", "10:30"),
+        "convert_weekdays_to_dict": lambda: convert_weekdays_to_dict(0x1F),
+        "convert_weekdays_to_hex": lambda: convert_weekdays_to_hex([True] * 5 + [False] * 2),
+        "convert_serial_to_hex": lambda: convert_serial_to_hex(123456789),
+        "convert_pin_to_hex": lambda: convert_pin_to_hex(52020),
+    })
+    return cases
+
+
+def calls_per_sample(timer: timeit.Timer) -> int:
+    """Return number of calls taking about SAMPLE_TIME seconds."""
+    number, seconds = timer.autorange()
+    return max(int(number * SAMPLE_TIME / seconds), 1)
+
+
+def measure(func, reference: tuple[timeit.Timer, int]) -> tuple[float, float]:
+    """Return best time of func call in nanoseconds, and its time relative to calibration.
+
+    Every repeat of func is timed right after a repeat of the calibration
+    loop and the median of their ratios is taken, so the relative time does
+    not follow machine speed changing during the run.
+    """
+    timer = timeit.Timer(func)
+    number = calls_per_sample(timer)
+    reference_timer, reference_number = reference
+    times = []
+    ratios = []
+    for _ in range(REPEAT):
+        reference_time = reference_timer.timeit(reference_number) / reference_number
+        times.append(timer.timeit(number) / number)
+        ratios.append(times[-1] / reference_time)
+    return min(times) * 1e9, statistics.median(ratios)
+
+
+def run() -> dict:
+    """Run all benchmarks, return results with calibration time."""
+    reference = timeit.Timer(calibration)
+    reference_number = calls_per_sample(reference)
+    calibration_ns = statistics.median(reference.repeat(REPEAT, reference_number)) / reference_number * 1e9
+
+    results = {"calibration_ns": calibration_ns, "benchmarks": {}, "relative": {}}
+    for name, func in benchmarks().items():
+        results["benchmarks"][name], results["relative"][name] = measure(func, (reference, reference_number))
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """Print results against baseline, return names of regressed benchmarks."""
+    regressions = []
+
+    print(f"{'benchmark':50} {'ns':>10} {'baseline':>10} {'ratio':>7}")
+    for name, ns in results["benchmarks"].items():
+        base = baseline["relative"].get(name)
+        if base is None:
+            print(f"{name:50} {ns:10.0f} {'-':>10} {'new':>7}")
+            continue
+
+        ratio = results["relative"][name] / base
+        flag = "  REGRESSION" if ratio > threshold else ""
+        print(f"{name:50} {ns:10.0f} {base * results['calibration_ns']:10.0f} {ratio:7.2f}{flag}")
+        if ratio > threshold:
+            regressions.append(name)
+
+    return regressions
+
+
+def main() -> int:
+    """Run benchmarks, compare with or update baseline."""
+    parser = argparse.ArgumentParser(description="Benchmark the Beny Wifi message codec.")
+    parser.add_argument("--update", action="store_true", help="write results as new baseline")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_FILE, help="baseline json file")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="allowed slowdown ratio")
+    args = parser.parse_args()
+
+    results = run()
+
+    if args.update or not args.baseline.exists():
+        args.baseline.write_text(json.dumps(results, indent=4, sort_keys=True) + "\n")
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    regressions = compare(results, json.loads(args.baseline.read_text()), args.threshold)
+    if regressions:
+        print(f"{len(regressions)} benchmarks regressed more than {args.threshold}x: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
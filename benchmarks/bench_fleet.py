@@ -0,0 +1,262 @@
+"""Fleet load benchmark of the update coordinator.
+
+Starts the charger simulator with N stateful virtual chargers in a
+subprocess and polls them with N BenyWifiUpdateCoordinator instances
+sharing one endpoint and scheduler, as async_setup_entry sets them up.
+After a fixed duration refresh latency percentiles, refresh slip (delay of
+refresh start past its interval), failed refresh rate, request timeout
+rate, event loop lag, executor queue depth, CPU time and RSS are written
+to a json file.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_fleet --chargers 100 --interval 10 --duration 120
+"""
+import argparse
+import asyncio
+import json
+from pathlib import Path
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.beny_wifi.const import (
+    CONF_PIN,
+    DLB,
+    FAST_SCAN_INTERVAL,
+    IDLE_SCAN_INTERVAL,
+    SERIAL,
+)
+from custom_components.beny_wifi.coordinator import BenyWifiUpdateCoordinator
+from custom_components.beny_wifi.scheduler import FleetScheduler
+from custom_components.beny_wifi.transport import BenyWifiEndpoint
+
+ROOT = Path(__file__).resolve().parent.parent
+TOOLS = ROOT / "tools"
+MANIFEST = ROOT / "custom_components" / "beny_wifi" / "manifest.json"
+
+PIN = "0cb34"
+FIRST_SERIAL = 100000000
+FIRST_PORT = 40000
+LAG_INTERVAL = 0.1 # seconds between event loop lag probes
+SAMPLE_INTERVAL = 1 # seconds between executor queue samples
+
+
+def percentiles(values: list[float]) -> dict:
+    """Return min, p50, p95, p99 and max of values in milliseconds."""
+    if not values:
+        return {}
+
+    values = sorted(values)
+
+    def at(fraction: float) -> float:
+        return round(values[min(int(len(values) * fraction), len(values) - 1)] * 1000, 3)
+
+    return {"min": at(0), "p50": at(0.5), "p95": at(0.95), "p99": at(0.99), "max": at(1)}
+
+
+def rss_kb() -> int:
+    """Return current resident set size in kB, peak if current is not available."""
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def git_revision() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class Probe:
+    """Timing of refreshes of one coordinator."""
+
+    def __init__(self, coordinator: BenyWifiUpdateCoordinator, results: dict) -> None:
+        self.coordinator = coordinator
+        self.results = results
+        self.last_start = None
+        self.measuring = True
+        update = coordinator._async_update_data
+
+        async def timed_update():
+            if not self.measuring:
+                return await update()
+            start = time.monotonic()
+            if self.last_start is not None:
+                expected = self.last_start + coordinator.poll_interval.total_seconds()
+                results["slip"].append(max(start - expected, 0.0))
+            self.last_start = start
+            try:
+                return await update()
+            except Exception:
+                if self.measuring:
+                    results["failed"] += 1
+                raise
+            finally:
+                if self.measuring:
+                    results["refreshes"] += 1
+                    results["latency"].append(time.monotonic() - start)
+
+        coordinator._async_update_data = timed_update
+
+
+async def monitor_loop(results: dict, stop: asyncio.Event) -> None:
+    """Sample event loop lag and executor queue depth until stopped."""
+    loop = asyncio.get_running_loop()
+    executor = getattr(loop, "_default_executor", None)
+    next_sample = loop.time()
+    while not stop.is_set():
+        start = loop.time()
+        await asyncio.sleep(LAG_INTERVAL)
+        results["loop_lag"].append(loop.time() - start - LAG_INTERVAL)
+
+        if loop.time() >= next_sample:
+            queue = getattr(executor, "_work_queue", None)
+            results["executor_queue"].append(queue.qsize() if queue is not None else 0)
+            next_sample += SAMPLE_INTERVAL
+
+
+def start_simulator(args: argparse.Namespace, config_file: str) -> subprocess.Popen:
+    command = [
+        sys.executable, "charger_simulator.py",
+        "--config", config_file,
+        "--count", str(args.chargers),
+        "--port", str(args.port),
+        "--serial", str(FIRST_SERIAL),
+        "--stateful",
+        "--speed", str(args.speed),
+        "--stats-interval", str(args.duration + 60),
+        *args.simulator_args,
+    ]
+    return subprocess.Popen(command, cwd=TOOLS, stdout=subprocess.DEVNULL)
+
+
+async def run(args: argparse.Namespace) -> dict:
+    results = {
+        "latency": [], "slip": [], "loop_lag": [], "executor_queue": [],
+        "refreshes": 0, "failed": 0,
+    }
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        config_file = str(Path(config_dir) / "responses.json")
+        Path(config_file).write_text(json.dumps({"responses": {}}))
+        simulator = start_simulator(args, config_file)
+
+        hass = HomeAssistant(config_dir)
+        endpoint = BenyWifiEndpoint()
+        scheduler = FleetScheduler()
+        coordinators = []
+        probes = []
+        unsubscribe = []
+        stop = asyncio.Event()
+        try:
+            await asyncio.sleep(args.startup)
+
+            for i in range(args.chargers):
+                entry = SimpleNamespace(
+                    entry_id=f"bench_{i}",
+                    pref_disable_polling=False,
+                    data={
+                        SERIAL: str(FIRST_SERIAL + i),
+                        CONF_PIN: PIN,
+                        DLB: args.dlb,
+                        FAST_SCAN_INTERVAL: args.interval,
+                        IDLE_SCAN_INTERVAL: args.interval,
+                    },
+                )
+                coordinator = BenyWifiUpdateCoordinator(
+                    hass, entry, "127.0.0.1", args.port + i, args.interval, endpoint, scheduler
+                )
+                probes.append(Probe(coordinator, results))
+                coordinators.append(coordinator)
+
+            monitor = asyncio.create_task(monitor_loop(results, stop))
+            cpu_start = time.process_time()
+            wall_start = time.monotonic()
+
+            # listeners make coordinators schedule their refreshes
+            for coordinator in coordinators:
+                unsubscribe.append(coordinator.async_add_listener(lambda: None))
+            await asyncio.sleep(args.duration)
+
+            cpu = time.process_time() - cpu_start
+            wall = time.monotonic() - wall_start
+            # polls cancelled by shutdown are not counted
+            for probe in probes:
+                probe.measuring = False
+            requests = sum(coordinator.transport.stats.requests for coordinator in coordinators)
+            timeouts = sum(coordinator.transport.stats.timeouts for coordinator in coordinators)
+            stop.set()
+            await monitor
+        finally:
+            for remove in unsubscribe:
+                remove()
+            for coordinator in coordinators:
+                await coordinator.async_shutdown()
+            await hass.async_stop(force=True)
+            simulator.terminate()
+            simulator.wait()
+
+    refreshes = results["refreshes"]
+    return {
+        "version": json.loads(MANIFEST.read_text()).get("version"),
+        "revision": git_revision(),
+        "python": sys.version.split()[0],
+        "config": {
+            "chargers": args.chargers,
+            "interval": args.interval,
+            "duration": args.duration,
+            "dlb": args.dlb,
+            "simulator_args": args.simulator_args,
+        },
+        "refreshes": refreshes,
+        "refreshes_per_second": round(refreshes / wall, 3),
+        "expected_refreshes_per_second": round(args.chargers / args.interval, 3),
+        "failure_rate": round(results["failed"] / refreshes, 4) if refreshes else None,
+        "timeout_rate": round(timeouts / requests, 4) if requests else None,
+        "refresh_latency_ms": percentiles(results["latency"]),
+        "refresh_slip_ms": percentiles(results["slip"]),
+        "loop_lag_ms": percentiles(results["loop_lag"]),
+        "executor_queue_max": max(results["executor_queue"], default=0),
+        "cpu_percent": round(cpu / wall * 100, 2),
+        "rss_kb": rss_kb(),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Poll simulated chargers with N coordinators and report load.")
+    parser.add_argument("--chargers", type=int, default=50, help="number of chargers and coordinators")
+    parser.add_argument("--interval", type=int, default=10, help="update interval in seconds")
+    parser.add_argument("--duration", type=float, default=60, help="seconds of polling measured")
+    parser.add_argument("--port", type=int, default=FIRST_PORT, help="port of first simulated charger")
+    parser.add_argument("--speed", type=float, default=60, help="simulated seconds per second")
+    parser.add_argument("--dlb", action="store_true", help="request DLB values too")
+    parser.add_argument("--startup", type=float, default=2, help="seconds waited for simulator to start")
+    parser.add_argument("--output", "-o", type=Path, default=Path("fleet_results.json"), help="result json file")
+    parser.add_argument(
+        "simulator_args", nargs="*",
+        help="extra simulator options after --, e.g. -- --loss 0.05 --latency 0.02",
+    )
+    args = parser.parse_args()
+
+    result = asyncio.run(run(args))
+    args.output.write_text(json.dumps(result, indent=4) + "\n")
+    print(json.dumps(result, indent=4))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
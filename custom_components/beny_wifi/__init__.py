@@ -3,9 +3,11 @@ import logging
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import ConfigEntryNotReady
-from .const import DOMAIN, IP_ADDRESS, PLATFORMS, PORT, SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL
+from .const import DOMAIN, ENDPOINT, SCHEDULER, IP_ADDRESS, PLATFORMS, PORT, SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL
 from .coordinator import BenyWifiUpdateCoordinator
+from .scheduler import FleetScheduler
 from .services import async_setup_services
+from .transport import BenyWifiEndpoint
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -19,14 +21,24 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     scan_interval = entry.data.get(SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
     _LOGGER.info(f"Using scan interval: {scan_interval} seconds") # Add this line
     
+    # All chargers share one UDP socket and poll in their own time slots
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    endpoint = domain_data.setdefault(ENDPOINT, BenyWifiEndpoint())
+    scheduler = domain_data.setdefault(SCHEDULER, FleetScheduler())
+
     # Create the DataUpdateCoordinator - FIXED: Pass config_entry
-    coordinator = BenyWifiUpdateCoordinator(hass, entry, ip_address, port, scan_interval)
+    coordinator = BenyWifiUpdateCoordinator(
+        hass, entry, ip_address, port, scan_interval, endpoint, scheduler
+    )
     
+    await coordinator.async_load_rtt()
+
     # Perform the first update to ensure connection works
     try:
         await coordinator.async_config_entry_first_refresh()
     except Exception as ex:
         _LOGGER.error(f"Error setting up coordinator: {ex}")  # noqa: G004
+        await coordinator.async_shutdown()
         raise ConfigEntryNotReady from ex
     
     # Store the coordinator for use by platforms
@@ -52,6 +64,7 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     
     # Clean up resources
     if unload_ok:
-        hass.data[DOMAIN].pop(entry.entry_id)
+        coordinator = hass.data[DOMAIN].pop(entry.entry_id)["coordinator"]
+        await coordinator.async_shutdown()
     
     return unload_ok
\ No newline at end of file
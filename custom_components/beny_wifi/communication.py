@@ -1,4 +1,10 @@
-import logging  # noqa: D100
+import binascii  # noqa: D100
+from collections.abc import Callable
+from enum import Enum
+from functools import lru_cache
+import logging
+import re
+import struct
 
 from .const import (  # noqa: D100
     CHARGER_COMMAND,
@@ -9,22 +15,226 @@ from .const import (  # noqa: D100
     SERVER_MESSAGE,
     TIMER_STATE,
     calculate_checksum,
-    validate_checksum,
 )
 from .conversions import (  # type: ignore  # noqa: PGH003
     convert_weekdays_to_dict,
-    get_ip,
-    get_message_type,
+    find_message_type,
+    get_message_type,  # noqa: F401
     get_model,
 )
+from .models import ChargerSample
 
 _LOGGER = logging.getLogger(__name__)
 
-def read_message(data, msg_type:str | None = None) -> dict:  # noqa: C901
+_INT_FORMATS = {1: "B", 2: "H", 4: "I"}
+
+
+class _Layout:
+    """Precompiled binary layout of a message structure.
+
+    Structure tables define fields as slices of the ascii hex string. A field
+    covers whole bytes of the decoded message, except fields starting or
+    ending at odd hex positions, which are shifted and masked out of the
+    bytes covering them. Fields that fit a struct integer format are read
+    with a single ``unpack_from``, others (e.g. 3 byte fields) separately.
+    """
+
+    __slots__ = ("length", "masked", "names", "others", "struct")
+
+    def __init__(self, structure: dict[str, slice]) -> None:
+        """Compile layout of structure. Stepped and open ended slices are skipped."""
+        fields = sorted(
+            (pos.start // 2, (pos.stop + 1) // 2, 4 * (pos.stop % 2), (1 << 4 * (pos.stop - pos.start)) - 1, name)
+            for name, pos in structure.items()
+            if pos.step is None and pos.stop is not None and pos.stop > 0
+        )
+
+        fmt = ">"
+        offset = 0
+        names = []
+        masks = []
+        others = []
+        for first, last, shift, mask, name in fields:
+            size = last - first
+            if first < offset or size not in _INT_FORMATS:
+                others.append((name, first, last, shift, mask))
+                continue
+            if first > offset:
+                fmt += f"{first - offset}x"
+            fmt += _INT_FORMATS[size]
+            offset = last
+            names.append(name)
+            masks.append(None if shift == 0 and mask == (1 << 8 * size) - 1 else (shift, mask))
+
+        self.struct = struct.Struct(fmt)
+        self.names = tuple(names)
+        self.masked = tuple((name, mask) for name, mask in zip(names, masks) if mask is not None)
+        self.others = tuple(others)
+        self.length = max([offset] + [last for _, _, last, _, _ in others])
+
+    def unpack(self, frame: memoryview) -> dict[str, int]:
+        """Read field values from binary message."""
+        if len(frame) < self.length:
+            raise ValueError(f"message too short: {len(frame)} < {self.length} bytes")
+
+        values = dict(zip(self.names, self.struct.unpack_from(frame)))
+        for name, field in self.masked:
+            values[name] = (values[name] >> field[0]) & field[1]
+        for name, first, last, shift, mask in self.others:
+            values[name] = (int.from_bytes(frame[first:last], "big") >> shift) & mask
+        return values
+
+
+def _enum_name(enum: type[Enum]) -> Callable[[int], str]:
+    """Return conversion of enum value to name, done as tuple lookup."""
+    names = [None] * (max(member.value for member in enum) + 1)
+    for member in enum:
+        names[member.value] = member.name
+    names = tuple(names)
+
+    def convert(value: int) -> str:
+        name = names[value] if value < len(names) else None
+        if name is None:
+            raise ValueError(f"{value} is not a valid {enum.__name__}")
+        return name
+
+    return convert
+
+
+def _tenths(value: int) -> float:
+    return value / 10
+
+
+# conversions of field values by field name, other fields are kept as int
+_CONVERTERS = {
+    "state": _enum_name(CHARGER_STATE),
+    "timer_state": _enum_name(TIMER_STATE),
+    "request_type": _enum_name(REQUEST_TYPE),
+    "charger_command": _enum_name(CHARGER_COMMAND),
+    "total_kwh": _tenths,
+    "solar_power": _tenths,
+    "ev_power": _tenths,
+    "house_power": _tenths,
+    "grid_power": _tenths,
+    "grid_export": bool,
+    "weekdays": lambda value: convert_weekdays_to_dict(value),
+}
+
+# fields derived from field values: field name -> (derived field name, conversion)
+_DERIVED = {
+    "weekdays": ("schedule", lambda value: "enabled" if value else "disabled"),
+}
+
+_IP = SERVER_MESSAGE.HANDSHAKE.value["structure"]["ip"]
+_IP_BYTES = slice(_IP.start // 2, _IP.stop // 2)
+
+# fields not fitting a binary layout, read from (frame, ascii hex message)
+_READERS = {
+    "ip": lambda frame, data: ".".join(map(str, frame[_IP_BYTES])),
+    "model": lambda frame, data: get_model(data if isinstance(data, str) else data.decode("ascii")),
+}
+
+
+class _Decoder:
+    """Precompiled decoder of a message.
+
+    Fields are read with the binary layout of message structure and
+    converted with the conversions of their field names.
+    """
+
+    __slots__ = ("converters", "derived", "layout", "readers")
+
+    def __init__(self, structure: dict[str, slice]) -> None:
+        """Compile decoder of structure."""
+        self.layout = _Layout(structure)
+        self.converters = tuple((name, _CONVERTERS[name]) for name in structure if name in _CONVERTERS)
+        self.derived = tuple((name, *_DERIVED[name]) for name in structure if name in _DERIVED)
+        self.readers = tuple((name, _READERS[name]) for name in structure if name in _READERS)
+
+    def decode(self, frame: memoryview, data: str | bytes, msg: dict) -> None:
+        """Decode message fields to msg."""
+        values = self.layout.unpack(frame)
+        for name, derived, convert in self.derived:
+            msg[derived] = convert(values[name])
+        for name, convert in self.converters:
+            try:
+                values[name] = convert(values[name])
+            except ValueError:
+                _LOGGER.error(f"Invalid value for {name}: {values[name]}")  # noqa: G004
+                values[name] = None
+        msg.update(values)
+        for name, read in self.readers:
+            msg[name] = read(frame, data)
+
+
+_HEADER = _Layout(COMMON.FIXED_PART.value["structure"])
+_RESPONSE_CODE = COMMON.REQUEST_CODE.value["structure"]["response"].start // 2
+_DECODERS = {message: _Decoder(message.value["structure"]) for message in (*SERVER_MESSAGE, *CLIENT_MESSAGE)}
+
+
+def decode_frame(data: str | bytes) -> memoryview | None:
+    """Convert ascii hex message to bytes and validate its checksum.
+
+    Args:
+        data (str | bytes): message as ascii hex string or received datagram
+
+    Returns:
+        memoryview: binary message or None if message is not valid
+
+    """
+    try:
+        frame = binascii.unhexlify(data)
+    except (binascii.Error, ValueError):
+        _LOGGER.debug(f"Invalid hex message: {data!r}")  # noqa: G004
+        return None
+
+    if len(frame) < 2 or sum(frame[:-1]) % 256 != frame[-1]:
+        _LOGGER.debug(f"Invalid checksum: {data!r}")  # noqa: G004
+        return None
+
+    return memoryview(frame)
+
+def get_frame_type(frame: memoryview, header: dict[str, int] | None = None) -> SERVER_MESSAGE | CLIENT_MESSAGE:
+    """Get message structure of binary message from MESSAGE_TYPES table.
+
+    Args:
+        frame (memoryview): binary message
+        header (dict[str, int] | None): header fields if already read
+
+    Returns:
+        SERVER_MESSAGE | CLIENT_MESSAGE: message or None if message is unknown
+
+    Raises:
+        ValueError: message is too short
+
+    """
+    if header is None:
+        header = _HEADER.unpack(frame)
+    code = frame[_RESPONSE_CODE] if len(frame) > _RESPONSE_CODE else None
+
+    return find_message_type(header["message_type"], header["message_id"], code)
+
+def get_frame_code(frame: memoryview) -> int:
+    """Get request type or command code echoed in binary server message.
+
+    Args:
+        frame (memoryview): binary message
+
+    Returns:
+        int: request code
+
+    """
+    return frame[_RESPONSE_CODE]
+
+def read_message(data: str | bytes, msg_type: SERVER_MESSAGE | CLIENT_MESSAGE | None = None) -> dict:
     """Convert ascii hex string to dict.
 
+    Message is converted to bytes once. Message type is found from
+    MESSAGE_TYPES table and fields are read with precompiled decoder of
+    the message.
+
     Args:
-        data (str): beny client or server message as ascii hex string
+        data (str | bytes): beny client or server message as ascii hex string
         msg_type (str): if message type is not autodetected
 
     Returns:
@@ -33,103 +243,169 @@ def read_message(data, msg_type:str | None = None) -> dict:  # noqa: C901
     """
 
     # check if checksum matches before trying to translate
-    if not validate_checksum(data):
+    frame = decode_frame(data)
+    if frame is None:
         return None
 
+    # common message header parameters first
+    msg = _HEADER.unpack(frame)
+
     if not msg_type:
         # try to find out message type automatically
-        msg_type = get_message_type(data)
+        msg_type = get_frame_type(frame, msg)
 
-    msg = {"message_type": str(msg_type)}
+    # name of message replaces message type number of the header
+    msg["message_type"] = str(msg_type)
 
-    # common message header parameters first
-    for param, pos in COMMON.FIXED_PART.value["structure"].items():
-        msg[param] = int(data[pos], 16)
+    decoder = _DECODERS.get(msg_type)
+    if decoder is not None:
+        decoder.decode(frame, data, msg)
 
-    # server sends 1-phase or 3-phase values like voltages, currents etc.
-    if msg_type in (SERVER_MESSAGE.SEND_VALUES_1P, SERVER_MESSAGE.SEND_VALUES_3P):
-        for param, pos in msg_type.value["structure"].items():
-            value = int(data[pos], 16)
-            try:
-                if param == "state":
-                    msg[param] = CHARGER_STATE(value).name
-                elif param == "timer_state":
-                    msg[param] = TIMER_STATE(value).name
-                elif param == "total_kwh":
-                    msg[param] = float(value) / 10
-                elif param == "request_type":
-                    msg[param] = REQUEST_TYPE(value).name
-                else:
-                    msg[param] = value
-            except ValueError:
-                _LOGGER.error(f"Invalid value for {param}: value")  # noqa: G004
-                msg[param] = None
+    if _LOGGER.isEnabledFor(logging.DEBUG):
+        _LOGGER.debug(f"Message received: {data}={msg}")  # noqa: G004
 
-    if msg_type == SERVER_MESSAGE.SEND_DLB:
-        for param, pos in msg_type.value["structure"].items():
-            value = int(data[pos], 16)
+    return msg
+
+# conversions of charger values to sensor units, other fields are kept as int
+_SAMPLE_CONVERTERS = {
+    "state": _CONVERTERS["state"],
+    "timer_state": _CONVERTERS["timer_state"],
+    "power": _tenths,
+    "total_kwh": _tenths,
+    "temperature": lambda value: value - 100,
+}
+
+_SAMPLE_DECODERS = {
+    message: tuple(
+        (name, _SAMPLE_CONVERTERS.get(name))
+        for name in message.value["structure"]
+        if name in ChargerSample.__slots__
+    )
+    for message in (SERVER_MESSAGE.SEND_VALUES_1P, SERVER_MESSAGE.SEND_VALUES_3P)
+}
+
+
+def read_sample(frame: memoryview, msg_type: SERVER_MESSAGE) -> ChargerSample:
+    """Decode charger values message to ChargerSample.
+
+    Args:
+        frame (memoryview): binary message, see decode_frame
+        msg_type (SERVER_MESSAGE): SEND_VALUES_1P or SEND_VALUES_3P
+
+    Returns:
+        ChargerSample: charger readings
+
+    Raises:
+        ValueError: message is not a values message or is too short
+
+    """
+    if msg_type not in _SAMPLE_DECODERS:
+        raise ValueError(f"{msg_type} is not a values message")
+
+    values = _DECODERS[msg_type].layout.unpack(frame)
+    sample = ChargerSample()
+    for name, convert in _SAMPLE_DECODERS[msg_type]:
+        value = values[name]
+        if convert is not None:
             try:
-                if param in ["grid_power", "ev_power", "house_power", "solar_power"]:
-                    msg[param] = float(value) / 10
-                elif param == "grid_export":
-                    if int(value) > 0:
-                        msg[param] = True
-                    else:
-                        msg[param] = False
-                elif param == "request_type":
-                    msg[param] = REQUEST_TYPE(value).name
-                else:
-                    msg[param] = value
+                value = convert(value)
             except ValueError:
-                _LOGGER.error(f"Invalid value for {param}: value")  # noqa: G004
-                msg[param] = None
-
-    # server sends charger model
-    if msg_type == SERVER_MESSAGE.SEND_MODEL:
-        for param, pos in msg_type.value["structure"].items():
-            if param == "model":
-                msg["model"] = get_model(data)
-            elif param == "request_type":
-                msg[param] = REQUEST_TYPE(int(data[pos], 16)).name
-
-    # handshake - server sends serial, ip and port
-    elif msg_type == SERVER_MESSAGE.HANDSHAKE:
-        msg["serial"] = int(data[SERVER_MESSAGE.HANDSHAKE.value["structure"]["serial"]], 16)
-        msg["ip"] = get_ip(data)
-        msg["port"] = int(data[SERVER_MESSAGE.HANDSHAKE.value["structure"]["port"]], 16)
-
-    # server sends settings
-    if msg_type == SERVER_MESSAGE.SEND_SETTINGS:
-        for param, pos in msg_type.value["structure"].items():
-            value = int(data[pos], 16)
-            if param == "weekdays":
-                if value == 0:
-                    msg["schedule"] = "disabled"
-                else:
-                    msg["schedule"] = "enabled"
-
-                msg[param] = convert_weekdays_to_dict(value)
-            else:
-                msg[param] = value
-
-    # client sends command to start or stop the charging
-    elif msg_type == CLIENT_MESSAGE.SEND_CHARGER_COMMAND:
-        for param, pos in msg_type.value["structure"].items():
-            msg[param] =  CHARGER_COMMAND(int(data[pos], 16)).name
-
-    # client sends data request
-    # ("values" or "model" are known at the moment)
-    elif msg_type == CLIENT_MESSAGE.REQUEST_DATA:
-        for param, pos in msg_type.value["structure"].items():
-            msg[param] = REQUEST_TYPE(int(data[pos], 16)).name
-
-    elif msg_type == CLIENT_MESSAGE.SET_TIMER:
-        for param, pos in msg_type.value["structure"].items():
-            msg[param] = int(data[pos], 16)
-
-    _LOGGER.debug(f"Message received: {data}={msg}")  # noqa: G004
+                _LOGGER.error(f"Invalid value for {name}: {value}")  # noqa: G004
+                value = None
+        setattr(sample, name, value)
 
-    return msg
+    return sample
+
+def read_dlb_sample(frame: memoryview, sample: ChargerSample) -> None:
+    """Decode DLB message to DLB fields of sample.
+
+    Args:
+        frame (memoryview): binary message, see decode_frame
+        sample (ChargerSample): sample updated
+
+    Raises:
+        ValueError: message is too short
+
+    """
+    values = _DECODERS[SERVER_MESSAGE.SEND_DLB].layout.unpack(frame)
+    grid_power = values["grid_power"] / 100
+    sample.grid_import = 0 if values["grid_export"] else grid_power
+    sample.grid_export = grid_power if values["grid_export"] else 0
+    sample.house_power = values["house_power"] / 100
+    sample.ev_power = values["ev_power"] / 100
+    sample.solar_power = values["solar_power"] / 100
+
+
+class _Template:
+    """Precompiled message template.
+
+    Template is split to constant segments and parameter placeholders once.
+    Checksum of the constant segments is precomputed for both even and odd
+    start positions, as parameter values may have odd number of digits (e.g.
+    pin), so only parameter values are summed when message is built.
+    """
+
+    __slots__ = ("parts", "tail")
+
+    def __init__(self, template: str) -> None:
+        """Compile template."""
+        head, _, self.tail = template.partition("[checksum]")
+        split = _PLACEHOLDER.split(head)
+        self.parts = tuple(
+            (segment, (_hex_sum(segment, False), _hex_sum(segment, True)), param)
+            for segment, param in zip(split[::2], [*split[1::2], None])
+        )
+
+    def render(self, params: dict[str, str]) -> str:
+        """Fill in parameters and checksum."""
+        pieces = []
+        checksum = 0
+        odd = False
+        for segment, sums, param in self.parts:
+            pieces.append(segment)
+            checksum += sums[odd]
+            odd ^= len(segment) % 2 == 1
+            if param is None:
+                break
+            if param not in params:
+                raise ValueError(f"Missing parameter: {param}")
+            value = params[param]
+            pieces.append(value)
+            checksum += _hex_sum(value, odd)
+            odd ^= len(value) % 2 == 1
+
+        msg = "".join(pieces)
+        if odd:
+            # odd number of digits, last digit is summed as it is
+            checksum = calculate_checksum(msg + "[checksum]")
+
+        return f"{msg}{checksum % 256:02x}{self.tail}"
+
+
+_PLACEHOLDER = re.compile(r"\[(\w+)\]")
+
+
+def _hex_sum(digits: str, odd: bool) -> int:
+    """Return sum of message bytes covered by hex digits starting at odd or even position."""
+    # pad digits to whole bytes, padding does not change the sum
+    if odd:
+        digits = "0" + digits
+    if len(digits) % 2:
+        digits += "0"
+    return sum(bytes.fromhex(digits))
+
+
+_TEMPLATES = {
+    message: _Template(message.value["hex"])
+    for message in (*SERVER_MESSAGE, *CLIENT_MESSAGE)
+    if "hex" in message.value
+}
+
+
+@lru_cache(maxsize=128)
+def _render(message: SERVER_MESSAGE | CLIENT_MESSAGE, params: tuple[tuple[str, str], ...]) -> str:
+    """Render message, frames of messages with fixed parameters (e.g. requests with pin) are cached."""
+    return _TEMPLATES[message].render(dict(params))
 
 def build_message(message: SERVER_MESSAGE | CLIENT_MESSAGE, params: dict = {}) -> str:
     """Build command message that can be sent to charger.
@@ -141,16 +417,13 @@ def build_message(message: SERVER_MESSAGE | CLIENT_MESSAGE, params: dict = {}) -
     Returns:
         str: ascii hex string
 
-    """
-
-    msg = message.value["hex"]
-    for param, val in params.items():
-        if param in msg:
-            msg = msg.replace("[" + param + "]", val)
+    Raises:
+        ValueError: parameter of message is missing or is not hex
 
-    checksum = calculate_checksum(msg)
+    """
 
-    msg = msg.replace("[checksum]", f"{checksum:02x}")
-    _LOGGER.debug(f"Message sent. Type: {message.name}. Content: {msg!s}={params}")  # noqa: G004
+    msg = _render(message, tuple(params.items()))
+    if _LOGGER.isEnabledFor(logging.DEBUG):
+        _LOGGER.debug(f"Message sent. Type: {message.name}. Content: {msg!s}={params}")  # noqa: G004
 
     return msg
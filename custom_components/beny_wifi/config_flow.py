@@ -14,11 +14,16 @@ from .const import (
     CLIENT_MESSAGE,
     CONF_PIN,
     CONF_SERIAL,
+    DEFAULT_FAST_SCAN_INTERVAL,
+    DEFAULT_IDLE_SCAN_INTERVAL,
     DEFAULT_PORT,
     DEFAULT_SCAN_INTERVAL,
+    DEFAULT_TIMER_LEAD_TIME,
     DLB,
     DLB_CHARGERS,
     DOMAIN,
+    FAST_SCAN_INTERVAL,
+    IDLE_SCAN_INTERVAL,
     IP_ADDRESS,
     MODEL,
     PORT,
@@ -27,6 +32,7 @@ from .const import (
     SERIAL,
     SINGLE_PHASE_CHARGERS,
     THREE_PHASE_CHARGERS,
+    TIMER_LEAD_TIME,
 )
 from .conversions import convert_pin_to_hex, convert_serial_to_hex, get_hex
 
@@ -100,6 +106,9 @@ class BenyWifiConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                     vol.Required(CONF_SERIAL): str,
                     vol.Required(CONF_PIN): str,
                     vol.Optional(SCAN_INTERVAL, default=DEFAULT_SCAN_INTERVAL): int,
+                    vol.Optional(FAST_SCAN_INTERVAL, default=DEFAULT_FAST_SCAN_INTERVAL): int,
+                    vol.Optional(IDLE_SCAN_INTERVAL, default=DEFAULT_IDLE_SCAN_INTERVAL): int,
+                    vol.Optional(TIMER_LEAD_TIME, default=DEFAULT_TIMER_LEAD_TIME): int,
                 }
             ),
             errors=self._errors
@@ -141,6 +150,9 @@ class BenyWifiConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                     vol.Required(CONF_SERIAL, default=str(existing_data.get(CONF_SERIAL))): str,
                     vol.Required(CONF_PIN, default=str(int(existing_data.get(CONF_PIN), 16)).zfill(6)): str,
                     vol.Optional(SCAN_INTERVAL, default=int(existing_data.get(SCAN_INTERVAL))): int,
+                    vol.Optional(FAST_SCAN_INTERVAL, default=int(existing_data.get(FAST_SCAN_INTERVAL, DEFAULT_FAST_SCAN_INTERVAL))): int,
+                    vol.Optional(IDLE_SCAN_INTERVAL, default=int(existing_data.get(IDLE_SCAN_INTERVAL, DEFAULT_IDLE_SCAN_INTERVAL))): int,
+                    vol.Optional(TIMER_LEAD_TIME, default=int(existing_data.get(TIMER_LEAD_TIME, DEFAULT_TIMER_LEAD_TIME))): int,
                 }
             ),
             errors=self._errors
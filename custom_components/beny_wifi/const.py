@@ -15,10 +15,58 @@ CHARGER_TYPE = "charger_type"
 DLB = "dlb"
 
 SCAN_INTERVAL: Final = "update_interval"
+FAST_SCAN_INTERVAL: Final = "fast_update_interval"
+IDLE_SCAN_INTERVAL: Final = "idle_update_interval"
+TIMER_LEAD_TIME: Final = "timer_lead_time"
 
 DEFAULT_SCAN_INTERVAL: Final = 30
+DEFAULT_FAST_SCAN_INTERVAL: Final = 10 # while charging is starting or ongoing
+DEFAULT_IDLE_SCAN_INTERVAL: Final = 120 # while unplugged or in standby
+DEFAULT_TIMER_LEAD_TIME: Final = 300 # poll fast this many seconds before timer start
 DEFAULT_PORT = 3333 # default listening port (at least for"BCP-AT1N-L)
 
+# request retries and retransmission timeout (RTO) bounds in seconds
+DEFAULT_RETRIES: Final = 3
+RTO_INITIAL: Final = 3.0
+RTO_MIN: Final = 0.3
+RTO_MAX: Final = 8.0
+# seconds a request may take over all its attempts, and base of the random
+# delay before a retry, doubled for every further retry
+REQUEST_DEADLINE: Final = 12.0
+RETRY_BACKOFF: Final = 0.25
+
+# round-trip times kept for min/avg/p95 diagnostics
+RTT_STATS_WINDOW: Final = 100
+
+# raw frames sent to and received from charger kept for diagnostics
+FRAME_HISTORY: Final = 50
+
+# datagrams per second sent to all chargers, and burst allowed on top of it
+SEND_RATE_LIMIT: Final = 20
+SEND_RATE_BURST: Final = 10
+
+# requests to all chargers in flight at once, and random shift of poll start
+# as a fraction of the time slot of one charger
+MAX_CONCURRENT_POLLS: Final = 4
+POLL_JITTER: Final = 0.25
+
+# state of sensor with a deadband is written this often in seconds,
+# even if its value stayed within the deadband
+SENSOR_HEARTBEAT_INTERVAL: Final = 900
+
+# keys of UDP endpoint and poll scheduler shared by all chargers in hass.data[DOMAIN]
+ENDPOINT: Final = "endpoint"
+SCHEDULER: Final = "scheduler"
+
+# consecutive failed updates before charger is considered offline, and
+# interval of probes sent to offline charger in seconds
+BREAKER_FAILURE_THRESHOLD: Final = 3
+BREAKER_PROBE_INTERVAL: Final = 300
+
+STORAGE_VERSION: Final = 1
+STORAGE_KEY: Final = f"{DOMAIN}.rtt"
+STORAGE_SAVE_DELAY: Final = 300
+
 IP_ADDRESS = "ip_address"
 PORT = "port"
 CONF_SERIAL = "serial"
@@ -43,7 +91,11 @@ def calculate_checksum(data: str) -> int:
     else:
         data = data[:-2].strip()
 
-    return sum([int(data[i:i+2], 16) for i in range(0, len(data), 2)]) % 256
+    try:
+        return sum(bytes.fromhex(data)) % 256
+    except ValueError:
+        # odd number of digits, last digit is summed as it is
+        return sum([int(data[i:i+2], 16) for i in range(0, len(data), 2)]) % 256
 
 def get_checksum(data: str) -> int:
     """Get last digits containing checksum.
@@ -242,6 +294,13 @@ class COMMON(Enum):
             "message_id": slice(6, 10)
         },
     }
+    REQUEST_CODE = {
+        "description": "Request type or command code, echoed back by charger in its response",
+        "structure": {
+            "request": slice(18, 20),
+            "response": slice(10, 12)
+        },
+    }
 
 class CLIENT_MESSAGE(Enum):
     """Client message definitions. Defines structures of the messages sent to charger."""
@@ -430,3 +489,22 @@ class SERVER_MESSAGE(Enum):
 
         }
     }
+
+# Message types by (message type, message id) of the message header. None
+# matches any message type. Messages sharing an id are told apart by the
+# request type echoed in the message, None being the default.
+MESSAGE_TYPES: Final = {
+    (None, 8): SERVER_MESSAGE.ACCESS_DENIED,
+    (None, 11): CLIENT_MESSAGE.REQUEST_DATA,
+    (None, 12): CLIENT_MESSAGE.SEND_CHARGER_COMMAND,
+    (None, 17): SERVER_MESSAGE.HANDSHAKE,
+    (0x7B, 17): SERVER_MESSAGE.SEND_DLB,
+    (None, 28): CLIENT_MESSAGE.SET_TIMER,
+    (None, 30): SERVER_MESSAGE.SEND_VALUES_1P,
+    (None, 32): {
+        REQUEST_TYPE.SETTINGS.value: SERVER_MESSAGE.SEND_SETTINGS,
+        None: SERVER_MESSAGE.SEND_MODEL,
+    },
+    (None, 33): SERVER_MESSAGE.SEND_DLB,
+    (None, 35): SERVER_MESSAGE.SEND_VALUES_3P,
+}
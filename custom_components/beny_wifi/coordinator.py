@@ -1,32 +1,104 @@
 """Coordinator."""
 import asyncio
-from datetime import timedelta
+from collections import deque
+from datetime import datetime, timedelta
 import logging
-import socket
-from typing import Any
+import time
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 from homeassistant.util.dt import utcnow
 
-from .communication import SERVER_MESSAGE, build_message, read_message
+from .communication import (
+    SERVER_MESSAGE,
+    build_message,
+    decode_frame,
+    get_frame_type,
+    read_dlb_sample,
+    read_message,
+    read_sample,
+)
 from .const import (
+    BREAKER_FAILURE_THRESHOLD,
+    BREAKER_PROBE_INTERVAL,
     CHARGER_COMMAND,
     CHARGER_STATE,
     CLIENT_MESSAGE,
     CONF_PIN,
+    DEFAULT_FAST_SCAN_INTERVAL,
+    DEFAULT_IDLE_SCAN_INTERVAL,
+    DEFAULT_RETRIES,
+    DEFAULT_TIMER_LEAD_TIME,
     DLB,
     DOMAIN,
+    FAST_SCAN_INTERVAL,
+    IDLE_SCAN_INTERVAL,
     REQUEST_TYPE,
+    RTT_STATS_WINDOW,
     SERIAL,
+    STORAGE_KEY,
+    STORAGE_SAVE_DELAY,
+    STORAGE_VERSION,
+    TIMER_LEAD_TIME,
     calculate_checksum,
 )
 from .conversions import convert_schedule, convert_timer, get_hex
+from .models import ChargerSample
+from .scheduler import FleetScheduler
+from .transport import BenyWifiEndpoint, BenyWifiTransport, RttEstimator
 
 _LOGGER = logging.getLogger(__name__)
 
+DLB_KEYS = ("grid_import", "grid_export", "house_power", "ev_power", "solar_power")
+
+
+def _reads_sample(context) -> bool:
+    """Return True if listener context names a field of the charger sample."""
+    return hasattr(ChargerSample, str(context))
+
+
+class CircuitBreaker:
+    """Circuit breaker tracking consecutive failed updates of a charger.
+
+    After threshold consecutive failures the breaker opens and charger is
+    treated as offline. First successful response closes it again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
 
-class BenyWifiUpdateCoordinator(DataUpdateCoordinator[dict[str, Any]]):
+    def __init__(self, threshold: int = BREAKER_FAILURE_THRESHOLD) -> None:
+        """Initialize circuit breaker."""
+        self.threshold = threshold
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = None
+
+    @property
+    def is_open(self) -> bool:
+        """Return True if charger is considered offline."""
+        return self.state == self.OPEN
+
+    def record_success(self) -> bool:
+        """Record successful update, return True if breaker was closed by it."""
+        was_open = self.is_open
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = None
+        return was_open
+
+    def record_failure(self) -> bool:
+        """Record failed update, return True if breaker was opened by it."""
+        self.consecutive_failures += 1
+        if not self.is_open and self.consecutive_failures >= self.threshold:
+            self.state = self.OPEN
+            self.opened_at = utcnow()
+            return True
+        return False
+
+
+class BenyWifiUpdateCoordinator(DataUpdateCoordinator[ChargerSample]):
     """Beny Wifi update coordinator."""
 
 
@@ -37,6 +109,8 @@ class BenyWifiUpdateCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         ip_address,
         port,
         scan_interval,
+        endpoint: BenyWifiEndpoint | None = None,
+        scheduler: FleetScheduler | None = None,
     ) -> None:
         """Initialize Beny Wifi update coordinator."""
         super().__init__(
@@ -50,49 +124,216 @@ class BenyWifiUpdateCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         self.ip_address = ip_address
         self.port = port
         self.hass = hass
-
-    async def _async_update_data(self) -> dict[str, Any]:
+        self.scan_interval = timedelta(seconds=scan_interval)
+        # nominal polling interval, update_interval aligns it to slot of charger
+        self.poll_interval = self.scan_interval
+        self.fast_scan_interval = timedelta(
+            seconds=config_entry.data.get(FAST_SCAN_INTERVAL, DEFAULT_FAST_SCAN_INTERVAL)
+        )
+        self.idle_scan_interval = timedelta(
+            seconds=config_entry.data.get(IDLE_SCAN_INTERVAL, DEFAULT_IDLE_SCAN_INTERVAL)
+        )
+        self.timer_lead_time = timedelta(
+            seconds=config_entry.data.get(TIMER_LEAD_TIME, DEFAULT_TIMER_LEAD_TIME)
+        )
+        serial = str(config_entry.data.get(SERIAL, ""))
+        self.breaker = CircuitBreaker()
+        self.decode_times: deque[float] = deque(maxlen=RTT_STATS_WINDOW)
+        self._notified_data: ChargerSample | None = None
+        self._notified_success = True
+        self.scheduler = scheduler if scheduler is not None else FleetScheduler()
+        self.scheduler.register(self)
+        self.transport = BenyWifiTransport(
+            ip_address,
+            port,
+            endpoint,
+            int(serial) if serial.isdigit() else None,
+            limiter=self.scheduler.poll(),
+        )
+        self._store = Store(hass, STORAGE_VERSION, f"{STORAGE_KEY}.{config_entry.entry_id}")
+
+    async def async_load_rtt(self) -> None:
+        """Warm-start round-trip time estimator from storage."""
+        if stored := await self._store.async_load():
+            self.transport.rtt = RttEstimator.from_dict(stored)
+            _LOGGER.debug(f"Restored round-trip time estimate: {stored}")
+
+    async def async_shutdown(self) -> None:
+        """Cancel refreshes and close charger transport."""
+        await super().async_shutdown()
+        self.scheduler.unregister(self)
+        self.transport.close()
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update listeners of sample fields that changed since last update.
+
+        Listeners with a sample field as context are only updated when value
+        of that field differs from the previously notified sample. Other
+        listeners, and all listeners when availability changed, are always
+        updated.
+        """
+        previous = self._notified_data
+        availability_changed = self.last_update_success != self._notified_success
+        self._notified_data = self.data
+        self._notified_success = self.last_update_success
+
+        for update_callback, context in list(self._listeners.values()):
+            if (
+                availability_changed
+                or previous is None
+                or self.data is None
+                or not _reads_sample(context)
+                or getattr(previous, context) != getattr(self.data, context)
+            ):
+                update_callback()
+
+    @callback
+    def async_update_status_listeners(self) -> None:
+        """Update listeners not reading the sample, e.g. breaker and transport state."""
+        for update_callback, context in list(self._listeners.values()):
+            if not _reads_sample(context):
+                update_callback()
+
+    async def _async_update_data(self) -> ChargerSample:
         """Fetch data asynchronously."""
-        return await self._fetch_data()
+        try:
+            # answer of probe is the VALUES response of this update
+            values_response = await self._probe() if self.breaker.is_open else None
+
+            try:
+                data = await self._fetch_data(values_response)
+            except UpdateFailed:
+                if self.breaker.record_failure():
+                    _LOGGER.warning(
+                        f"Charger {self.ip_address} is unreachable after {self.breaker.consecutive_failures} "
+                        f"failed updates, probing every {BREAKER_PROBE_INTERVAL} seconds"
+                    )
+                    self.poll_interval = timedelta(seconds=BREAKER_PROBE_INTERVAL)
+                raise
+
+            if self.breaker.record_success():
+                _LOGGER.info(f"Charger {self.ip_address} is reachable again")
+
+            self.poll_interval = self._select_update_interval(data)
+
+            return data
+        except UpdateFailed:
+            # listeners are notified only of the first of consecutive failed
+            # updates, while breaker and transport state keep changing
+            self.async_update_status_listeners()
+            raise
+        finally:
+            self._align_update_interval()
+            self._store.async_delay_save(self.transport.rtt.as_dict, STORAGE_SAVE_DELAY)
+
+    def _align_update_interval(self) -> None:
+        """Set update interval so that next refresh falls in time slot of charger."""
+        now = time.monotonic()
+        next_refresh = self.scheduler.next_refresh(self, now, self.poll_interval.total_seconds())
+        self.update_interval = timedelta(seconds=next_refresh - now)
+
+    def _select_update_interval(self, data: ChargerSample) -> timedelta:
+        """Pick polling interval from charger and timer state."""
+        if data.state in (CHARGER_STATE.STARTING.name, CHARGER_STATE.CHARGING.name):
+            return self.fast_scan_interval
+
+        timer_start = data.timer_start
+        if isinstance(timer_start, datetime) and timer_start - utcnow() <= self.timer_lead_time:
+            return self.fast_scan_interval
+
+        if data.state in (CHARGER_STATE.UNPLUGGED.name, CHARGER_STATE.STANDBY.name):
+            return self.idle_scan_interval
+
+        return self.scan_interval
+
+    async def _probe(self) -> bytes:
+        """Send single VALUES request to offline charger, raise UpdateFailed if not answered."""
+        request = build_message(
+            CLIENT_MESSAGE.REQUEST_DATA,
+            {
+                "pin": self.config_entry.data[CONF_PIN],
+                "request_type": get_hex(REQUEST_TYPE.VALUES.value),
+            },
+        ).encode("ascii")
 
-    async def _fetch_data(self):
-        """Send UDP request and fetch data asynchronously."""
         try:
-            # Build the request message
-            request = build_message(
-                CLIENT_MESSAGE.REQUEST_DATA,
-                {
-                    "pin": self.config_entry.data[CONF_PIN],
-                    "request_type": get_hex(REQUEST_TYPE.VALUES.value),
-                },
-            ).encode("ascii")
+            return await self.transport.async_request(
+                request, (SERVER_MESSAGE.SEND_VALUES_1P, SERVER_MESSAGE.SEND_VALUES_3P), retries=1
+            )
+        except OSError as err:
+            self.breaker.consecutive_failures += 1
+            _LOGGER.debug(f"Charger {self.ip_address} did not answer probe: {err}")
+            raise UpdateFailed(f"Charger is offline: {err}") from err
+
+    async def _fetch_data(self, values_response: bytes | None = None) -> ChargerSample:
+        """Send UDP request and fetch data asynchronously.
+
+        VALUES is not requested again if its response is given, e.g. answer
+        of the probe of an offline charger.
+        """
+        try:
+            requests = []
+            if values_response is None:
+                # Build the request message
+                request = build_message(
+                    CLIENT_MESSAGE.REQUEST_DATA,
+                    {
+                        "pin": self.config_entry.data[CONF_PIN],
+                        "request_type": get_hex(REQUEST_TYPE.VALUES.value),
+                    },
+                ).encode("ascii")
+                requests.append(
+                    self._send_udp_request(
+                        request, (SERVER_MESSAGE.SEND_VALUES_1P, SERVER_MESSAGE.SEND_VALUES_3P)
+                    )
+                )
+
+            if self.config_entry.data[DLB]:
+                # DLB values are requested concurrently with charger values
+                request_dlb = build_message(
+                    CLIENT_MESSAGE.REQUEST_DLB,
+                    {
+                        "pin": self.config_entry.data[CONF_PIN],
+                        "request_type": get_hex(REQUEST_TYPE.DLB.value),
+                    },
+                ).encode("ascii")
+                requests.append(self._send_udp_request(request_dlb, (SERVER_MESSAGE.SEND_DLB,)))
 
-            # Send UDP request asynchronously
-            loop = asyncio.get_event_loop()
-            # The retry logic is now encapsulated within _send_udp_request
-            response = await loop.run_in_executor(None, self._send_udp_request, request)
+            responses = await asyncio.gather(*requests, return_exceptions=True)
+            if values_response is None:
+                response, *response_dlb = responses
+            else:
+                response, response_dlb = values_response, responses
+
+            if isinstance(response, Exception):
+                raise response
 
             # Decode and parse the response
-            response = response.decode("ascii")
-            data = read_message(response)
+            decode_start = time.perf_counter()
+            frame = decode_frame(response)
 
-            if data is None:
+            if frame is None:
                 raise UpdateFailed("Error fetching data: checksum not valid")
 
-            if data["message_type"] == "SERVER_MESSAGE.ACCESS_DENIED":
+            msg_type = get_frame_type(frame)
+            if msg_type == SERVER_MESSAGE.ACCESS_DENIED:
+                self.transport.stats.access_denied += 1
                 raise UpdateFailed(
                     "Device denied request. Please reconfigure integration if your pin has changed"
                 )
 
+            data = read_sample(frame, msg_type)
+
             # Timer state handling
-            if data["timer_state"] == "UNSET":
+            if data.timer_state == "UNSET":
                 start = "not_set"
                 end = "not_set"
-            elif data["timer_state"] != "END_TIME":
+            elif data.timer_state != "END_TIME":
                 now = utcnow()
                 start = now.replace(
-                    hour=data["timer_start_h"],
-                    minute=data["timer_start_min"],
+                    hour=data.timer_start_h,
+                    minute=data.timer_start_min,
                     second=0,
                     microsecond=0,
                 )
@@ -100,10 +341,10 @@ class BenyWifiUpdateCoordinator(DataUpdateCoordinator[dict[str, Any]]):
                 if start < now:
                     start += timedelta(days=1)
 
-                if data["timer_state"] == "START_END_TIME":
+                if data.timer_state == "START_END_TIME":
                     end = now.replace(
-                        hour=data["timer_end_h"],
-                        minute=data["timer_end_min"],
+                        hour=data.timer_end_h,
+                        minute=data.timer_end_min,
                         second=0,
                         microsecond=0,
                     )
@@ -118,243 +359,55 @@ class BenyWifiUpdateCoordinator(DataUpdateCoordinator[dict[str, Any]]):
                 start = "not_set"
                 now = utcnow()
                 end = now.replace(
-                    hour=data["timer_end_h"],
-                    minute=data["timer_end_min"],
+                    hour=data.timer_end_h,
+                    minute=data.timer_end_min,
                     second=0,
                     microsecond=0,
                 )
 
-            data["timer_start"] = start
-            data["timer_end"] = end
+            data.timer_start = start
+            data.timer_end = end
 
-            data["charger_state"] = data["state"].lower()
-            data["power"] = float(data["power"]) / 10
-            data["total_kwh"] = float(data["total_kwh"])
-            data["temperature"] = int(data["temperature"] - 100)
-
-            if self.config_entry.data[DLB]:
-                # Build the DLB request message
-                request = build_message(
-                    CLIENT_MESSAGE.REQUEST_DLB,
-                    {
-                        "pin": self.config_entry.data[CONF_PIN],
-                        "request_type": get_hex(REQUEST_TYPE.DLB.value),
-                    },
-                ).encode("ascii")
-
-                # The retry logic is now encapsulated within _send_udp_request
-                response_dlb = await loop.run_in_executor(None, self._send_udp_request, request)
-                response_dlb = response_dlb.decode("ascii")
-                data_dlb = read_message(response_dlb)
-
-                if data_dlb["grid_export"]:
-                    data["grid_import"] = 0
-                    data["grid_export"] = float(data_dlb["grid_power"]) / 10
-                else:
-                    data["grid_import"] = float(data_dlb["grid_power"]) / 10
-                    data["grid_export"] = 0
-
-                data["house_power"] = float(data_dlb["house_power"]) / 10
-                data["ev_power"] = float(data_dlb["ev_power"]) / 10
-                data["solar_power"] = float(data_dlb["solar_power"]) / 10
+            if response_dlb:
+                self._parse_dlb(response_dlb[0], data)
 
+            self.decode_times.append(time.perf_counter() - decode_start)
             return data
 
         except Exception as err:
-            _LOGGER.error(f"Failed to fetch data: {err}")
+            # offline charger is logged once when breaker opens
+            _LOGGER.log(
+                logging.DEBUG if self.breaker.is_open else logging.WARNING, f"Failed to fetch data: {err}"
+            )
             raise UpdateFailed(f"Error fetching data: {err}")
 
-    def _send_udp_request(self, request, retries=2, timeout=8):
-        """Send UDP request synchronously in a separate thread, with retries."""
-        for attempt in range(retries):
-            sock = None  # Initialize sock outside the try block
-            try:
-                sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-                sock.settimeout(timeout)  # Use the passed timeout parameter
-                sock.sendto(request, (self.ip_address, self.port))
-
-                response, addr = sock.recvfrom(1024)
-                return response
-            except socket.timeout:
-                _LOGGER.warning(
-                    f"UDP request timed out (attempt {attempt + 1}/{retries}). Retrying..."
-                )
-                if attempt == retries - 1:  # If this was the last attempt
-                    _LOGGER.error(f"UDP request failed after {retries} attempts due to timeout.")
-                    raise UpdateFailed(f"Error sending UDP request: timed out after {retries} attempts")
-            except Exception as err:
-                _LOGGER.error(f"UDP request failed: {err}")
-                raise UpdateFailed(f"Error sending UDP request: {err}")
-            finally:
-                if sock: # Ensure sock was created before trying to close it
-                    sock.close()
-        # This part should theoretically not be reached if an exception is always raised on last retry
-        # but included for clarity.
-        raise UpdateFailed("Unknown error after retries in _send_udp_request")
-
-
-    async def async_toggle_charging(self, device_name: str, command: str):
-        """Start or stop charging service."""
-
-        state_sensor_id = f"sensor.{self.config_entry.data[SERIAL]}_charger_state"
-        state_sensor_value = self.hass.states.get(state_sensor_id)
-
-        if state_sensor_value and state_sensor_value.state != CHARGER_STATE.UNPLUGGED.name.lower():
-            if command == "start":
-                request = build_message(
-                    CLIENT_MESSAGE.SEND_CHARGER_COMMAND,
-                    {
-                        "pin": self.config_entry.data[CONF_PIN],
-                        "charger_command": get_hex(CHARGER_COMMAND.START.value),
-                    },
-                ).encode("ascii")
-            elif command == "stop":
-                request = build_message(
-                    CLIENT_MESSAGE.SEND_CHARGER_COMMAND,
-                    {
-                        "pin": self.config_entry.data[CONF_PIN],
-                        "charger_command": get_hex(CHARGER_COMMAND.STOP.value),
-                    },
-                ).encode("ascii")
+    def _parse_dlb(self, response: bytes | Exception, data: ChargerSample) -> None:
+        """Parse DLB response to sample, keeping previous DLB values if it is not available."""
+        if isinstance(response, Exception):
+            _LOGGER.warning(f"Failed to fetch DLB data, keeping previous values: {response}")
+        else:
+            frame = decode_frame(response)
+            if frame is not None and get_frame_type(frame) == SERVER_MESSAGE.SEND_DLB:
+                try:
+                    read_dlb_sample(frame, data)
+                    return
+                except ValueError as err:
+                    _LOGGER.debug(f"Malformed DLB data received, keeping previous values: {err}")
             else:
-                _LOGGER.error(f"Unknown command: {command}")
-                return
-
-            loop = asyncio.get_event_loop()
-            # The retry logic is now encapsulated within _send_udp_request
-            await loop.run_in_executor(None, self._send_udp_request, request)
-
-            _LOGGER.info(f"{device_name}: {command} charging command sent")
-
-    async def async_set_max_monthly_consumption(self, device_name: str, maximum_consumption: int):
-        """Set maximum consumption."""
-
-        request = build_message(
-            CLIENT_MESSAGE.SET_MAX_MONTHLY_CONSUMPTION,
-            {
-                "pin": self.config_entry.data[CONF_PIN],
-                "maximum_consumption": get_hex(maximum_consumption, 4),
-            },
-        ).encode("ascii")
-
-        loop = asyncio.get_event_loop()
-        # The retry logic is now encapsulated within _send_udp_request
-        await loop.run_in_executor(None, self._send_udp_request, request)
-
-        _LOGGER.info(f"{device_name}: maximum monthly consumption set")
-
-    async def async_set_max_session_consumption(self, device_name: str, maximum_consumption: int):
-        """Set maximum session consumption."""
-
-        request = build_message(
-            CLIENT_MESSAGE.SET_MAX_SESSION_CONSUMPTION,
-            {
-                "pin": self.config_entry.data[CONF_PIN],
-                "maximum_consumption": get_hex(maximum_consumption),
-            },
-        ).encode("ascii")
-
-        loop = asyncio.get_event_loop()
-        # The retry logic is now encapsulated within _send_udp_request
-        await loop.run_in_executor(None, self._send_udp_request, request)
-
-        _LOGGER.info(f"{device_name}: maximum session consumption set")
-
-    async def async_set_timer(self, device_name: str, start_time: str, end_time: str):
-        """Set charging timer."""
+                _LOGGER.warning("Invalid DLB data received, keeping previous values")
 
-        state_sensor_id = f"sensor.{self.config_entry.data[SERIAL]}_charger_state"
-        state_sensor_value = self.hass.states.get(state_sensor_id)
-
-        if state_sensor_value and state_sensor_value.state != CHARGER_STATE.UNPLUGGED.name.lower():
-            timer_data = convert_timer(start_time, end_time)
-            timer_data["pin"] = self.config_entry.data[CONF_PIN]
-            request = build_message(CLIENT_MESSAGE.SET_TIMER, timer_data).encode("ascii")
-
-            loop = asyncio.get_event_loop()
-            # The retry logic is now encapsulated within _send_udp_request
-            await loop.run_in_executor(None, self._send_udp_request, request)
-
-            _LOGGER.info(f"{device_name}: charging timer set")
-
-    async def async_set_schedule(self, device_name: str, weekdays: list[bool], start_time: str, end_time: str):
-        """Set charging schedule."""
-        schedule_data = convert_schedule(reversed(weekdays), start_time, end_time)
-        schedule_data["pin"] = self.config_entry.data[CONF_PIN]
-        request = build_message(CLIENT_MESSAGE.SET_SCHEDULE, schedule_data).encode("ascii")
-
-        loop = asyncio.get_event_loop()
-        # The retry logic is now encapsulated within _send_udp_request
-        await loop.run_in_executor(None, self._send_udp_request, request)
-
-        _LOGGER.info(f"{device_name}: charging schedule set")
-
-    async def async_reset_timer(self, device_name: str):
-        """Reset charging timer."""
-
-        state_sensor_id = f"sensor.{self.config_entry.data[SERIAL]}_charger_state"
-        state_sensor_value = self.hass.states.get(state_sensor_id)
-
-        if state_sensor_value and state_sensor_value.state != CHARGER_STATE.UNPLUGGED.name.lower():
-            request = build_message(
-                CLIENT_MESSAGE.RESET_TIMER, {"pin": self.config_entry.data[CONF_PIN]}
-            ).encode("ascii")
-
-            loop = asyncio.get_event_loop()
-            # The retry logic is now encapsulated within _send_udp_request
-            await loop.run_in_executor(None, self._send_udp_request, request)
-
-            _LOGGER.info(f"{device_name}: charging timer reset")
-
-    async def async_request_weekly_schedule(self, device_name: str):
-        """Get set weekly schedule from charger."""
-
-        request = build_message(
-            CLIENT_MESSAGE.REQUEST_SETTINGS, {"pin": self.config_entry.data[CONF_PIN]}
-        ).encode("ascii")
-
-        # This call to _send_udp_request is NOT awaited, which is usually a bug.
-        # It should be awaited, but it's directly called here without `loop.run_in_executor`.
-        # I'm adding `await loop.run_in_executor` to make it consistent with other calls.
-        loop = asyncio.get_event_loop()
-        response = await loop.run_in_executor(None, self._send_udp_request, request)
-
-        response = response.decode("ascii")
-        data = read_message(response, SERVER_MESSAGE.SEND_SETTINGS)
-        data["start_time"] = f"{data['timer_start_h']}:{data['timer_start_min']}"
-        data["end_time"] = f"{data['timer_end_h']}:{data['timer_end_min']}"
-
-        _LOGGER.info(f"{device_name}: requested weekly schedule")
-
-        return {
-            "result": {
-                "schedule": data["schedule"],
-                "weekdays": data["weekdays"],
-                "start_time": data["start_time"],
-                "end_time": data["end_time"],
-            }
-        }
-
-    async def async_set_max_current(self, device_name: str, max_current: int):
-        """Set maximum charging current (6A–32A) on the charger."""
-        if not (6 <= max_current <= 32):
-            raise ValueError("Maximum current must be between 6 and 32 amps")
-
-        # Build the message using your existing hex template
-        request = build_message(
-            CLIENT_MESSAGE.SET_MAX_CURRENT,
-            {
-                "pin": self.config_entry.data[CONF_PIN],
-                "max_current": format(max_current, "02x"),
-            },
-        ).encode("ascii")
-
-        loop = asyncio.get_event_loop()
-        # The retry logic is now encapsulated within _send_udp_request
-        await loop.run_in_executor(None, self._send_udp_request, request)
-
-        _LOGGER.info(f"{device_name}: max current set to {max_current}A")
+        if self.data is not None:
+            for key in DLB_KEYS:
+                setattr(data, key, getattr(self.data, key))
 
+    async def _send_udp_request(self, request, expected=(), retries=DEFAULT_RETRIES, timeout=None):
+        """Send UDP request over the charger transport and wait for the matching response."""
+        try:
+            return await self.transport.async_request(request, expected, retries, timeout)
+        except TimeoutError as err:
+            raise UpdateFailed(f"Error sending UDP request: timed out after {retries} attempts") from err
+        except OSError as err:
+            raise UpdateFailed(f"Error sending UDP request: {err}") from err
 
     async def async_toggle_charging(self, device_name: str, command: str):
         """Start or stop charging service."""
@@ -383,9 +436,7 @@ class BenyWifiUpdateCoordinator(DataUpdateCoordinator[dict[str, Any]]):
                 _LOGGER.error(f"Unknown command: {command}")
                 return
 
-            loop = asyncio.get_event_loop()
-            # The retry logic is now encapsulated within _send_udp_request
-            await loop.run_in_executor(None, self._send_udp_request, request)
+            await self._send_udp_request(request)
 
             _LOGGER.info(f"{device_name}: {command} charging command sent")
 
@@ -400,9 +451,7 @@ class BenyWifiUpdateCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             },
         ).encode("ascii")
 
-        loop = asyncio.get_event_loop()
-        # The retry logic is now encapsulated within _send_udp_request
-        await loop.run_in_executor(None, self._send_udp_request, request)
+        await self._send_udp_request(request)
 
         _LOGGER.info(f"{device_name}: maximum monthly consumption set")
 
@@ -417,9 +466,7 @@ class BenyWifiUpdateCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             },
         ).encode("ascii")
 
-        loop = asyncio.get_event_loop()
-        # The retry logic is now encapsulated within _send_udp_request
-        await loop.run_in_executor(None, self._send_udp_request, request)
+        await self._send_udp_request(request)
 
         _LOGGER.info(f"{device_name}: maximum session consumption set")
 
@@ -434,9 +481,7 @@ class BenyWifiUpdateCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             timer_data["pin"] = self.config_entry.data[CONF_PIN]
             request = build_message(CLIENT_MESSAGE.SET_TIMER, timer_data).encode("ascii")
 
-            loop = asyncio.get_event_loop()
-            # The retry logic is now encapsulated within _send_udp_request
-            await loop.run_in_executor(None, self._send_udp_request, request)
+            await self._send_udp_request(request)
 
             _LOGGER.info(f"{device_name}: charging timer set")
 
@@ -446,9 +491,7 @@ class BenyWifiUpdateCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         schedule_data["pin"] = self.config_entry.data[CONF_PIN]
         request = build_message(CLIENT_MESSAGE.SET_SCHEDULE, schedule_data).encode("ascii")
 
-        loop = asyncio.get_event_loop()
-        # The retry logic is now encapsulated within _send_udp_request
-        await loop.run_in_executor(None, self._send_udp_request, request)
+        await self._send_udp_request(request)
 
         _LOGGER.info(f"{device_name}: charging schedule set")
 
@@ -463,9 +506,7 @@ class BenyWifiUpdateCoordinator(DataUpdateCoordinator[dict[str, Any]]):
                 CLIENT_MESSAGE.RESET_TIMER, {"pin": self.config_entry.data[CONF_PIN]}
             ).encode("ascii")
 
-            loop = asyncio.get_event_loop()
-            # The retry logic is now encapsulated within _send_udp_request
-            await loop.run_in_executor(None, self._send_udp_request, request)
+            await self._send_udp_request(request)
 
             _LOGGER.info(f"{device_name}: charging timer reset")
 
@@ -476,13 +517,8 @@ class BenyWifiUpdateCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             CLIENT_MESSAGE.REQUEST_SETTINGS, {"pin": self.config_entry.data[CONF_PIN]}
         ).encode("ascii")
 
-        # This call to _send_udp_request is NOT awaited, which is usually a bug.
-        # It should be awaited, but it's directly called here without `loop.run_in_executor`.
-        # I'm adding `await loop.run_in_executor` to make it consistent with other calls.
-        loop = asyncio.get_event_loop()
-        response = await loop.run_in_executor(None, self._send_udp_request, request)
+        response = await self._send_udp_request(request, (SERVER_MESSAGE.SEND_SETTINGS,))
 
-        response = response.decode("ascii")
         data = read_message(response, SERVER_MESSAGE.SEND_SETTINGS)
         data["start_time"] = f"{data['timer_start_h']}:{data['timer_start_min']}"
         data["end_time"] = f"{data['timer_end_h']}:{data['timer_end_min']}"
@@ -512,8 +548,6 @@ class BenyWifiUpdateCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             },
         ).encode("ascii")
 
-        loop = asyncio.get_event_loop()
-        # The retry logic is now encapsulated within _send_udp_request
-        await loop.run_in_executor(None, self._send_udp_request, request)
+        await self._send_udp_request(request)
 
-        _LOGGER.info(f"{device_name}: max current set to {max_current}A")
\ No newline at end of file
+        _LOGGER.info(f"{device_name}: max current set to {max_current}A")
@@ -0,0 +1,76 @@
+"""Diagnostics support for Beny Wifi."""
+from datetime import UTC, datetime
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import CONF_PIN, DOMAIN
+
+TO_REDACT = {CONF_PIN}
+
+
+def _seconds(interval) -> float | None:
+    return interval.total_seconds() if interval is not None else None
+
+
+def _decode_times(times) -> dict[str, Any]:
+    """Return min, avg and max of decode times in microseconds."""
+    if not times:
+        return {"count": 0}
+    return {
+        "count": len(times),
+        "min_us": round(min(times) * 1e6, 1),
+        "avg_us": round(sum(times) / len(times) * 1e6, 1),
+        "max_us": round(max(times) * 1e6, 1),
+    }
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics of config entry."""
+    coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+    transport = coordinator.transport
+    stats = transport.stats
+
+    return {
+        "entry": async_redact_data(dict(entry.data), TO_REDACT),
+        "polling": {
+            "update_interval": _seconds(coordinator.update_interval),
+            "poll_interval": _seconds(coordinator.poll_interval),
+            "scan_interval": _seconds(coordinator.scan_interval),
+            "fast_scan_interval": _seconds(coordinator.fast_scan_interval),
+            "idle_scan_interval": _seconds(coordinator.idle_scan_interval),
+            "timer_lead_time": _seconds(coordinator.timer_lead_time),
+            "last_update_success": coordinator.last_update_success,
+        },
+        "breaker": {
+            "state": coordinator.breaker.state,
+            "consecutive_failures": coordinator.breaker.consecutive_failures,
+            "opened_at": coordinator.breaker.opened_at,
+        },
+        "transport": {
+            "address": f"{transport.ip_address}:{transport.port}",
+            "connected": transport.connected,
+            "requests": stats.requests,
+            "timeouts": stats.timeouts,
+            "retries": stats.retries,
+            "checksum_failures": stats.checksum_failures,
+            "access_denied": stats.access_denied,
+            "rtt_min_ms": stats.rtt_min,
+            "rtt_avg_ms": stats.rtt_avg,
+            "rtt_p95_ms": stats.rtt_p95,
+            "rtt_estimator": transport.rtt.as_dict() | {"rto": transport.rtt.rto},
+        },
+        "decode_times": _decode_times(coordinator.decode_times),
+        "frames": [
+            {
+                "time": datetime.fromtimestamp(timestamp, UTC).isoformat(),
+                "direction": direction,
+                "hex": frame,
+            }
+            for timestamp, direction, frame in transport.frames
+        ],
+    }
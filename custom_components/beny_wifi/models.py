@@ -0,0 +1,42 @@
+"""Data models for Beny Wifi."""
+from dataclasses import dataclass
+from datetime import datetime
+
+
+@dataclass(slots=True)
+class ChargerSample:
+    """Charger readings of one poll, scaled to sensor units.
+
+    Fields missing from the charger model (e.g. phases 2 and 3 of 1-phase
+    chargers) or not requested (DLB) are None.
+    """
+
+    state: str | None = None
+    timer_state: str | None = None
+    current1: int | None = None
+    current2: int | None = None
+    current3: int | None = None
+    voltage1: int | None = None
+    voltage2: int | None = None
+    voltage3: int | None = None
+    power: float | None = None
+    total_kwh: float | None = None
+    temperature: int | None = None
+    max_current: int | None = None
+    maximum_session_consumption: int | None = None
+    timer_start_h: int | None = None
+    timer_start_min: int | None = None
+    timer_end_h: int | None = None
+    timer_end_min: int | None = None
+    timer_start: datetime | str | None = None
+    timer_end: datetime | str | None = None
+    grid_import: float | None = None
+    grid_export: float | None = None
+    house_power: float | None = None
+    ev_power: float | None = None
+    solar_power: float | None = None
+
+    @property
+    def charger_state(self) -> str | None:
+        """Return charger state as used in sensor state."""
+        return self.state.lower() if self.state is not None else None
@@ -0,0 +1,59 @@
+"""Poll scheduler shared by all Beny Wifi chargers."""
+import asyncio
+import random
+
+from .const import MAX_CONCURRENT_POLLS, POLL_JITTER
+
+
+class FleetScheduler:
+    """Spread polls of all chargers over their update interval.
+
+    Every registered charger owns an equal time slot of the interval and its
+    refreshes are aligned to the start of its slot, shifted by random jitter,
+    so chargers set up at the same time (e.g. after restart) do not poll in
+    lockstep. At most max_concurrent requests of the chargers wait for a
+    response at once, retry delays and backoff do not hold a place.
+    """
+
+    def __init__(self, max_concurrent: int = MAX_CONCURRENT_POLLS, jitter: float = POLL_JITTER) -> None:
+        """Initialize scheduler."""
+        self.jitter = jitter
+        self._members: list[object] = []
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+
+    def register(self, member: object) -> None:
+        """Assign time slot to member."""
+        if member not in self._members:
+            self._members.append(member)
+
+    def unregister(self, member: object) -> None:
+        """Release time slot of member."""
+        if member in self._members:
+            self._members.remove(member)
+
+    def next_refresh(self, member: object, now: float, interval: float) -> float:
+        """Return monotonic time of next refresh of member.
+
+        Args:
+            member (object): registered member
+            now (float): current monotonic time
+            interval (float): update interval in seconds
+
+        Returns:
+            float: start of the member's slot nearest to now + interval,
+                shifted by jitter
+
+        """
+        if member not in self._members:
+            return now + interval
+
+        slot = interval / len(self._members)
+        phase = self._members.index(member) * slot
+        cycles = round((now + interval - phase) / interval)
+        jitter = random.uniform(-self.jitter, self.jitter) * slot
+
+        return max(now + interval / 2, phase + cycles * interval + jitter)
+
+    def poll(self) -> asyncio.Semaphore:
+        """Return context manager holding one of the places for requests in flight."""
+        return self._semaphore
@@ -1,15 +1,20 @@
 """Sensors for Beny Wifi."""
+from datetime import timedelta
 
 from homeassistant.const import (
+    EntityCategory,
     UnitOfElectricCurrent,
     UnitOfElectricPotential,
     UnitOfEnergy,
     UnitOfPower,
+    UnitOfTime,
 )
+from homeassistant.core import callback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.event import async_track_time_interval
 
-from .const import CHARGER_TYPE, DLB, DOMAIN, MODEL, SERIAL
+from .const import CHARGER_TYPE, DLB, DOMAIN, MODEL, SENSOR_HEARTBEAT_INTERVAL, SERIAL
 
 
 async def async_setup_entry(hass, config_entry, async_add_entities):
@@ -27,7 +32,7 @@ async def async_setup_entry(hass, config_entry, async_add_entities):
             BenyWifiChargerStateSensor(coordinator, "charger_state", device_id, device_model),
             BenyWifiPowerSensor(coordinator, "power", device_id, device_model),
             BenyWifiVoltageSensor(coordinator, "voltage1", device_id, device_model),
-            BenyWifiCurrentSensor(coordinator, "current1", device_id, device_model),
+            BenyWifiCurrentSensor(coordinator, "current1", device_id, device_model, deadband=1),
             BenyWifiCurrentSensor(coordinator, "max_current", device_id, device_model),
             BenyWifiEnergySensor(coordinator, "total_kwh", device_id, device_model),
             BenyWifiTemperatureSensor(coordinator, "temperature", device_id, device_model),
@@ -42,9 +47,9 @@ async def async_setup_entry(hass, config_entry, async_add_entities):
             BenyWifiVoltageSensor(coordinator, "voltage1", device_id, device_model),
             BenyWifiVoltageSensor(coordinator, "voltage2", device_id, device_model),
             BenyWifiVoltageSensor(coordinator, "voltage3", device_id, device_model),
-            BenyWifiCurrentSensor(coordinator, "current1", device_id, device_model),
-            BenyWifiCurrentSensor(coordinator, "current2", device_id, device_model),
-            BenyWifiCurrentSensor(coordinator, "current3", device_id, device_model),
+            BenyWifiCurrentSensor(coordinator, "current1", device_id, device_model, deadband=1),
+            BenyWifiCurrentSensor(coordinator, "current2", device_id, device_model, deadband=1),
+            BenyWifiCurrentSensor(coordinator, "current3", device_id, device_model, deadband=1),
             BenyWifiCurrentSensor(coordinator, "max_current", device_id, device_model),
             BenyWifiEnergySensor(coordinator, "total_kwh", device_id, device_model),
             BenyWifiTemperatureSensor(coordinator, "temperature", device_id, device_model),
@@ -55,19 +60,51 @@ async def async_setup_entry(hass, config_entry, async_add_entities):
 
     if dlb:
         sensors.extend([
-            BenyWifiPowerSensor(coordinator, "grid_import", device_id, device_model, icon="mdi:transmission-tower-import"),
-            BenyWifiPowerSensor(coordinator, "grid_export", device_id, device_model, icon="mdi:transmission-tower-export"),
-            BenyWifiPowerSensor(coordinator, "solar_power", device_id, device_model, icon="mdi:solar-power-variant"),
-            BenyWifiPowerSensor(coordinator, "ev_power", device_id, device_model, icon="mdi:car-electric"),
-            BenyWifiPowerSensor(coordinator, "house_power", device_id, device_model, icon="mdi:home-lightning-bolt"),
+            BenyWifiDlbPowerSensor(coordinator, "grid_import", device_id, device_model, icon="mdi:transmission-tower-import"),
+            BenyWifiDlbPowerSensor(coordinator, "grid_export", device_id, device_model, icon="mdi:transmission-tower-export"),
+            BenyWifiDlbPowerSensor(coordinator, "solar_power", device_id, device_model, icon="mdi:solar-power-variant"),
+            BenyWifiDlbPowerSensor(coordinator, "ev_power", device_id, device_model, icon="mdi:car-electric"),
+            BenyWifiDlbPowerSensor(coordinator, "house_power", device_id, device_model, icon="mdi:home-lightning-bolt"),
         ])
 
+    sensors.append(BenyWifiCircuitBreakerSensor(coordinator, "circuit_breaker", device_id, device_model))
+    sensors.extend([
+        BenyWifiTransportSensor(coordinator, "requests", device_id, device_model, icon="mdi:swap-vertical"),
+        BenyWifiTransportSensor(coordinator, "timeouts", device_id, device_model, icon="mdi:timer-alert-outline"),
+        BenyWifiTransportSensor(coordinator, "retries", device_id, device_model, icon="mdi:replay"),
+        BenyWifiTransportSensor(coordinator, "checksum_failures", device_id, device_model, icon="mdi:alert-circle-outline"),
+        BenyWifiTransportSensor(coordinator, "access_denied", device_id, device_model, icon="mdi:lock-alert-outline"),
+        BenyWifiRttSensor(coordinator, "rtt_min", device_id, device_model),
+        BenyWifiRttSensor(coordinator, "rtt_avg", device_id, device_model),
+        BenyWifiRttSensor(coordinator, "rtt_p95", device_id, device_model),
+    ])
+
     async_add_entities(sensors)
 
 
 class BenyWifiSensor(CoordinatorEntity):
-    def __init__(self, coordinator, key, device_id, device_model, icon=None):
-        super().__init__(coordinator)
+    """Sensor of a charger sample value.
+
+    With a deadband, state is written only when it differs from the last written state by more than
+    deadband (in sensor unit) or relative_deadband (fraction of last written
+    state), or when it changes to or from zero. The current state is written
+    every SENSOR_HEARTBEAT_INTERVAL regardless. Subclasses set defaults as
+    class attributes, arguments override them.
+    """
+
+    _deadband = None
+    _relative_deadband = None
+
+    def __init__(self, coordinator, key, device_id, device_model, icon=None,
+                 deadband=None, relative_deadband=None):
+        # key as context, so state is written only when sample value of key changes
+        super().__init__(coordinator, context=key)
+        if deadband is not None:
+            self._deadband = deadband
+        if relative_deadband is not None:
+            self._relative_deadband = relative_deadband
+        self._written_state = None
+        self._written_available = None
         self.coordinator = coordinator
         self.key = key
         self._device_id = device_id
@@ -79,7 +116,51 @@ class BenyWifiSensor(CoordinatorEntity):
 
     @property
     def state(self):
-        return self.coordinator.data.get(self.key)
+        return getattr(self.coordinator.data, self.key, None)
+
+    def _within_deadband(self, state) -> bool:
+        """Return True if state differs from last written state at most by deadband."""
+        if not self._has_deadband:
+            return False
+        last = self._written_state
+        if not isinstance(state, (int, float)) or not isinstance(last, (int, float)):
+            return False
+        if (state == 0) != (last == 0):
+            # e.g. charging stopped
+            return False
+        threshold = max(self._deadband or 0, (self._relative_deadband or 0) * abs(last))
+        return abs(state - last) <= threshold
+
+    @property
+    def _has_deadband(self) -> bool:
+        return self._deadband is not None or self._relative_deadband is not None
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        if self._has_deadband:
+            # coordinator updates sensor only on change, heartbeat runs on its own
+            self.async_on_remove(
+                async_track_time_interval(
+                    self.hass, self._async_heartbeat, timedelta(seconds=SENSOR_HEARTBEAT_INTERVAL)
+                )
+            )
+
+    @callback
+    def _async_heartbeat(self, now=None) -> None:
+        """Write current state, also when it stayed within deadband."""
+        self._write_state()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        if self.available == self._written_available and self._within_deadband(self.state):
+            return
+        self._write_state()
+
+    @callback
+    def _write_state(self) -> None:
+        self._written_state = self.state
+        self._written_available = self.available
+        self.async_write_ha_state()
 
     @property
     def device_info(self) -> DeviceInfo:
@@ -92,13 +173,13 @@ class BenyWifiSensor(CoordinatorEntity):
 
 
 class BenyWifiChargerStateSensor(BenyWifiSensor):
-    def __init__(self, coordinator, key, device_id, device_model, icon="mdi:ev-station"):
-        super().__init__(coordinator, key, device_id, device_model, icon)
+    def __init__(self, coordinator, key, device_id, device_model, icon="mdi:ev-station", **kwargs):
+        super().__init__(coordinator, key, device_id, device_model, icon, **kwargs)
 
 
 class BenyWifiCurrentSensor(BenyWifiSensor):
-    def __init__(self, coordinator, key, device_id, device_model, icon="mdi:sine-wave"):
-        super().__init__(coordinator, key, device_id, device_model, icon)
+    def __init__(self, coordinator, key, device_id, device_model, icon="mdi:sine-wave", **kwargs):
+        super().__init__(coordinator, key, device_id, device_model, icon, **kwargs)
 
     @property
     def unit_of_measurement(self):
@@ -106,8 +187,11 @@ class BenyWifiCurrentSensor(BenyWifiSensor):
 
 
 class BenyWifiVoltageSensor(BenyWifiSensor):
-    def __init__(self, coordinator, key, device_id, device_model, icon="mdi:flash-triangle"):
-        super().__init__(coordinator, key, device_id, device_model, icon)
+    _attr_suggested_display_precision = 0
+    _deadband = 1
+
+    def __init__(self, coordinator, key, device_id, device_model, icon="mdi:flash-triangle", **kwargs):
+        super().__init__(coordinator, key, device_id, device_model, icon, **kwargs)
 
     @property
     def unit_of_measurement(self):
@@ -115,17 +199,26 @@ class BenyWifiVoltageSensor(BenyWifiSensor):
 
 
 class BenyWifiPowerSensor(BenyWifiSensor):
-    def __init__(self, coordinator, key, device_id, device_model, icon="mdi:ev-plug-type2"):
-        super().__init__(coordinator, key, device_id, device_model, icon)
+    _attr_suggested_display_precision = 1
+    # below one 0.1 kW step of charging power, DLB powers are in 0.01 kW steps
+    _deadband = 0.05
+    _relative_deadband = 0.02
+
+    def __init__(self, coordinator, key, device_id, device_model, icon="mdi:ev-plug-type2", **kwargs):
+        super().__init__(coordinator, key, device_id, device_model, icon, **kwargs)
 
     @property
     def unit_of_measurement(self):
         return UnitOfPower.KILO_WATT
 
 
+class BenyWifiDlbPowerSensor(BenyWifiPowerSensor):
+    _attr_suggested_display_precision = 2
+
+
 class BenyWifiTemperatureSensor(BenyWifiSensor):
-    def __init__(self, coordinator, key, device_id, device_model, icon="mdi:thermometer"):
-        super().__init__(coordinator, key, device_id, device_model, icon)
+    def __init__(self, coordinator, key, device_id, device_model, icon="mdi:thermometer", **kwargs):
+        super().__init__(coordinator, key, device_id, device_model, icon, **kwargs)
 
     @property
     def unit_of_measurement(self):
@@ -133,8 +226,8 @@ class BenyWifiTemperatureSensor(BenyWifiSensor):
 
 
 class BenyWifiEnergySensor(BenyWifiSensor):
-    def __init__(self, coordinator, key, device_id, device_model, icon="mdi:power-plug-battery"):
-        super().__init__(coordinator, key, device_id, device_model, icon)
+    def __init__(self, coordinator, key, device_id, device_model, icon="mdi:power-plug-battery", **kwargs):
+        super().__init__(coordinator, key, device_id, device_model, icon, **kwargs)
 
     @property
     def unit_of_measurement(self):
@@ -142,5 +235,59 @@ class BenyWifiEnergySensor(BenyWifiSensor):
 
 
 class BenyWifiTimerSensor(BenyWifiSensor):
-    def __init__(self, coordinator, key, device_id, device_model, icon="mdi:timer-sand-empty"):
-        super().__init__(coordinator, key, device_id, device_model, icon)
+    def __init__(self, coordinator, key, device_id, device_model, icon="mdi:timer-sand-empty", **kwargs):
+        super().__init__(coordinator, key, device_id, device_model, icon, **kwargs)
+
+
+class BenyWifiCircuitBreakerSensor(BenyWifiSensor):
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    def __init__(self, coordinator, key, device_id, device_model, icon="mdi:lan-disconnect", **kwargs):
+        super().__init__(coordinator, key, device_id, device_model, icon, **kwargs)
+
+    @property
+    def available(self):
+        # breaker state is known also when charger is offline
+        return True
+
+    @property
+    def state(self):
+        return self.coordinator.breaker.state
+
+    @property
+    def extra_state_attributes(self):
+        return {
+            "consecutive_failures": self.coordinator.breaker.consecutive_failures,
+            "opened_at": self.coordinator.breaker.opened_at,
+        }
+
+
+class BenyWifiTransportSensor(BenyWifiSensor):
+    """Request counter of charger transport, read from memory on every update.
+
+    Written also after failed refreshes, when the counters change the most.
+    """
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+
+    def __init__(self, coordinator, key, device_id, device_model, icon="mdi:counter", **kwargs):
+        super().__init__(coordinator, key, device_id, device_model, icon, **kwargs)
+
+    @property
+    def available(self):
+        # counters are known also when charger is offline
+        return True
+
+    @property
+    def state(self):
+        return getattr(self.coordinator.transport.stats, self.key)
+
+
+class BenyWifiRttSensor(BenyWifiTransportSensor):
+    def __init__(self, coordinator, key, device_id, device_model, icon="mdi:timer-outline", **kwargs):
+        super().__init__(coordinator, key, device_id, device_model, icon, **kwargs)
+
+    @property
+    def unit_of_measurement(self):
+        return UnitOfTime.MILLISECONDS
@@ -8,7 +8,7 @@ from homeassistant.const import ATTR_DEVICE_ID
 from homeassistant.core import HomeAssistant, ServiceCall, SupportsResponse
 from homeassistant.helpers import device_registry as dr
 
-from .const import DOMAIN
+from .const import DOMAIN, ENDPOINT, SCHEDULER
 from .coordinator import BenyWifiUpdateCoordinator
 
 _LOGGER = logging.getLogger(__name__)
@@ -132,7 +132,7 @@ def _get_device_name(hass: HomeAssistant, device_id: str) -> Optional[str]:
 
 
 def _get_coordinator_from_device(hass: HomeAssistant, call: ServiceCall) -> Optional[BenyWifiUpdateCoordinator]:
-    coordinators = list(hass.data[DOMAIN].values())
+    coordinators = [data for key, data in hass.data[DOMAIN].items() if key not in (ENDPOINT, SCHEDULER)]
 
     if len(coordinators) == 1:
         return coordinators[0]["coordinator"]
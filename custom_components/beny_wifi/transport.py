@@ -0,0 +1,511 @@
+"""Asyncio UDP transport for Beny Wifi chargers."""
+import asyncio
+from collections import defaultdict, deque
+from contextlib import AbstractAsyncContextManager, nullcontext
+import logging
+import random
+import time
+
+from .const import (
+    CLIENT_MESSAGE,
+    DEFAULT_RETRIES,
+    FRAME_HISTORY,
+    REQUEST_DEADLINE,
+    RETRY_BACKOFF,
+    RTO_INITIAL,
+    RTO_MAX,
+    RTO_MIN,
+    RTT_STATS_WINDOW,
+    SEND_RATE_BURST,
+    SEND_RATE_LIMIT,
+    SERVER_MESSAGE,
+)
+from .communication import decode_frame, get_frame_code, get_frame_type, read_message
+from .conversions import get_request_code
+
+_LOGGER = logging.getLogger(__name__)
+
+_PIN = CLIENT_MESSAGE.REQUEST_DATA.value["structure"]["pin"]
+
+
+class RttEstimator:
+    """Round-trip time estimator driving request timeouts.
+
+    Follows TCP's retransmission timeout computation (RFC 6298): smoothed
+    RTT and RTT variance are updated from every response to a request that
+    was not retransmitted, and the timeout is doubled after a lost response.
+    Requests of one charger sent together share the estimator, so losses
+    of them all back off the timeout once.
+    """
+
+    ALPHA = 1 / 8
+    BETA = 1 / 4
+    K = 4
+
+    def __init__(self, srtt: float | None = None, rttvar: float | None = None) -> None:
+        """Initialize estimator, optionally warm-started from stored values."""
+        self.srtt = srtt
+        self.rttvar = rttvar
+        self.rto = RTO_INITIAL
+        if srtt is not None and rttvar is not None:
+            self._update_rto()
+
+    def sample(self, rtt: float) -> None:
+        """Update estimate with measured round-trip time in seconds."""
+        if self.srtt is None or self.rttvar is None:
+            self.srtt = rtt
+            self.rttvar = rtt / 2
+        else:
+            self.rttvar = (1 - self.BETA) * self.rttvar + self.BETA * abs(self.srtt - rtt)
+            self.srtt = (1 - self.ALPHA) * self.srtt + self.ALPHA * rtt
+        self._update_rto()
+
+    def backoff(self, expired: float | None = None) -> None:
+        """Double timeout after lost response.
+
+        Args:
+            expired (float | None): timeout the lost attempt started with,
+                timeout already backed off from it is not doubled again
+
+        """
+        if expired is not None and self.rto != expired:
+            return
+        self.rto = min(self.rto * 2, RTO_MAX)
+
+    def _update_rto(self) -> None:
+        self.rto = min(max(self.srtt + self.K * self.rttvar, RTO_MIN), RTO_MAX)
+
+    def as_dict(self) -> dict:
+        """Return estimator state for storage."""
+        return {"srtt": self.srtt, "rttvar": self.rttvar}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "RttEstimator":
+        """Create estimator from stored state."""
+        return cls(data.get("srtt"), data.get("rttvar"))
+
+
+class TransportStats:
+    """Request counters and recent round-trip times of one charger.
+
+    Kept in memory only, read by diagnostic sensors.
+    """
+
+    def __init__(self, window: int = RTT_STATS_WINDOW) -> None:
+        """Initialize counters."""
+        self.requests = 0
+        self.timeouts = 0
+        self.retries = 0
+        self.checksum_failures = 0
+        self.access_denied = 0
+        self._rtts: deque[float] = deque(maxlen=window)
+
+    def record_rtt(self, rtt: float) -> None:
+        """Record round-trip time in seconds."""
+        self._rtts.append(rtt)
+
+    @property
+    def rtt_min(self) -> float | None:
+        """Return minimum of recent round-trip times in milliseconds."""
+        return round(min(self._rtts) * 1000, 1) if self._rtts else None
+
+    @property
+    def rtt_avg(self) -> float | None:
+        """Return average of recent round-trip times in milliseconds."""
+        return round(sum(self._rtts) / len(self._rtts) * 1000, 1) if self._rtts else None
+
+    @property
+    def rtt_p95(self) -> float | None:
+        """Return 95th percentile of recent round-trip times in milliseconds."""
+        if not self._rtts:
+            return None
+        rtts = sorted(self._rtts)
+        return round(rtts[min(int(len(rtts) * 0.95), len(rtts) - 1)] * 1000, 1)
+
+
+class TokenBucket:
+    """Token bucket limiting rate of sent datagrams.
+
+    Up to burst datagrams can be sent at once, after that at most rate
+    datagrams per second. Waiting senders are served in order.
+    """
+
+    def __init__(self, rate: float, burst: int) -> None:
+        """Initialize full bucket."""
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def async_acquire(self) -> None:
+        """Wait until a datagram can be sent."""
+        async with self._lock:
+            self._refill()
+            while self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= 1
+
+
+class BenyWifiProtocol(asyncio.DatagramProtocol):
+    """Datagram protocol passing received datagrams to its endpoint."""
+
+    def __init__(self, owner: "BenyWifiEndpoint") -> None:
+        """Initialize protocol."""
+        self._owner = owner
+        self.transport: asyncio.DatagramTransport | None = None
+
+    def connection_made(self, transport: asyncio.DatagramTransport) -> None:
+        """Keep socket, so its loss can be told apart from loss of a newer one."""
+        self.transport = transport
+
+    def datagram_received(self, data: bytes, addr: tuple[str, int]) -> None:
+        """Handle datagram received from charger."""
+        self._owner.datagram_received(data, addr)
+
+    def error_received(self, exc: Exception) -> None:
+        """Handle socket error, e.g. ICMP port unreachable."""
+        self._owner.error_received(exc)
+
+    def connection_lost(self, exc: Exception | None) -> None:
+        """Handle closed socket."""
+        self._owner.connection_lost(exc, self.transport)
+
+
+class BenyWifiEndpoint:
+    """UDP socket shared by the transports of all chargers.
+
+    Received datagrams are routed to the transport of the charger by source
+    address. Handshakes from an unknown address are routed by the serial
+    number in them, and the charger address is updated (e.g. after a DHCP
+    lease change). Datagrams sent to all chargers together are rate limited
+    so that refreshing a fleet of chargers does not burst the access point.
+
+    The socket is opened on first use and closed when the last transport
+    is closed.
+    """
+
+    def __init__(self, rate: float = SEND_RATE_LIMIT, burst: int = SEND_RATE_BURST) -> None:
+        """Initialize endpoint."""
+        self._transport: asyncio.DatagramTransport | None = None
+        self._connect_lock = asyncio.Lock()
+        self._routes: dict[tuple[str, int], "BenyWifiTransport"] = {}
+        self._serials: dict[int, "BenyWifiTransport"] = {}
+        self._bucket = TokenBucket(rate, burst)
+
+    @property
+    def connected(self) -> bool:
+        """Return True if socket is open."""
+        return self._transport is not None and not self._transport.is_closing()
+
+    def register(self, transport: "BenyWifiTransport") -> None:
+        """Route datagrams of the charger to transport."""
+        addr = (transport.ip_address, transport.port)
+        if addr in self._routes and self._routes[addr] is not transport:
+            _LOGGER.warning(f"Charger {addr[0]}:{addr[1]} is configured more than once")  # noqa: G004
+        self._routes[addr] = transport
+        if transport.serial is not None:
+            self._serials[transport.serial] = transport
+
+    def unregister(self, transport: "BenyWifiTransport") -> None:
+        """Stop routing datagrams to transport, close socket after last transport."""
+        for routes in (self._routes, self._serials):
+            for key in [key for key, value in routes.items() if value is transport]:
+                del routes[key]
+
+        if not self._routes and self._transport is not None:
+            self._transport.close()
+            self._transport = None
+
+    async def async_connect(self) -> None:
+        """Open socket if not open yet."""
+        async with self._connect_lock:
+            if self.connected:
+                return
+
+            loop = asyncio.get_running_loop()
+            self._transport, _ = await loop.create_datagram_endpoint(
+                lambda: BenyWifiProtocol(self),
+                local_addr=("0.0.0.0", 0),
+            )
+            _LOGGER.debug(f"Opened UDP endpoint on {self._transport.get_extra_info('sockname')}")  # noqa: G004
+
+    async def async_send(self, data: bytes, addr: tuple[str, int]) -> None:
+        """Send datagram within the rate limit."""
+        await self._bucket.async_acquire()
+        await self.async_connect()
+        self._transport.sendto(data, addr)
+
+    def datagram_received(self, data: bytes, addr: tuple[str, int]) -> None:
+        """Route received datagram to the transport of the charger."""
+        transport = self._routes.get(addr)
+        if transport is None:
+            transport = self._route_handshake(data, addr)
+        if transport is None:
+            _LOGGER.debug(f"Discarding datagram from unknown charger {addr}: {data!r}")  # noqa: G004
+            return
+
+        transport.datagram_received(data, addr)
+
+    def _route_handshake(self, data: bytes, addr: tuple[str, int]) -> "BenyWifiTransport | None":
+        """Find transport by serial of handshake, and route its new address to it."""
+        frame = decode_frame(data)
+        if frame is None or get_frame_type(frame) != SERVER_MESSAGE.HANDSHAKE:
+            return None
+
+        transport = self._serials.get(read_message(data, SERVER_MESSAGE.HANDSHAKE)["serial"])
+        if transport is not None:
+            _LOGGER.info(f"Charger {transport.serial} moved to {addr[0]}:{addr[1]}")  # noqa: G004
+            self._routes.pop((transport.ip_address, transport.port), None)
+            transport.ip_address, transport.port = addr
+            self._routes[addr] = transport
+
+        return transport
+
+    def error_received(self, exc: Exception) -> None:
+        """Log socket error.
+
+        Error of the shared socket cannot be attributed to one charger,
+        pending requests time out instead.
+        """
+        _LOGGER.debug(f"UDP endpoint error: {exc}")  # noqa: G004
+
+    def connection_lost(
+        self, exc: Exception | None, sock: asyncio.DatagramTransport | None = None
+    ) -> None:
+        """Forget closed socket and fail pending requests.
+
+        Loss of a socket already replaced by a newer one (e.g. during reload)
+        is ignored, requests pending on the newer socket are kept.
+        """
+        if sock is not self._transport:
+            return
+
+        self._transport = None
+        for transport in set(self._routes.values()):
+            transport.connection_lost(exc)
+
+    def close(self) -> None:
+        """Close socket and fail pending requests of all transports."""
+        if self._transport is not None:
+            self._transport.close()
+            self._transport = None
+        for transport in set(self._routes.values()):
+            transport.connection_lost(ConnectionError("UDP endpoint closed"))
+
+
+class BenyWifiTransport:
+    """Long-lived UDP transport to a single charger.
+
+    Requests are sent over a BenyWifiEndpoint socket shared with the other
+    chargers, or over an endpoint of its own if none is given. The socket is
+    reused for every request, so polls and service calls never block an
+    executor thread or create new sockets.
+
+    Charger echoes the request type or command code of the request in its
+    response. Pending requests are keyed by that code, so requests with
+    different codes (e.g. VALUES, DLB and SETTINGS) can be in flight at the
+    same time. Responses nobody is waiting for, such as late duplicates, are
+    discarded.
+
+    Request timeouts follow the measured round-trip time of the charger, see
+    RttEstimator. Retries back off exponentially with random jitter. The
+    limiter, e.g. the concurrency cap of FleetScheduler, is held by every
+    attempt only while it waits for the response, not between retries.
+    """
+
+    def __init__(
+        self,
+        ip_address: str,
+        port: int,
+        endpoint: BenyWifiEndpoint | None = None,
+        serial: int | None = None,
+        limiter: AbstractAsyncContextManager | None = None,
+    ) -> None:
+        """Initialize transport.
+
+        Args:
+            ip_address (str): charger ip address
+            port (int): charger udp port
+            endpoint (BenyWifiEndpoint | None): shared endpoint
+            serial (int | None): charger serial number
+            limiter (AbstractAsyncContextManager | None): context held by
+                every attempt of a request
+
+        """
+        self.ip_address = ip_address
+        self.port = port
+        self.serial = serial
+        self._endpoint = endpoint if endpoint is not None else BenyWifiEndpoint()
+        self._endpoint.register(self)
+        self._limiter = limiter if limiter is not None else nullcontext()
+        self._pending: dict[int, tuple[asyncio.Future, tuple[SERVER_MESSAGE, ...]]] = {}
+        self._locks: defaultdict[int, asyncio.Lock] = defaultdict(asyncio.Lock)
+        self.rtt = RttEstimator()
+        self.stats = TransportStats()
+        self.frames: deque[tuple[float, str, str]] = deque(maxlen=FRAME_HISTORY)
+
+    @property
+    def connected(self) -> bool:
+        """Return True if socket is open."""
+        return self._endpoint.connected
+
+    async def async_connect(self) -> None:
+        """Open socket if not open yet."""
+        await self._endpoint.async_connect()
+
+    async def async_request(
+        self,
+        request: bytes,
+        expected: tuple[SERVER_MESSAGE, ...] = (),
+        retries: int = DEFAULT_RETRIES,
+        timeout: float | None = None,
+        deadline: float = REQUEST_DEADLINE,
+    ) -> bytes:
+        """Send request and wait for the matching response, with retries.
+
+        Retries are sent after a random delay growing with every retry, and
+        no attempt is started or waited for past the deadline.
+
+        Args:
+            request (bytes): ascii hex message
+            expected (tuple[SERVER_MESSAGE, ...]): accepted response types,
+                acknowledgement (ACCESS_DENIED) is always accepted
+            retries (int): number of attempts
+            timeout (float | None): fixed seconds to wait for response per
+                attempt, adaptive timeout is used if not given
+            deadline (float): seconds to wait for response over all attempts
+
+        Returns:
+            bytes: response datagram
+
+        Raises:
+            TimeoutError: no response after all attempts or within deadline
+            OSError: socket error
+
+        """
+        code = get_request_code(request.decode("ascii"))
+        expected = (*expected, SERVER_MESSAGE.ACCESS_DENIED)
+        end = time.monotonic() + deadline
+
+        async with self._locks[code]:
+            await self.async_connect()
+            future = asyncio.get_running_loop().create_future()
+            self._pending[code] = (future, expected)
+            self.stats.requests += 1
+
+            attempts = 0
+            try:
+                for attempt in range(retries):
+                    if attempt:
+                        # a late response to the previous attempt still
+                        # completes the request while waiting for the retry
+                        delay = min(self._retry_delay(attempt), end - time.monotonic())
+                        await asyncio.wait((future,), timeout=max(delay, 0))
+                        if future.done():
+                            return future.result()
+                    if time.monotonic() >= end:
+                        _LOGGER.debug(f"UDP request deadline of {deadline} seconds passed")  # noqa: G004
+                        break
+                    if attempt:
+                        self.stats.retries += 1
+                    async with self._limiter:
+                        await self._endpoint.async_send(request, (self.ip_address, self.port))
+                        self._record("sent", request)
+                        attempts += 1
+                        sent = time.monotonic()
+                        rto = self.rtt.rto
+                        try:
+                            async with asyncio.timeout(min(self._attempt_timeout(timeout), end - sent)):
+                                # shield, so a late response to the previous attempt
+                                # still completes the request
+                                response = await asyncio.shield(future)
+                        except TimeoutError:
+                            self.rtt.backoff(rto)
+                            _LOGGER.debug(
+                                f"UDP request timed out (attempt {attempt + 1}/{retries})"  # noqa: G004
+                            )
+                        else:
+                            # Karn's algorithm: response to a retransmitted request
+                            # cannot be attributed to one attempt, do not sample it
+                            if attempt == 0:
+                                rtt = time.monotonic() - sent
+                                self.rtt.sample(rtt)
+                                self.stats.record_rtt(rtt)
+                            return response
+            finally:
+                self._pending.pop(code, None)
+                if not future.done():
+                    future.cancel()
+
+            self.stats.timeouts += 1
+            raise TimeoutError(f"timed out after {attempts} attempts")
+
+    def _record(self, direction: str, data: bytes) -> None:
+        """Keep frame in history, pin of sent frames redacted."""
+        frame = data.decode("ascii", errors="replace")
+        if direction == "sent":
+            frame = frame[:_PIN.start] + "*" * (_PIN.stop - _PIN.start) + frame[_PIN.stop:]
+        self.frames.append((time.time(), direction, frame))
+
+    def _attempt_timeout(self, timeout: float | None) -> float:
+        """Return timeout for attempt.
+
+        Estimator timeout is doubled after every lost response, jitter keeps
+        retries of concurrent requests from lining up.
+        """
+        if timeout is not None:
+            return timeout
+
+        return self.rtt.rto * random.uniform(1.0, 1.25)
+
+    @staticmethod
+    def _retry_delay(attempt: int) -> float:
+        """Return random delay before retry, its range doubling for every retry."""
+        return random.uniform(0, RETRY_BACKOFF * 2 ** (attempt - 1))
+
+    def datagram_received(self, data: bytes, addr: tuple[str, int]) -> None:
+        """Complete pending request matching received datagram."""
+        self._record("received", data)
+        frame = decode_frame(data)
+        if frame is None:
+            self.stats.checksum_failures += 1
+            _LOGGER.debug(f"Discarding datagram with invalid checksum from {addr}: {data!r}")  # noqa: G004
+            return
+        try:
+            msg_type = get_frame_type(frame)
+            code = get_frame_code(frame)
+        except (IndexError, ValueError):
+            _LOGGER.debug(f"Discarding malformed datagram from {addr}: {data!r}")  # noqa: G004
+            return
+
+        future, expected = self._pending.get(code, (None, ()))
+        if future is None or future.done():
+            _LOGGER.debug(f"Discarding stale or duplicate datagram from {addr}: {data!r}")  # noqa: G004
+            return
+
+        if msg_type not in expected:
+            _LOGGER.debug(f"Discarding unexpected {msg_type} from {addr}: {data!r}")  # noqa: G004
+            return
+
+        future.set_result(data)
+
+    def connection_lost(self, exc: Exception | None) -> None:
+        """Fail pending requests on closed socket."""
+        self._fail_pending(exc or ConnectionError("UDP transport closed"))
+
+    def _fail_pending(self, exc: Exception) -> None:
+        for future, _ in self._pending.values():
+            if not future.done():
+                future.set_exception(exc)
+
+    def close(self) -> None:
+        """Stop receiving datagrams and fail pending requests."""
+        self._endpoint.unregister(self)
+        self._fail_pending(ConnectionError("UDP transport closed"))
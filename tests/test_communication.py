@@ -1,6 +1,8 @@
 # tests/test_communication.py
-from custom_components.beny_wifi.communication import read_message, build_message, get_message_type
-from custom_components.beny_wifi.const import SERVER_MESSAGE, CLIENT_MESSAGE, CHARGER_STATE, TIMER_STATE, REQUEST_TYPE, CHARGER_COMMAND
+import pytest
+
+from custom_components.beny_wifi.communication import read_message, build_message, decode_frame, get_message_type, read_dlb_sample, read_sample
+from custom_components.beny_wifi.const import SERVER_MESSAGE, CLIENT_MESSAGE, CHARGER_STATE, TIMER_STATE, REQUEST_TYPE, CHARGER_COMMAND, validate_checksum
 
 def test_read_message_valid():
     data = "55aa10001103075BCD15c0a801220d0504"
@@ -142,4 +144,56 @@ def test_set_timer():
     assert result["start_h"] == 0
     assert result["start_min"] == 0
     assert result["end_h"] == 8
-    assert result["end_min"] == 0
\ No newline at end of file
+    assert result["end_min"] == 0
+
+
+def test_read_message_datagram():
+    # Received datagram is decoded as is, without converting it to str first
+    data = "55aa1000237000000000e600e600e6000000005e06000000000000000f0000000003ca"
+    msg_type = SERVER_MESSAGE.SEND_VALUES_3P
+
+    result = read_message(data.encode("ascii"), msg_type)
+    assert result == read_message(data, msg_type)
+    assert result["voltage1"] == 230
+    assert result["state"] == CHARGER_STATE.CHARGING.name
+
+def test_read_message_not_hex():
+    assert read_message(b"55aa10001103075BCD15c0a80122zz0504") is None
+
+def test_build_message_missing_parameter():
+    with pytest.raises(ValueError):
+        build_message(CLIENT_MESSAGE.REQUEST_DATA, {"pin": "0cb34"})
+
+def test_build_message_checksum_with_odd_parameter():
+    # pin has odd number of digits, checksum must match full recalculation
+    msg = build_message(CLIENT_MESSAGE.REQUEST_DATA, {"pin": "0cb34", "request_type": "7b"})
+    assert msg == "55aa10000b0000cb347b94"
+    assert validate_checksum(msg)
+
+def test_read_message_access_denied():
+    data = "55aa10000870ff86"
+    result = read_message(data)
+    assert result["message_type"] == str(SERVER_MESSAGE.ACCESS_DENIED)
+    assert result["message_id"] == 8
+
+def test_read_sample():
+    frame = decode_frame(b"55aa1000237000000000e600e600e6000000005e06000000000000000f0000000003ca")
+    sample = read_sample(frame, SERVER_MESSAGE.SEND_VALUES_3P)
+    assert sample.state == CHARGER_STATE.CHARGING.name
+    assert sample.charger_state == "charging"
+    assert sample.voltage1 == 230
+    assert sample.power == 0.0
+    assert sample.temperature == -6  # offset by 100
+    assert sample.max_current == 15
+    assert sample.grid_import is None  # DLB not read yet
+
+    read_dlb_sample(decode_frame(b"55aa7b00117b00000000000a0014000529"), sample)
+    assert sample.ev_power == 0.1
+    assert sample.house_power == 0.2
+    assert sample.grid_import == 0.05
+    assert sample.grid_export == 0
+
+def test_read_sample_not_values():
+    frame = decode_frame("55aa10001103075BCD15c0a801220d0504")
+    with pytest.raises(ValueError):
+        read_sample(frame, SERVER_MESSAGE.HANDSHAKE)
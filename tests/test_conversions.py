@@ -4,12 +4,13 @@ from custom_components.beny_wifi.conversions import (
     convert_schedule,
     convert_weekdays_to_dict,
     convert_weekdays_to_hex,
+    find_message_type,
     get_hex,
     get_message_type,
     get_model
 )
 
-from custom_components.beny_wifi.const import CLIENT_MESSAGE, SERVER_MESSAGE
+from custom_components.beny_wifi.const import CLIENT_MESSAGE, REQUEST_TYPE, SERVER_MESSAGE
 
 def test_convert_timer():
     start_time = "08:00"
@@ -82,6 +83,15 @@ def test_get_message_type():
     # Test for invalid msg_int
     assert get_message_type("55aafff0fff000000000e600e800e6000000006102000000000000000f0000000003cb") is None, "get_message_type should return None for unknown msg_int"
 
+def test_find_message_type():
+    # message type of header and echoed request type resolve messages sharing an id
+    assert find_message_type(0x10, 17) == SERVER_MESSAGE.HANDSHAKE
+    assert find_message_type(0x7B, 17) == SERVER_MESSAGE.SEND_DLB
+    assert find_message_type(0x10, 32, REQUEST_TYPE.SETTINGS.value) == SERVER_MESSAGE.SEND_SETTINGS
+    assert find_message_type(0x10, 32, REQUEST_TYPE.MODEL.value) == SERVER_MESSAGE.SEND_MODEL
+    assert find_message_type(0x10, 8) == SERVER_MESSAGE.ACCESS_DENIED
+    assert find_message_type(0x10, 99) is None
+
 def test_get_model():
     # Test data with model value 'BCP-AT1N-L'
     data = "0000000000000000000000000000000000000000000000004243502d4154314e2d4c0000000000000000000000000000000000000000"
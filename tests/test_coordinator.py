@@ -1,9 +1,13 @@
+import asyncio
+import logging
 import pytest
-import socket
 from unittest.mock import patch, MagicMock, AsyncMock, call
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.update_coordinator import UpdateFailed
 from custom_components.beny_wifi.coordinator import BenyWifiUpdateCoordinator
+from custom_components.beny_wifi.const import BREAKER_FAILURE_THRESHOLD, SERVER_MESSAGE
+from custom_components.beny_wifi.models import ChargerSample
+from custom_components.beny_wifi.sensor import BenyWifiCircuitBreakerSensor, BenyWifiTransportSensor
 from datetime import datetime, timedelta
 
 @pytest.fixture
@@ -25,15 +29,20 @@ def coordinator(mock_hass):
     # Mock the config_entry data
     config_entry = MagicMock()
     config_entry.data = {
-        "serial": "1234567890"  # Mock the serial number
+        "serial": "1234567890",  # Mock the serial number
+        "pin": "0cb34",
+        "dlb": False,
     }
     coordinator = BenyWifiUpdateCoordinator(
         hass=mock_hass,
+        config_entry=config_entry,
         ip_address="192.168.1.100",
         port=502,
         scan_interval=10,
     )
     coordinator.config_entry = config_entry  # Mock config_entry to avoid 'NoneType' error
+    coordinator._store = MagicMock()  # Do not touch storage
+    coordinator._store.async_load = AsyncMock(return_value=None)
     return coordinator
 
 @pytest.fixture
@@ -42,39 +51,41 @@ def mock_get_states(mock_hass):
     with patch.object(mock_hass.states, "get") as mock_get:
         yield mock_get
 
-@patch("custom_components.beny_wifi.coordinator.BenyWifiUpdateCoordinator._send_udp_request")
-@patch("custom_components.beny_wifi.coordinator.read_message")
-async def test_successful_data_fetch(mock_read_message, mock_send_udp_request, coordinator):
+@pytest.mark.asyncio
+@patch("custom_components.beny_wifi.coordinator.BenyWifiUpdateCoordinator._send_udp_request", new_callable=AsyncMock)
+@patch("custom_components.beny_wifi.coordinator.read_sample")
+async def test_successful_data_fetch(mock_read_sample, mock_send_udp_request, coordinator):
     """Test successful data fetch from the coordinator."""
     
     # Prepare mock response from UDP request (simulated)
     mock_send_udp_request.return_value = b"55aa1000237000000000e600e600e6000000005e06000000000000000f0000000003ca"
     
-    # Simulate a valid read_message response
-    mock_read_message.return_value = {
-        "state": "standby",
-        "power": 0.0,
-        "total_kwh": 0.0,
-        "timer_start_h": 8,
-        "timer_start_min": 0,
-        "timer_end_h": 7,
-        "timer_end_min": 30,
-        "timer_state": "UNSET"
-    }
+    # Simulate a valid read_sample response
+    mock_read_sample.return_value = ChargerSample(
+        state="standby",
+        power=0.0,
+        total_kwh=0.0,
+        timer_start_h=8,
+        timer_start_min=0,
+        timer_end_h=7,
+        timer_end_min=30,
+        timer_state="UNSET",
+    )
 
     # Call the update function
     data = await coordinator._async_update_data()
 
     # Check if the data was correctly transformed and returned
-    assert data["state"] == "standby"
-    assert data["power"] == 0.0
-    assert data["total_kwh"] == 0.0
-    assert data["timer_start"] == "not_set"
-    assert data["timer_end"] == "not_set"
-    assert data["timer_state"] == "UNSET"
+    assert data.state == "standby"
+    assert data.power == 0.0
+    assert data.total_kwh == 0.0
+    assert data.timer_start == "not_set"
+    assert data.timer_end == "not_set"
+    assert data.timer_state == "UNSET"
 
 
-@patch("custom_components.beny_wifi.coordinator.BenyWifiUpdateCoordinator._send_udp_request")
+@pytest.mark.asyncio
+@patch("custom_components.beny_wifi.coordinator.BenyWifiUpdateCoordinator._send_udp_request", new_callable=AsyncMock)
 async def test_udp_request_failure(mock_send_udp_request, coordinator):
     """Test that the coordinator raises an error when the UDP request fails."""
 
@@ -85,91 +96,71 @@ async def test_udp_request_failure(mock_send_udp_request, coordinator):
     with pytest.raises(UpdateFailed):
         await coordinator._async_update_data()  # Ensure this is awaited
 
-@patch("custom_components.beny_wifi.coordinator.read_message")
-@patch("socket.socket")
-async def test_async_toggle_charging_start_with_socket(mock_socket, mock_read_message, coordinator):
-    """Test toggling charging start with simulated socket."""
-
-    # Create a mock socket instance
-    mock_socket_instance = MagicMock()
-    mock_socket.return_value = mock_socket_instance
-
-    # Simulate sending data with `sendto`
-    def mock_sendto(data, addr):
-        assert data == b"55aa10000b0000cb347089"  # Verify the correct request data is sent
-        assert addr == ("192.168.1.100", 502)  # Verify correct IP and port
-    mock_socket_instance.sendto.side_effect = mock_sendto
-
-    # Simulate receiving data with `recvfrom`
-    mock_socket_instance.recvfrom.return_value = (b"55aa10001103499602D2c0a801640d05d8", ("192.168.1.100", 502))
-
-    # Mock the parsed message structure returned by `read_message`
-    mock_read_message.return_value = {
-        "state": "standby",
-        "power": 0.0,
-        "total_kwh": 0.0,
-        "timer_start_h": 8,
-        "timer_start_min": 0,
-        "timer_end_h": 10,
-        "timer_end_min": 30,
-        "timer_state": "START_END_TIME"
-    }
-
-    # Mock the built message
-    with patch("custom_components.beny_wifi.communication.build_message") as mock_build_message:
-        mock_build_message.return_value = b"mocked_request"
+@pytest.mark.asyncio
+@patch("custom_components.beny_wifi.coordinator.read_sample")
+@patch("custom_components.beny_wifi.coordinator.BenyWifiTransport.async_request", new_callable=AsyncMock)
+async def test_fetch_data_over_transport(mock_async_request, mock_read_sample, coordinator):
+    """Test that data is fetched over the persistent charger transport."""
+
+    mock_async_request.return_value = b"55aa1000237000000000e600e600e6000000005e06000000000000000f0000000003ca"
+
+    # Mock the sample returned by `read_sample`
+    mock_read_sample.return_value = ChargerSample(
+        state="standby",
+        power=0.0,
+        total_kwh=0.0,
+        temperature=20,
+        timer_start_h=8,
+        timer_start_min=0,
+        timer_end_h=10,
+        timer_end_min=30,
+        timer_state="START_END_TIME",
+    )
 
-        # Call the coordinator's update method
-        data = await coordinator._async_update_data()
+    data = await coordinator._async_update_data()
 
-        # Assertions
-        assert data["state"] == "standby"
-        assert data["power"] == 0.0
-        assert data["total_kwh"] == 0.0
-        assert isinstance(data["timer_start"], datetime)
-        assert isinstance(data["timer_end"], datetime)
+    assert data.state == "standby"
+    assert data.power == 0.0
+    assert data.total_kwh == 0.0
+    assert isinstance(data.timer_start, datetime)
+    assert isinstance(data.timer_end, datetime)
 
-        # Verify socket operations
-        mock_socket.assert_called_once_with(socket.AF_INET, socket.SOCK_DGRAM)
-        mock_socket_instance.settimeout.assert_called_once_with(5)
-        mock_socket_instance.close.assert_called_once()
+    # Request goes through the transport, no socket per request
+    mock_async_request.assert_awaited_once_with(
+        b"55aa10000b0000cb347089", (SERVER_MESSAGE.SEND_VALUES_1P, SERVER_MESSAGE.SEND_VALUES_3P), 3, None
+    )
 
-@patch("socket.socket")
-async def test_socket_exception(mock_socket, coordinator):
+@pytest.mark.asyncio
+@patch("custom_components.beny_wifi.coordinator.BenyWifiTransport.async_request", new_callable=AsyncMock)
+async def test_socket_exception(mock_async_request, coordinator):
     """Test that a socket exception is correctly handled and raises UpdateFailed."""
 
-    # Create a mock socket instance
-    mock_socket_instance = MagicMock()
-    mock_socket.return_value = mock_socket_instance
+    mock_async_request.side_effect = OSError("Mocked socket error")
 
-    # Simulate a socket exception when sending data
-    mock_socket_instance.sendto.side_effect = socket.error("Mocked socket error")
+    with pytest.raises(UpdateFailed, match="Error sending UDP request: Mocked socket error"):
+        await coordinator._async_update_data()
 
-    # Mock the built message
-    with patch("custom_components.beny_wifi.communication.build_message") as mock_build_message:
-        mock_build_message.return_value = b"55aa10000b0000cb347089"
+    mock_async_request.assert_awaited_once()
 
-        # Call the coordinator's update method and ensure it raises UpdateFailed
-        with pytest.raises(UpdateFailed, match="Error sending UDP request: Mocked socket error"):
-            await coordinator._async_update_data()
+@pytest.mark.asyncio
+@patch("custom_components.beny_wifi.coordinator.BenyWifiTransport.async_request", new_callable=AsyncMock)
+async def test_transport_timeout(mock_async_request, coordinator):
+    """Test that a transport timeout raises UpdateFailed."""
 
-    # Print the mock calls for debugging (optional)
-    print(mock_socket_instance.mock_calls)
+    mock_async_request.side_effect = TimeoutError("timed out after 3 attempts")
 
-    # Verify socket operations
-    mock_socket.assert_called_once_with(socket.AF_INET, socket.SOCK_DGRAM)
-    mock_socket_instance.settimeout.assert_called_once_with(5)
-    mock_socket_instance.sendto.assert_called_once_with(b"55aa10000b0000cb347089", ("192.168.1.100", 502))
-    mock_socket_instance.close.assert_called_once()
+    with pytest.raises(UpdateFailed, match="timed out after 3 attempts"):
+        await coordinator._async_update_data()
 
+@pytest.mark.asyncio
 @patch("custom_components.beny_wifi.conversions.get_hex")
 @patch("custom_components.beny_wifi.communication.build_message")
-@patch("custom_components.beny_wifi.coordinator.BenyWifiUpdateCoordinator._send_udp_request")
+@patch("custom_components.beny_wifi.coordinator.BenyWifiUpdateCoordinator._send_udp_request", new_callable=AsyncMock)
 async def test_toggle_charging_start(mock_send_udp_request, mock_build_message, mock_get_hex, coordinator, mock_hass):
     """Test the start charging command, with multiple UDP requests."""
 
     # Mock the charger state as 'standby'
-    mock_hass.states.get.return_value = "standby"
+    mock_hass.states.get.return_value = MagicMock(state="standby")
 
     # Mock get_hex to return valid hex string for the start command
     mock_get_hex.return_value = "01"  # Hex string for 'start' command
@@ -195,14 +186,15 @@ async def test_toggle_charging_start(mock_send_udp_request, mock_build_message,
 
 
 
+@pytest.mark.asyncio
 @patch("custom_components.beny_wifi.conversions.get_hex")
 @patch("custom_components.beny_wifi.communication.build_message")
-@patch("custom_components.beny_wifi.coordinator.BenyWifiUpdateCoordinator._send_udp_request")
+@patch("custom_components.beny_wifi.coordinator.BenyWifiUpdateCoordinator._send_udp_request", new_callable=AsyncMock)
 async def test_toggle_charging_stop(mock_send_udp_request, mock_build_message, mock_get_hex, coordinator, mock_hass):
     """Test the start charging command, with multiple UDP requests."""
 
     # Mock the charger state as 'standby'
-    mock_hass.states.get.return_value = "standby"
+    mock_hass.states.get.return_value = MagicMock(state="standby")
 
     # Mock get_hex to return valid hex string for the start command
     mock_get_hex.return_value = "00"  # Hex string for 'start' command
@@ -231,7 +223,7 @@ async def test_async_set_timer(coordinator):
     """Test async_set_timer method."""
     # Mock config_entry and SERIAL
     coordinator.config_entry = MagicMock()
-    coordinator.config_entry.data = {"serial": "some_serial"}
+    coordinator.config_entry.data = {"serial": "some_serial", "pin": "0cb34"}
 
     # Mock state sensor in Home Assistant
     device_name = "Test Charger"
@@ -239,7 +231,7 @@ async def test_async_set_timer(coordinator):
     end_time = "10:00"
     state_sensor_id = "sensor.some_serial_charger_state"
     state_sensor_value = "charging"
-    coordinator.hass.states.get.return_value = state_sensor_value
+    coordinator.hass.states.get.return_value = MagicMock(state=state_sensor_value)
 
     # Mock the _send_udp_request and build_message
     with patch("custom_components.beny_wifi.coordinator.build_message", return_value="mock_message"), \
@@ -265,13 +257,13 @@ async def test_async_reset_timer(coordinator):
     """Test async_reset_timer method."""
     # Mock config_entry and SERIAL
     coordinator.config_entry = MagicMock()
-    coordinator.config_entry.data = {"serial": "some_serial"}
+    coordinator.config_entry.data = {"serial": "some_serial", "pin": "0cb34"}
 
     # Mock state sensor in Home Assistant
     device_name = "Test Charger"
     state_sensor_id = "sensor.some_serial_charger_state"
     state_sensor_value = "charging"
-    coordinator.hass.states.get.return_value = state_sensor_value
+    coordinator.hass.states.get.return_value = MagicMock(state=state_sensor_value)
 
     # Mock the _send_udp_request and build_message
     with patch("custom_components.beny_wifi.coordinator.build_message", return_value="mock_message"), \
@@ -298,7 +290,7 @@ async def test_async_set_timer_unplugged(coordinator):
     start_time = "08:00"
     end_time = "10:00"
     state_sensor_value = "unplugged"
-    coordinator.hass.states.get.return_value = state_sensor_value
+    coordinator.hass.states.get.return_value = MagicMock(state=state_sensor_value)
 
     # Ensure _send_udp_request is not called
     with patch.object(coordinator, "_send_udp_request", new_callable=AsyncMock) as mock_send_udp:
@@ -316,7 +308,7 @@ async def test_async_reset_timer_unplugged(coordinator):
     """Test async_reset_timer method when charger is unplugged."""
     device_name = "Test Charger"
     state_sensor_value = "unplugged"
-    coordinator.hass.states.get.return_value = state_sensor_value
+    coordinator.hass.states.get.return_value = MagicMock(state=state_sensor_value)
 
     # Ensure _send_udp_request is not called
     with patch.object(coordinator, "_send_udp_request", new_callable=AsyncMock) as mock_send_udp:
@@ -363,7 +355,8 @@ async def test_edge_case_midnight(coordinator):
         await coordinator.async_set_timer(device_name, start_time, end_time)
         mock_send_udp.assert_called_once()
 
-@patch("custom_components.beny_wifi.coordinator.BenyWifiUpdateCoordinator._send_udp_request")
+@pytest.mark.asyncio
+@patch("custom_components.beny_wifi.coordinator.BenyWifiUpdateCoordinator._send_udp_request", new_callable=AsyncMock)
 async def test_state_mapping(mock_send_udp_request, coordinator):
     """Test state mapping to verify proper translation."""
 
@@ -374,4 +367,240 @@ async def test_state_mapping(mock_send_udp_request, coordinator):
     data = await coordinator._async_update_data()
 
     # Validate state mapping
-    assert data["state"] == "CHARGING"  # Expected mapping for 6102
\ No newline at end of file
+    assert data.state == "CHARGING"  # Expected mapping for 6102
+
+
+VALUES_3P_RESPONSE = b"55aa1000237000000000e600e600e6000000005e06000000000000000f0000000003ca"
+DLB_RESPONSE = b"55aa7b00117b00000000000a0014000529"
+
+
+@pytest.mark.asyncio
+async def test_values_and_dlb_fetched_concurrently(coordinator):
+    """Test that VALUES and DLB requests are in flight at the same time."""
+    coordinator.config_entry.data["dlb"] = True
+    in_flight = []
+    both_sent = asyncio.Event()
+
+    async def send(request, expected=()):
+        in_flight.append(request)
+        if len(in_flight) == 2:
+            both_sent.set()
+        await asyncio.wait_for(both_sent.wait(), 1)
+        return VALUES_3P_RESPONSE if request.startswith(b"55aa1000") else DLB_RESPONSE
+
+    with patch.object(coordinator, "_send_udp_request", side_effect=send):
+        data = await coordinator._async_update_data()
+
+    assert data.state == "CHARGING"
+    assert data.ev_power == 0.1
+    assert data.house_power == 0.2
+    assert data.grid_import == 0.05
+    assert data.grid_export == 0
+
+@pytest.mark.asyncio
+async def test_dlb_failure_keeps_previous_values(coordinator):
+    """Test that a failed DLB request does not fail the whole update."""
+    coordinator.config_entry.data["dlb"] = True
+    coordinator.data = ChargerSample(ev_power=1.5, house_power=2.0, grid_import=0.5, grid_export=0, solar_power=0)
+
+    async def send(request, expected=()):
+        if request.startswith(b"55aa7b"):
+            raise UpdateFailed("Error sending UDP request: timed out after 2 attempts")
+        return VALUES_3P_RESPONSE
+
+    with patch.object(coordinator, "_send_udp_request", side_effect=send):
+        data = await coordinator._async_update_data()
+
+    assert data.state == "CHARGING"
+    assert data.ev_power == 1.5
+    assert data.house_power == 2.0
+
+
+@pytest.mark.asyncio
+async def test_malformed_dlb_keeps_previous_values(coordinator):
+    """Test that a DLB frame failing to decode does not fail the whole update."""
+    coordinator.config_entry.data["dlb"] = True
+    coordinator.data = ChargerSample(ev_power=1.5, house_power=2.0, grid_import=0.5, grid_export=0, solar_power=0)
+
+    async def send(request, expected=()):
+        return DLB_RESPONSE if request.startswith(b"55aa7b") else VALUES_3P_RESPONSE
+
+    with patch.object(coordinator, "_send_udp_request", side_effect=send), \
+         patch("custom_components.beny_wifi.coordinator.read_dlb_sample", side_effect=ValueError("message too short")):
+        data = await coordinator._async_update_data()
+
+    assert data.state == "CHARGING"
+    assert data.ev_power == 1.5
+    assert data.house_power == 2.0
+
+
+@pytest.mark.asyncio
+async def test_rtt_estimate_restored_and_saved(coordinator):
+    """Test that the round-trip time estimate is warm-started and saved after refresh."""
+    coordinator._store.async_load.return_value = {"srtt": 0.05, "rttvar": 0.01}
+
+    await coordinator.async_load_rtt()
+
+    assert coordinator.transport.rtt.srtt == 0.05
+    assert coordinator.transport.rtt.rto == 0.3  # clamped to minimum
+
+    with patch.object(coordinator, "_send_udp_request", new_callable=AsyncMock) as mock_send_udp:
+        mock_send_udp.return_value = VALUES_3P_RESPONSE
+        await coordinator._async_update_data()
+
+    coordinator._store.async_delay_save.assert_called_once()
+    assert coordinator._store.async_delay_save.call_args[0][0]() == {"srtt": 0.05, "rttvar": 0.01}
+
+@pytest.mark.asyncio
+async def test_circuit_breaker_opens_and_closes(coordinator):
+    """Test that an unreachable charger is probed at low frequency until it answers."""
+    with patch.object(coordinator, "_send_udp_request", new_callable=AsyncMock) as mock_send_udp, \
+         patch.object(coordinator.transport, "async_request", new_callable=AsyncMock) as mock_probe:
+        mock_send_udp.side_effect = UpdateFailed("Error sending UDP request: timed out after 3 attempts")
+
+        for _ in range(3):
+            with pytest.raises(UpdateFailed):
+                await coordinator._async_update_data()
+
+        assert coordinator.breaker.is_open
+        assert coordinator.poll_interval == timedelta(seconds=300)
+        assert mock_send_udp.await_count == 3
+
+        # full update cycle is suppressed while charger does not answer probes
+        mock_probe.side_effect = TimeoutError("timed out after 1 attempts")
+        with pytest.raises(UpdateFailed, match="offline"):
+            await coordinator._async_update_data()
+        assert mock_send_udp.await_count == 3
+        assert mock_probe.await_args.kwargs["retries"] == 1
+
+        # first answered probe closes the breaker, its answer is the VALUES response
+        mock_probe.side_effect = None
+        mock_probe.return_value = VALUES_3P_RESPONSE
+        data = await coordinator._async_update_data()
+
+        assert data.state == "CHARGING"
+        assert mock_send_udp.await_count == 3
+        assert not coordinator.breaker.is_open
+        assert coordinator.breaker.consecutive_failures == 0
+        assert coordinator.poll_interval == coordinator.fast_scan_interval
+
+
+@pytest.mark.asyncio
+async def test_failed_updates_are_logged_once_until_breaker_opens(coordinator, caplog):
+    """Test that every failed update logs one warning, and nothing above debug once offline."""
+    caplog.set_level(logging.DEBUG, logger="custom_components.beny_wifi.coordinator")
+    with patch.object(coordinator.transport, "async_request", side_effect=TimeoutError("no response")):
+        for _ in range(BREAKER_FAILURE_THRESHOLD):
+            with pytest.raises(UpdateFailed):
+                await coordinator._async_update_data()
+            assert not [record for record in caplog.records if record.levelno >= logging.ERROR]
+
+        fetch_warnings = [record for record in caplog.records if record.getMessage().startswith("Failed to fetch")]
+        assert [record.levelno for record in fetch_warnings] == [logging.WARNING] * BREAKER_FAILURE_THRESHOLD
+
+        caplog.clear()
+        with pytest.raises(UpdateFailed):
+            await coordinator._async_update_data()
+        assert not [record for record in caplog.records if record.levelno > logging.DEBUG]
+
+
+@pytest.mark.asyncio
+async def test_update_interval_is_aligned_to_slot(coordinator):
+    """Test that next refresh is scheduled at start of time slot of charger."""
+    other = object()
+    coordinator.scheduler.jitter = 0
+    coordinator.scheduler.register(other)
+
+    with patch.object(coordinator, "_send_udp_request", new_callable=AsyncMock) as mock_send_udp, \
+         patch("custom_components.beny_wifi.coordinator.time.monotonic", return_value=1003.0):
+        mock_send_udp.return_value = VALUES_3P_RESPONSE
+        await coordinator._async_update_data()
+
+    assert coordinator.poll_interval == coordinator.fast_scan_interval
+    # slot of charger starts every 10 seconds, the one nearest to 1013 is at 1010
+    assert coordinator.update_interval == timedelta(seconds=7)
+
+
+@pytest.mark.parametrize(
+    ("state", "timer_start", "expected"),
+    [
+        ("CHARGING", "not_set", 10),
+        ("STARTING", "not_set", 10),
+        ("UNPLUGGED", "not_set", 120),
+        ("STANDBY", "not_set", 120),
+        ("WAITING", "not_set", 30),
+        ("STANDBY", timedelta(minutes=2), 10),
+        ("STANDBY", timedelta(hours=2), 120),
+    ],
+)
+def test_select_update_interval(coordinator, state, timer_start, expected):
+    """Test that polling interval follows charger and timer state."""
+    coordinator.scan_interval = timedelta(seconds=30)
+    if isinstance(timer_start, timedelta):
+        timer_start = datetime.now().astimezone() + timer_start
+
+    interval = coordinator._select_update_interval(ChargerSample(state=state, timer_start=timer_start))
+
+    assert interval == timedelta(seconds=expected)
+
+
+def test_listeners_are_updated_on_change_only(coordinator):
+    """Test that only listeners of changed sample fields are updated."""
+    voltage, power, breaker = MagicMock(), MagicMock(), MagicMock()
+    coordinator.async_add_listener(voltage, "voltage1")
+    coordinator.async_add_listener(power, "power")
+    coordinator.async_add_listener(breaker, "circuit_breaker")
+
+    coordinator.data = ChargerSample(voltage1=230, power=1.0)
+    coordinator.async_update_listeners()
+    coordinator.data = ChargerSample(voltage1=230, power=1.2)
+    coordinator.async_update_listeners()
+
+    assert voltage.call_count == 1
+    assert power.call_count == 2
+    assert breaker.call_count == 2
+
+    # all listeners are updated when availability changes
+    coordinator.last_update_success = False
+    coordinator.async_update_listeners()
+
+    assert voltage.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_breaker_sensor_follows_consecutive_failures(coordinator):
+    """Test that breaker sensor is written on every failed refresh, not only the first."""
+    coordinator.hass.is_stopping = False
+    sensor = BenyWifiCircuitBreakerSensor(coordinator, "circuit_breaker", "1234567890", "BenyModel123")
+    written = []
+    sensor.async_write_ha_state = lambda: written.append((sensor.state, sensor.extra_state_attributes))
+    coordinator.async_add_listener(sensor._handle_coordinator_update, sensor.coordinator_context)
+
+    with patch.object(coordinator, "_fetch_data", AsyncMock(side_effect=UpdateFailed("timeout"))):
+        for _ in range(BREAKER_FAILURE_THRESHOLD):
+            await coordinator.async_refresh()
+
+    state, attributes = written[-1]
+    assert state == "open"
+    assert attributes["consecutive_failures"] == BREAKER_FAILURE_THRESHOLD
+    assert attributes["opened_at"] is not None
+
+
+@pytest.mark.asyncio
+async def test_transport_sensors_follow_consecutive_failures(coordinator):
+    """Test that transport counters are written on every failed refresh."""
+    coordinator.hass.is_stopping = False
+    sensor = BenyWifiTransportSensor(coordinator, "timeouts", "1234567890", "BenyModel123")
+    written = []
+    sensor.async_write_ha_state = lambda: written.append(sensor.state)
+    coordinator.async_add_listener(sensor._handle_coordinator_update, sensor.coordinator_context)
+
+    async def time_out(*args, **kwargs):
+        coordinator.transport.stats.timeouts += 1
+        raise TimeoutError("no response")
+
+    with patch.object(coordinator.transport, "async_request", side_effect=time_out):
+        for _ in range(BREAKER_FAILURE_THRESHOLD):
+            await coordinator.async_refresh()
+
+    assert written[-1] == BREAKER_FAILURE_THRESHOLD
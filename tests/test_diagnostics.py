@@ -0,0 +1,37 @@
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+from homeassistant.core import HomeAssistant
+
+from custom_components.beny_wifi.const import DOMAIN
+from custom_components.beny_wifi.coordinator import BenyWifiUpdateCoordinator
+from custom_components.beny_wifi.diagnostics import async_get_config_entry_diagnostics
+
+
+@pytest.mark.asyncio
+async def test_config_entry_diagnostics():
+    """Test that diagnostics contain transport state and redact the pin."""
+    hass = MagicMock(HomeAssistant)
+    entry = SimpleNamespace(
+        entry_id="test",
+        data={"serial": "1234567890", "pin": "0cb34", "dlb": False},
+    )
+    coordinator = BenyWifiUpdateCoordinator(hass, entry, "192.168.1.100", 3333, 10)
+    coordinator.transport.stats.requests = 3
+    coordinator.transport.stats.record_rtt(0.05)
+    coordinator.transport.frames.append((0.0, "sent", "55aa10000b000*****7089"))
+    coordinator.decode_times.extend([0.00001, 0.00003])
+    hass.data = {DOMAIN: {entry.entry_id: {"coordinator": coordinator}}}
+
+    diagnostics = await async_get_config_entry_diagnostics(hass, entry)
+
+    assert diagnostics["entry"]["pin"] == "**REDACTED**"
+    assert diagnostics["entry"]["serial"] == "1234567890"
+    assert diagnostics["polling"]["poll_interval"] == 10
+    assert diagnostics["transport"]["requests"] == 3
+    assert diagnostics["transport"]["rtt_avg_ms"] == 50.0
+    assert diagnostics["decode_times"] == {"count": 2, "min_us": 10.0, "avg_us": 20.0, "max_us": 30.0}
+    assert diagnostics["frames"] == [
+        {"time": "1970-01-01T00:00:00+00:00", "direction": "sent", "hex": "55aa10000b000*****7089"}
+    ]
@@ -0,0 +1,56 @@
+import asyncio
+
+import pytest
+
+from custom_components.beny_wifi.scheduler import FleetScheduler
+
+
+def test_refreshes_are_spread_over_interval():
+    """Test that chargers registered together refresh in their own time slots."""
+    scheduler = FleetScheduler(jitter=0)
+    members = [object() for _ in range(4)]
+    for member in members:
+        scheduler.register(member)
+
+    refreshes = [scheduler.next_refresh(member, 1000.0, 40) for member in members]
+    assert sorted(refresh % 40 for refresh in refreshes) == [0, 10, 20, 30]
+    assert all(1020 <= refresh <= 1060 for refresh in refreshes)
+
+
+def test_refresh_keeps_slot_and_jitter_stays_in_slot():
+    """Test that refreshes are aligned to slot of charger after every poll."""
+    scheduler = FleetScheduler(jitter=0.25)
+    first, second = object(), object()
+    scheduler.register(first)
+    scheduler.register(second)
+
+    for now in (1003.0, 1031.5, 1062.2):
+        refresh = scheduler.next_refresh(second, now, 30)
+        assert abs(refresh - 15 - round((refresh - 15) / 30) * 30) <= 15 * 0.25
+
+    scheduler.unregister(first)
+    assert scheduler.next_refresh(second, 1000.0, 30) == pytest.approx(1020, abs=30 * 0.25)
+
+
+def test_unregistered_member_refreshes_after_interval():
+    """Test fallback to plain interval for unknown member."""
+    assert FleetScheduler().next_refresh(object(), 100.0, 30) == 130.0
+
+
+@pytest.mark.asyncio
+async def test_concurrent_polls_are_capped():
+    """Test that at most max_concurrent polls are in flight."""
+    scheduler = FleetScheduler(max_concurrent=2)
+    in_flight = []
+    peak = 0
+
+    async def poll():
+        nonlocal peak
+        async with scheduler.poll():
+            in_flight.append(1)
+            peak = max(peak, len(in_flight))
+            await asyncio.sleep(0.01)
+            in_flight.pop()
+
+    await asyncio.gather(*(poll() for _ in range(6)))
+    assert peak == 2
@@ -4,13 +4,20 @@ from custom_components.beny_wifi.sensor import (
     BenyWifiVoltageSensor,
     BenyWifiChargerStateSensor,
     BenyWifiCurrentSensor,
+    BenyWifiDlbPowerSensor,
     BenyWifiEnergySensor,
     BenyWifiPowerSensor,
     BenyWifiSensor,
-    BenyWifiTimerSensor
-
+    BenyWifiTimerSensor,
+    BenyWifiCircuitBreakerSensor,
+    BenyWifiRttSensor,
+    BenyWifiTransportSensor,
 )
-from custom_components.beny_wifi.const import DOMAIN
+from custom_components.beny_wifi.coordinator import CircuitBreaker
+from custom_components.beny_wifi.transport import TransportStats
+from homeassistant.const import EntityCategory
+from custom_components.beny_wifi.const import DOMAIN, SENSOR_HEARTBEAT_INTERVAL
+from custom_components.beny_wifi.models import ChargerSample
 from custom_components.beny_wifi.sensor import async_setup_entry
 from homeassistant.config_entries import ConfigEntry
 
@@ -18,20 +25,20 @@ from homeassistant.config_entries import ConfigEntry
 def mock_coordinator():
     """Fixture to mock the coordinator."""
     coordinator = MagicMock()
-    coordinator.data = {
-        "state": "charging",
-        "power": 1.5,
-        "voltage1": 230,
-        "voltage2": 230,
-        "voltage3": 230,
-        "current1": 10,
-        "current2": 10,
-        "current3": 10,
-        "max_current": 16,
-        "total_kwh": 120,
-        "timer_start": "08:00",
-        "timer_end": "10:00",
-    }
+    coordinator.data = ChargerSample(
+        state="charging",
+        power=1.5,
+        voltage1=230,
+        voltage2=230,
+        voltage3=230,
+        current1=10,
+        current2=10,
+        current3=10,
+        max_current=16,
+        total_kwh=120,
+        timer_start="08:00",
+        timer_end="10:00",
+    )
     coordinator.async_request_refresh = AsyncMock()
     return coordinator
 
@@ -82,7 +89,7 @@ async def test_async_update(voltage_sensor, mock_coordinator):
     mock_coordinator.async_request_refresh.assert_called_once()
 
     # Simulate a state change in the coordinator
-    mock_coordinator.data["state"] = "charging"
+    mock_coordinator.data.state = "charging"
     await voltage_sensor.async_update()
 
     # Check that the state has updated correctly
@@ -155,3 +162,119 @@ async def test_async_setup_entry(mock_hass, mock_config_entry, mock_coordinator)
     assert sensor.entity_id == "sensor.1234567890_charger_state"
     assert sensor.unique_id == "1234567890_charger_state"
     assert sensor.state is None
+
+
+def test_circuit_breaker_sensor(mock_coordinator):
+    """Test that the circuit breaker sensor reports breaker state while charger is offline."""
+    mock_coordinator.breaker = CircuitBreaker()
+    mock_coordinator.last_update_success = False
+    sensor = BenyWifiCircuitBreakerSensor(mock_coordinator, "circuit_breaker", "1234567890", "BenyModel123")
+
+    assert sensor.available
+    assert sensor.state == "closed"
+    assert sensor.entity_category == EntityCategory.DIAGNOSTIC
+
+    for _ in range(3):
+        mock_coordinator.breaker.record_failure()
+
+    assert sensor.state == "open"
+    assert sensor.extra_state_attributes["consecutive_failures"] == 3
+
+
+def test_transport_sensors(mock_coordinator):
+    """Test that transport diagnostic sensors read counters and are disabled by default."""
+    mock_coordinator.transport.stats = TransportStats()
+    mock_coordinator.last_update_success = False
+    timeouts = BenyWifiTransportSensor(mock_coordinator, "timeouts", "1234567890", "BenyModel123")
+    rtt = BenyWifiRttSensor(mock_coordinator, "rtt_avg", "1234567890", "BenyModel123")
+
+    assert timeouts.available
+    assert timeouts.entity_category == EntityCategory.DIAGNOSTIC
+    assert not timeouts.entity_registry_enabled_default
+    assert timeouts.state == 0
+    assert rtt.state is None
+
+    mock_coordinator.transport.stats.timeouts += 1
+    mock_coordinator.transport.stats.record_rtt(0.05)
+
+    assert timeouts.state == 1
+    assert rtt.state == 50.0
+    assert rtt.unit_of_measurement == "ms"
+
+
+def test_deadband_and_heartbeat(mock_coordinator):
+    """Test that changes within deadband are written only on heartbeat."""
+    mock_coordinator.last_update_success = True
+    sensor = BenyWifiVoltageSensor(mock_coordinator, "voltage1", "1234567890", "BenyModel123")
+    sensor.async_write_ha_state = MagicMock()
+
+    for voltage in (230, 231, 229, 232):
+        mock_coordinator.data.voltage1 = voltage
+        sensor._handle_coordinator_update()
+
+    # 230 is written, 231 and 229 are within deadband of it, 232 is not
+    assert sensor.async_write_ha_state.call_count == 2
+
+    mock_coordinator.data.voltage1 = 231
+    sensor._handle_coordinator_update()
+    assert sensor.async_write_ha_state.call_count == 2
+
+    sensor._async_heartbeat()
+    assert sensor.async_write_ha_state.call_count == 3
+    assert sensor._written_state == 231
+
+
+@pytest.mark.asyncio
+async def test_heartbeat_is_scheduled_for_deadband_sensors(mock_coordinator, monkeypatch):
+    """Test that heartbeat runs on its own timer, independent of coordinator updates."""
+    track = MagicMock()
+    monkeypatch.setattr("custom_components.beny_wifi.sensor.async_track_time_interval", track)
+    voltage = BenyWifiVoltageSensor(mock_coordinator, "voltage1", "1234567890", "BenyModel123")
+    state = BenyWifiChargerStateSensor(mock_coordinator, "charger_state", "1234567890", "BenyModel123")
+    for sensor in (voltage, state):
+        sensor.hass = MagicMock()
+        await sensor.async_added_to_hass()
+
+    track.assert_called_once()
+    assert track.call_args.args[1] == voltage._async_heartbeat
+    assert track.call_args.args[2].total_seconds() == SENSOR_HEARTBEAT_INTERVAL
+
+
+def test_power_relative_deadband(mock_coordinator):
+    """Test that power sensors suppress changes relative to written state."""
+    mock_coordinator.last_update_success = True
+    sensor = BenyWifiDlbPowerSensor(mock_coordinator, "house_power", "1234567890", "BenyModel123")
+    sensor.async_write_ha_state = MagicMock()
+
+    for power in (10.0, 10.15, 9.81, 10.25):
+        mock_coordinator.data.house_power = power
+        sensor._handle_coordinator_update()
+
+    assert sensor.async_write_ha_state.call_count == 2
+
+
+def test_power_change_to_zero_is_written(mock_coordinator):
+    """Test that charging power dropping to zero is not held back by deadband."""
+    mock_coordinator.last_update_success = True
+    sensor = BenyWifiPowerSensor(mock_coordinator, "power", "1234567890", "BenyModel123")
+    sensor.async_write_ha_state = MagicMock()
+
+    for power in (0.1, 0.0):
+        mock_coordinator.data.power = power
+        sensor._handle_coordinator_update()
+
+    assert sensor.async_write_ha_state.call_count == 2
+
+
+def test_suggested_display_precision(mock_coordinator):
+    """Test that display precision follows resolution of the charger values."""
+    voltage = BenyWifiVoltageSensor(mock_coordinator, "voltage1", "1234567890", "BenyModel123")
+    power = BenyWifiPowerSensor(mock_coordinator, "power", "1234567890", "BenyModel123")
+    house_power = BenyWifiDlbPowerSensor(mock_coordinator, "house_power", "1234567890", "BenyModel123")
+
+    assert voltage._attr_suggested_display_precision == 0
+    assert power._attr_suggested_display_precision == 1
+    assert house_power._attr_suggested_display_precision == 2
+    # state is reported as decoded, rounding is left to the frontend
+    mock_coordinator.data.house_power = 1.234
+    assert house_power.state == 1.234
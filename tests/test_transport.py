@@ -0,0 +1,391 @@
+import asyncio
+
+import pytest
+
+from custom_components.beny_wifi.const import SERVER_MESSAGE, calculate_checksum
+from custom_components.beny_wifi.const import RTO_INITIAL, RTO_MAX, RTO_MIN
+from custom_components.beny_wifi.transport import (
+    BenyWifiEndpoint,
+    BenyWifiTransport,
+    RttEstimator,
+    TokenBucket,
+    TransportStats,
+)
+
+
+def with_checksum(msg: bytes) -> bytes:
+    msg = msg.decode("ascii")
+    return (msg[:-2] + f"{calculate_checksum(msg):02x}").encode("ascii")
+
+
+REQUEST_VALUES = b"55aa10000b0000cb347089"
+REQUEST_DLB = with_checksum(b"55aa7b000b0000cb347b00")
+VALUES_3P = b"55aa1000237000000000e600e600e6000000005e06000000000000000f0000000003ca"
+DLB = with_checksum(b"55aa7b00117b000000000a000c0014000100")
+
+
+def ack(request: bytes) -> bytes:
+    return with_checksum(b"55aa100008" + request[18:20] + b"00")
+
+
+class FakeCharger(asyncio.DatagramProtocol):
+    """Loopback charger answering requests from a response table."""
+
+    def __init__(self, responses=None, drop=0, delay=0):
+        self.responses = responses or {}
+        self.drop = drop
+        self.delay = delay
+        self.received = []
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data, addr):
+        self.received.append(data)
+        if self.drop > 0:
+            self.drop -= 1
+            return
+        for response in self.responses.get(data, [ack(data)]):
+            asyncio.get_running_loop().call_later(self.delay, self.transport.sendto, response, addr)
+
+
+async def start_charger(**kwargs):
+    loop = asyncio.get_running_loop()
+    transport, charger = await loop.create_datagram_endpoint(
+        lambda: FakeCharger(**kwargs), local_addr=("127.0.0.1", 0)
+    )
+    return transport, charger, transport.get_extra_info("sockname")[1]
+
+
+@pytest.mark.asyncio
+async def test_request_reuses_socket():
+    """Test that consecutive requests share one socket."""
+    server, charger, port = await start_charger()
+    transport = BenyWifiTransport("127.0.0.1", port)
+    try:
+        assert await transport.async_request(REQUEST_VALUES, (), 1, 1) == ack(REQUEST_VALUES)
+        sock = transport._endpoint._transport
+        assert await transport.async_request(REQUEST_VALUES, (), 1, 1) == ack(REQUEST_VALUES)
+        assert transport._endpoint._transport is sock
+        assert len(charger.received) == 2
+    finally:
+        transport.close()
+        server.close()
+
+
+@pytest.mark.asyncio
+async def test_request_retries_after_timeout():
+    """Test that a lost response is retried on the same transport."""
+    server, charger, port = await start_charger(drop=1)
+    transport = BenyWifiTransport("127.0.0.1", port)
+    try:
+        assert await transport.async_request(REQUEST_VALUES, (), 2, 0.2) == ack(REQUEST_VALUES)
+        assert len(charger.received) == 2
+        assert (transport.stats.requests, transport.stats.retries, transport.stats.timeouts) == (1, 1, 0)
+    finally:
+        transport.close()
+        server.close()
+
+
+@pytest.mark.asyncio
+async def test_request_timeout():
+    """Test that TimeoutError is raised when all attempts time out."""
+    server, charger, port = await start_charger(drop=10)
+    transport = BenyWifiTransport("127.0.0.1", port)
+    try:
+        with pytest.raises(TimeoutError):
+            await transport.async_request(REQUEST_VALUES, (), 2, 0.1)
+        assert len(charger.received) == 2
+        assert transport.stats.timeouts == 1
+        assert transport.stats.rtt_avg is None
+    finally:
+        transport.close()
+        server.close()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_are_correlated():
+    """Test that VALUES and DLB requests in flight are matched to their responses."""
+    server, charger, port = await start_charger(
+        responses={REQUEST_VALUES: [VALUES_3P], REQUEST_DLB: [DLB]}, delay=0.05
+    )
+    transport = BenyWifiTransport("127.0.0.1", port)
+    try:
+        values, dlb_response = await asyncio.gather(
+            transport.async_request(REQUEST_VALUES, (SERVER_MESSAGE.SEND_VALUES_3P,), 1, 1),
+            transport.async_request(REQUEST_DLB, (SERVER_MESSAGE.SEND_DLB,), 1, 1),
+        )
+        assert values == VALUES_3P
+        assert dlb_response == DLB
+    finally:
+        transport.close()
+        server.close()
+
+
+@pytest.mark.asyncio
+async def test_unexpected_and_corrupted_responses_are_discarded():
+    """Test that wrong message types and invalid checksums do not complete requests."""
+    corrupted = VALUES_3P[:-2] + b"00"
+    server, charger, port = await start_charger(
+        responses={REQUEST_VALUES: [corrupted, VALUES_3P]}
+    )
+    transport = BenyWifiTransport("127.0.0.1", port)
+    try:
+        assert await transport.async_request(REQUEST_VALUES, (SERVER_MESSAGE.SEND_VALUES_3P,), 1, 1) == VALUES_3P
+        assert transport.stats.checksum_failures == 1
+
+        with pytest.raises(TimeoutError):
+            await transport.async_request(REQUEST_VALUES, (SERVER_MESSAGE.SEND_DLB,), 1, 0.1)
+    finally:
+        transport.close()
+        server.close()
+
+
+@pytest.mark.asyncio
+async def test_duplicate_response_is_discarded():
+    """Test that a duplicate reply does not complete the next request."""
+    server, charger, port = await start_charger(
+        responses={REQUEST_VALUES: [VALUES_3P, VALUES_3P]}
+    )
+    transport = BenyWifiTransport("127.0.0.1", port)
+    try:
+        await transport.async_request(REQUEST_VALUES, (SERVER_MESSAGE.SEND_VALUES_3P,), 1, 1)
+        await asyncio.sleep(0.05)
+        assert transport._pending == {}
+    finally:
+        transport.close()
+        server.close()
+
+
+def test_transport_stats_rtt():
+    """Test round-trip time statistics of recent requests."""
+    stats = TransportStats(window=20)
+    assert stats.rtt_min is None
+
+    for rtt in range(1, 31):
+        stats.record_rtt(rtt / 1000)
+
+    assert stats.rtt_min == 11.0
+    assert stats.rtt_avg == 20.5
+    assert stats.rtt_p95 == 30.0
+
+
+def test_rtt_estimator():
+    """Test RTO estimation from round-trip samples."""
+    rtt = RttEstimator()
+    assert rtt.rto == RTO_INITIAL
+
+    rtt.sample(0.2)
+    assert rtt.srtt == 0.2
+    assert rtt.rttvar == 0.1
+    assert rtt.rto == pytest.approx(0.6)
+
+    for _ in range(50):
+        rtt.sample(0.02)
+    assert rtt.srtt == pytest.approx(0.02, abs=0.01)
+    assert rtt.rto == RTO_MIN
+
+    for _ in range(10):
+        rtt.backoff()
+    assert rtt.rto == RTO_MAX
+
+    restored = RttEstimator.from_dict(rtt.as_dict())
+    assert restored.rto == RTO_MIN
+
+
+def test_rtt_backoff_once_per_loss():
+    """Test that requests lost together back off the shared timeout once."""
+    rtt = RttEstimator()
+    expired = rtt.rto
+
+    rtt.backoff(expired)
+    rtt.backoff(expired)
+
+    assert rtt.rto == 2 * RTO_INITIAL
+
+
+@pytest.mark.asyncio
+async def test_late_response_during_retry_delay_completes_request():
+    """Test that a response arriving while waiting to retry is not requested again."""
+    server, charger, port = await start_charger(delay=0.15)
+    transport = BenyWifiTransport("127.0.0.1", port)
+    transport._retry_delay = lambda attempt: 0.3
+    try:
+        assert await transport.async_request(REQUEST_VALUES, (), 3, 0.1) == ack(REQUEST_VALUES)
+        assert len(charger.received) == 1
+    finally:
+        transport.close()
+        server.close()
+
+
+@pytest.mark.asyncio
+async def test_request_deadline():
+    """Test that retries stop at the deadline of the request."""
+    server, charger, port = await start_charger(drop=100)
+    transport = BenyWifiTransport("127.0.0.1", port)
+    transport._retry_delay = lambda attempt: 0
+    try:
+        start = asyncio.get_running_loop().time()
+        with pytest.raises(TimeoutError):
+            await transport.async_request(REQUEST_VALUES, (), 10, 0.2, deadline=0.5)
+        assert asyncio.get_running_loop().time() - start < 0.7
+        assert len(charger.received) == 3
+    finally:
+        transport.close()
+        server.close()
+
+
+@pytest.mark.asyncio
+async def test_adaptive_timeout_recovers_lost_packet_quickly():
+    """Test that a lost packet costs about one RTO instead of a fixed timeout."""
+    server, charger, port = await start_charger(drop=1)
+    transport = BenyWifiTransport("127.0.0.1", port)
+    transport.rtt = RttEstimator(0.01, 0.005)
+    try:
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        assert await transport.async_request(REQUEST_VALUES, (), 2) == ack(REQUEST_VALUES)
+        assert loop.time() - start < 1
+        assert transport.rtt.rto == RTO_MIN * 2  # backed off, response to retry not sampled
+    finally:
+        transport.close()
+        server.close()
+
+
+HANDSHAKE = with_checksum(b"55aa10001100075bcd15c0a801640d0500")
+
+
+@pytest.mark.asyncio
+async def test_shared_endpoint_routes_by_address():
+    """Test that chargers sharing one socket each receive their own responses."""
+    server1, charger1, port1 = await start_charger(responses={REQUEST_VALUES: [VALUES_3P]}, delay=0.05)
+    server2, charger2, port2 = await start_charger(responses={REQUEST_VALUES: [ack(REQUEST_VALUES)]})
+    endpoint = BenyWifiEndpoint()
+    transport1 = BenyWifiTransport("127.0.0.1", port1, endpoint)
+    transport2 = BenyWifiTransport("127.0.0.1", port2, endpoint)
+    try:
+        values, acked = await asyncio.gather(
+            transport1.async_request(REQUEST_VALUES, (SERVER_MESSAGE.SEND_VALUES_3P,), 1, 1),
+            transport2.async_request(REQUEST_VALUES, (), 1, 1),
+        )
+        assert values == VALUES_3P
+        assert acked == ack(REQUEST_VALUES)
+
+        transport1.close()
+        assert endpoint.connected
+        transport2.close()
+        assert not endpoint.connected
+    finally:
+        server1.close()
+        server2.close()
+
+
+@pytest.mark.asyncio
+async def test_endpoint_close_fails_pending_requests():
+    """Test that closing the endpoint fails requests of every charger."""
+    server, charger, port = await start_charger(drop=10)
+    endpoint = BenyWifiEndpoint()
+    transport = BenyWifiTransport("127.0.0.1", port, endpoint)
+    try:
+        request = asyncio.create_task(transport.async_request(REQUEST_VALUES, (), 1, 5))
+        await asyncio.sleep(0.05)
+        endpoint.close()
+
+        with pytest.raises(ConnectionError):
+            await request
+        assert not endpoint.connected
+    finally:
+        transport.close()
+        server.close()
+
+
+@pytest.mark.asyncio
+async def test_loss_of_replaced_socket_is_ignored():
+    """Test that a late loss of an old socket does not drop the current one."""
+    endpoint = BenyWifiEndpoint()
+    transport = BenyWifiTransport("127.0.0.1", 3333, endpoint)
+    try:
+        await endpoint.async_connect()
+        old = endpoint._transport
+        endpoint._transport = None
+        await endpoint.async_connect()
+
+        old.close()
+        await asyncio.sleep(0)
+
+        assert endpoint.connected
+        assert endpoint._transport is not old
+    finally:
+        transport.close()
+
+
+def test_handshake_from_new_address_is_routed_by_serial():
+    """Test that a charger moving to a new address is found by its serial."""
+    endpoint = BenyWifiEndpoint()
+    transport = BenyWifiTransport("192.168.1.10", 3333, endpoint, 123456789)
+    received = []
+    transport.datagram_received = lambda data, addr: received.append(addr)
+
+    endpoint.datagram_received(VALUES_3P, ("192.168.1.100", 3333))
+    assert received == []
+
+    endpoint.datagram_received(HANDSHAKE, ("192.168.1.100", 3333))
+    assert received == [("192.168.1.100", 3333)]
+    assert transport.ip_address == "192.168.1.100"
+
+    endpoint.datagram_received(VALUES_3P, ("192.168.1.100", 3333))
+    assert len(received) == 2
+
+
+@pytest.mark.asyncio
+async def test_limiter_is_released_between_retries(monkeypatch):
+    """Test that the limiter is held while waiting for response, not during retry delay."""
+    server, charger, port = await start_charger(drop=1)
+    limiter = asyncio.Semaphore(1)
+    transport = BenyWifiTransport("127.0.0.1", port, limiter=limiter)
+    held = []
+    wait = asyncio.wait
+
+    async def wait_for_retry(futures, timeout):
+        held.append(limiter.locked())
+        return await wait(futures, timeout=0)
+
+    monkeypatch.setattr("custom_components.beny_wifi.transport.asyncio.wait", wait_for_retry)
+    try:
+        assert await transport.async_request(REQUEST_VALUES, (), 2, 0.05) == ack(REQUEST_VALUES)
+        assert held == [False]
+        assert not limiter.locked()
+    finally:
+        transport.close()
+        server.close()
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_limits_rate():
+    """Test that sends beyond the burst are spread at the configured rate."""
+    bucket = TokenBucket(rate=100, burst=5)
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    for _ in range(5):
+        await bucket.async_acquire()
+    assert loop.time() - start < 0.02
+
+    for _ in range(5):
+        await bucket.async_acquire()
+    assert loop.time() - start >= 0.04
+
+
+@pytest.mark.asyncio
+async def test_frames_are_recorded_with_pin_redacted():
+    """Test that sent and received frames are kept with pin of request hidden."""
+    server, charger, port = await start_charger()
+    transport = BenyWifiTransport("127.0.0.1", port)
+    try:
+        await transport.async_request(REQUEST_VALUES, (), 1, 1)
+        (_, sent_direction, sent), (_, received_direction, received) = transport.frames
+        assert (sent_direction, received_direction) == ("sent", "received")
+        assert sent == "55aa10000b000*****7089"
+        assert received == ack(REQUEST_VALUES).decode("ascii")
+    finally:
+        transport.close()
+        server.close()
@@ -0,0 +1,156 @@
+import argparse
+import json
+import sys
+
+import numpy as np
+
+from communication import _CONVERTERS, _tenths, get_model
+from const import COMMON, SERVER_MESSAGE
+from conversions import get_message_type
+
+HEADER = COMMON.FIXED_PART.value["structure"]
+
+def vectorized_converter(name):
+    """Return vectorized conversion of read_message for field.
+
+    Scaled fields are converted like read_message does, enum fields (state,
+    timer_state, ...) are kept as their integer values.
+    """
+    converter = _CONVERTERS.get(name)
+    if converter is _tenths:
+        return lambda values: values / 10
+    if converter is bool:
+        return lambda values: values.astype(bool)
+    return None
+
+def to_matrix(frames):
+    """Convert ascii hex frames of same length to uint8 matrix.
+
+    Frames not as long as most frames or not valid hex are left as zero rows.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: (frames, bytes) matrix and mask of frames converted
+
+    """
+    frames = [frame.decode("ascii") if isinstance(frame, bytes) else frame for frame in frames]
+    lengths = np.fromiter(map(len, frames), dtype=np.int64, count=len(frames))
+    values, counts = np.unique(lengths, return_counts=True)
+    length = int(values[np.argmax(counts)]) if len(values) else 0
+    ok = (lengths == length) & (length % 2 == 0)
+
+    selected = [frame for frame, frame_ok in zip(frames, ok) if frame_ok]
+    try:
+        data = bytes.fromhex("".join(selected))
+    except ValueError:
+        # find frames with invalid hex digits
+        rows = []
+        for index in np.flatnonzero(ok):
+            try:
+                rows.append(bytes.fromhex(frames[index]))
+            except ValueError:
+                ok[index] = False
+        data = b"".join(rows)
+
+    matrix = np.zeros((len(frames), length // 2), dtype=np.uint8)
+    matrix[ok] = np.frombuffer(data, dtype=np.uint8).reshape(-1, length // 2)
+    return matrix, ok
+
+def nibbles(matrix):
+    """Return (frames, hex digits) matrix of digit values."""
+    digits = np.empty((matrix.shape[0], matrix.shape[1] * 2), dtype=np.uint8)
+    digits[:, 0::2] = matrix >> 4
+    digits[:, 1::2] = matrix & 0x0F
+    return digits
+
+def extract(matrix, digits, field):
+    """Extract unsigned big-endian value of hex digit slice from every frame."""
+    if field.start % 2 == 0 and field.stop % 2 == 0:
+        columns = matrix[:, field.start // 2:field.stop // 2]
+        base = 256
+    else:
+        columns = digits[:, field]
+        base = 16
+
+    weights = base ** np.arange(columns.shape[1] - 1, -1, -1, dtype=np.uint64)
+    return columns.astype(np.uint64) @ weights
+
+def decode_batch(frames, message):
+    """Decode frames of one server message type to columnar arrays.
+
+    Every field of the message structure is extracted from all frames at
+    once and converted like read_message does. Checksum of every frame is
+    validated, frames failing it or not convertible have valid False.
+
+    Args:
+        frames (list[str | bytes]): ascii hex frames
+        message (SERVER_MESSAGE): type of all frames
+
+    Returns:
+        dict[str, np.ndarray]: arrays by field name, and valid mask
+
+    """
+    matrix, ok = to_matrix(frames)
+    checksum = matrix[:, :-1].sum(axis=1, dtype=np.uint64) % 256
+    columns = {"valid": ok & (checksum == matrix[:, -1])}
+
+    structure = {**HEADER, **message.value["structure"]}
+    digits = nibbles(matrix) if any(
+        field.start % 2 or (field.stop or 0) % 2 for field in structure.values()
+    ) else None
+
+    for name, field in structure.items():
+        if name == "ip":
+            columns[name] = matrix[:, field.start // 2:field.stop // 2]
+        elif name == "model":
+            columns[name] = np.array([
+                get_model(frame if isinstance(frame, str) else frame.decode("ascii")) if frame_ok else ""
+                for frame, frame_ok in zip(frames, ok)
+            ])
+        elif field.stop is None or field.stop > matrix.shape[1] * 2:
+            columns["valid"] &= False
+        else:
+            values = extract(matrix, digits, field)
+            convert = vectorized_converter(name)
+            columns[name] = convert(values) if convert else values
+
+    return columns
+
+def read_frames(paths):
+    """Yield hex frames from files of hex lines or json lines with "hex" key."""
+    for path in paths:
+        with (sys.stdin if path == "-" else open(path, "r")) as f:
+            for line in f:
+                line = line.strip()
+                if line.startswith("{"):
+                    line = json.loads(line).get("hex") or ""
+                if line:
+                    yield line
+
+def group_frames(frames):
+    """Group frames by server message type, other frames are dropped."""
+    groups = {}
+    for frame in frames:
+        try:
+            message = get_message_type(frame)
+        except ValueError:
+            continue
+        if isinstance(message, SERVER_MESSAGE):
+            groups.setdefault(message, []).append(frame)
+    return groups
+
+def save_npz(output_file, groups):
+    """Decode groups and save arrays as "<message>/<field>" to compressed npz."""
+    arrays = {}
+    for message, frames in groups.items():
+        for name, values in decode_batch(frames, message).items():
+            arrays[f"{message.name}/{name}"] = values
+        print(f"{message.name}: {len(frames)} frames")
+    np.savez_compressed(output_file, **arrays)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Decode recorded server frames to columnar numpy arrays.")
+    parser.add_argument("inputs", nargs="*", default=["-"], help="files of hex lines or json lines traces, - for stdin")
+    parser.add_argument("--output", "-o", default="frames.npz", help="npz file")
+    args = parser.parse_args()
+
+    save_npz(args.output, group_frames(read_frames(args.inputs)))
@@ -0,0 +1,309 @@
+import math
+import random
+import time
+from datetime import datetime, timedelta
+
+from const import (
+    CHARGER_STATE,
+    DLB_CHARGERS,
+    REQUEST_TYPE,
+    SERVER_MESSAGE,
+    SINGLE_PHASE_CHARGERS,
+    TIMER_STATE,
+    calculate_checksum,
+)
+
+VOLTAGE = 230
+STEP = 60 # simulated seconds per integration step
+STARTING_TIME = 10 # simulated seconds from start command to charging
+
+# message type byte and length in bytes of encoded messages
+ENCODED_MESSAGES = {
+    SERVER_MESSAGE.SEND_VALUES_1P: (0x10, 30),
+    SERVER_MESSAGE.SEND_VALUES_3P: (0x10, 35),
+    SERVER_MESSAGE.SEND_DLB: (0x7B, 17),
+}
+
+# request codes of client messages, see CLIENT_MESSAGE
+CODE_CHARGER_COMMAND = 0x06
+CODE_TIMER = 0x69
+CODE_MAX_CURRENT = 0x6D
+CODE_MAX_SESSION_CONSUMPTION = 0x74
+
+
+def encode_message(message, values, request_type):
+    """Encode server message from values of its structure fields.
+
+    Values are raw integers as in the message, e.g. power in 0.1 kW. Fields
+    without a value and bytes not covered by the structure are zero. Values
+    are clamped to the width of their field.
+
+    Args:
+        message (SERVER_MESSAGE): message encoded, see ENCODED_MESSAGES
+        values (dict): raw field values by structure field name
+        request_type (int): request type echoed to client
+
+    Returns:
+        str: ascii hex message with checksum
+
+    """
+    message_type, length = ENCODED_MESSAGES[message]
+    digits = ["0"] * (length * 2 - 2)
+    digits[0:10] = f"55aa{message_type:02x}{length:04x}"
+    digits[10:12] = f"{request_type:02x}"
+
+    for name, field in message.value["structure"].items():
+        if name in values:
+            width = field.stop - field.start
+            value = min(max(int(values[name]), 0), 16 ** width - 1)
+            digits[field] = f"{value:0{width}x}"
+
+    body = "".join(digits)
+    return body + f"{calculate_checksum(body):02x}"
+
+
+def encode_ack(code):
+    """Encode acknowledgement of client message with request code."""
+    body = f"55aa100008{code:02x}00"
+    return body + f"{calculate_checksum(body):02x}"
+
+
+class SimClock:
+    """Simulated wall clock running speed times faster than real time."""
+
+    def __init__(self, speed=1.0, start=None):
+        self.speed = speed
+        self.start = start or datetime.now()
+        self._started = time.monotonic()
+
+    def now(self):
+        return self.start + timedelta(seconds=(time.monotonic() - self._started) * self.speed)
+
+
+class ChargerModel:
+    """Stateful charger, car and household of one virtual charger.
+
+    Car arrives in the evening and leaves in the morning, plugging in moves
+    the charger from UNPLUGGED to STANDBY. Charging starts right away, at
+    the timer start time if timer is set, or by start command, going through
+    STARTING to CHARGING until the car has taken its energy, session
+    consumption limit is reached, timer ends or stop command is received.
+    Energy is integrated from power in steps of simulated time, and a
+    solar and house load profile is simulated for DLB values.
+
+    Arrival, departure and energy taken vary per day and are seeded by
+    serial, so runs are reproducible.
+    """
+
+    def __init__(self, serial, clock, model=None, max_current=16, solar_peak=2.0):
+        self.clock = clock
+        self.phases = 1 if model in SINGLE_PHASE_CHARGERS else 3
+        self.dlb = model is None or model in DLB_CHARGERS
+        self.max_current = max_current
+        self.max_session_consumption = 0
+        self.solar_peak = solar_peak
+        self.random = random.Random(serial)
+
+        self.state = CHARGER_STATE.UNPLUGGED
+        self.timer_state = TIMER_STATE.UNSET
+        self.timer_start = (0, 0)
+        self.timer_end = (0, 0)
+        self.current = 0
+        self.total_kwh = 0.0
+        self.session_kwh = 0.0
+        self.session_target = 0.0
+        self.temperature = 20.0
+        self.starting_since = None
+        self.stopped = False
+
+        self.time = clock.now()
+        self._plan_day(self.time.date())
+
+    def _plan_day(self, day):
+        """Draw arrival and departure of car on day."""
+        midnight = datetime.combine(day, datetime.min.time())
+        self.arrival = midnight + timedelta(hours=self.random.uniform(16.5, 20))
+        self.departure = midnight + timedelta(days=1, hours=self.random.uniform(6.5, 8.5))
+
+    def advance(self, now=None):
+        """Advance model to now in steps of simulated time."""
+        now = now or self.clock.now()
+        while self.time < now:
+            step = min(timedelta(seconds=STEP), now - self.time)
+            self._step(self.time + step, step.total_seconds())
+
+    def _step(self, now, seconds):
+        self.time = now
+
+        if self.state == CHARGER_STATE.UNPLUGGED:
+            if now >= self.departure:
+                self._plan_day(now.date())
+            if self.arrival <= now < self.departure:
+                self._plug_in()
+        elif now >= self.departure:
+            self.state = CHARGER_STATE.UNPLUGGED
+            self._plan_day(now.date())
+        elif self.state == CHARGER_STATE.STANDBY:
+            if not self.stopped and self.session_kwh < self.session_target and self._timer_allows(now):
+                self._start(now)
+        elif self.state == CHARGER_STATE.STARTING:
+            if (now - self.starting_since).total_seconds() >= STARTING_TIME:
+                self.state = CHARGER_STATE.CHARGING
+        elif self.state == CHARGER_STATE.CHARGING:
+            if not self._timer_allows(now) or self._session_complete():
+                self.state = CHARGER_STATE.STANDBY
+
+        self.current = self.max_current if self.state == CHARGER_STATE.CHARGING else 0
+        energy = self.power * seconds / 3600
+        self.total_kwh += energy
+        self.session_kwh += energy
+
+        # temperature follows power with a time constant of 10 minutes
+        target = 20 + 2 * self.power
+        self.temperature += (target - self.temperature) * min(1.0, seconds / 600)
+
+    def _plug_in(self):
+        self.state = CHARGER_STATE.STANDBY
+        self.session_kwh = 0.0
+        self.session_target = self.random.uniform(5, 40)
+        self.stopped = False
+
+    def _start(self, now):
+        self.state = CHARGER_STATE.STARTING
+        self.starting_since = now
+
+    def _session_complete(self):
+        if self.session_kwh >= self.session_target:
+            return True
+        return 0 < self.max_session_consumption <= self.session_kwh
+
+    def _timer_allows(self, now):
+        """Return True if timer does not prevent charging at now."""
+        if self.timer_state == TIMER_STATE.UNSET:
+            return True
+
+        minutes = now.hour * 60 + now.minute
+        start = self.timer_start[0] * 60 + self.timer_start[1]
+        if self.timer_state == TIMER_STATE.START_TIME:
+            return minutes >= start
+
+        end = self.timer_end[0] * 60 + self.timer_end[1]
+        if start <= end:
+            return start <= minutes < end
+        return minutes >= start or minutes < end
+
+    @property
+    def power(self):
+        """Charging power in kW."""
+        return self.phases * VOLTAGE * self.current / 1000
+
+    def solar_power(self, now):
+        """Solar power in kW, half sine between 6 and 20 o'clock."""
+        hours = now.hour + now.minute / 60
+        if not 6 <= hours <= 20:
+            return 0.0
+        return self.solar_peak * math.sin(math.pi * (hours - 6) / 14)
+
+    def house_power(self, now):
+        """House load in kW, base load with morning and evening peaks."""
+        hours = now.hour + now.minute / 60
+        morning = 0.8 * math.exp(-((hours - 7.5) ** 2) / 2)
+        evening = 1.2 * math.exp(-((hours - 19) ** 2) / 3)
+        return 0.3 + morning + evening
+
+    def handle_command(self, code, request):
+        """Apply client message to model.
+
+        Args:
+            code (int): request code of message
+            request (str): ascii hex message
+
+        Returns:
+            bool: True if message was understood
+
+        """
+        now = self.clock.now()
+        self.advance(now)
+
+        if code == CODE_CHARGER_COMMAND:
+            if int(request[21:22], 16):
+                self.stopped = False
+                if self.state == CHARGER_STATE.STANDBY:
+                    self.session_target = max(self.session_target, self.session_kwh + 5)
+                    self._start(now)
+            else:
+                self.stopped = True
+                if self.state in (CHARGER_STATE.STARTING, CHARGER_STATE.CHARGING):
+                    self.state = CHARGER_STATE.STANDBY
+                    self.current = 0
+        elif code == CODE_TIMER:
+            if int(request[20:31], 16) == 0:
+                self.timer_state = TIMER_STATE.UNSET
+            else:
+                end_set = int(request[31:36], 16) != 0
+                self.timer_state = TIMER_STATE.START_END_TIME if end_set else TIMER_STATE.START_TIME
+                self.timer_start = (int(request[36:38], 16), int(request[38:40], 16))
+                self.timer_end = (int(request[42:44], 16), int(request[44:46], 16))
+        elif code == CODE_MAX_CURRENT:
+            self.max_current = int(request[22:24], 16)
+        elif code == CODE_MAX_SESSION_CONSUMPTION:
+            self.max_session_consumption = int(request[20:22], 16)
+        else:
+            return False
+
+        return True
+
+    def values(self):
+        """Encode values message of current state."""
+        self.advance()
+        message = SERVER_MESSAGE.SEND_VALUES_1P if self.phases == 1 else SERVER_MESSAGE.SEND_VALUES_3P
+        values = {
+            "power": round(self.power * 10),
+            "total_kwh": round(self.total_kwh * 10) % 0x10000,
+            "temperature": round(self.temperature) + 100,
+            "state": self.state.value,
+            "timer_state": self.timer_state.value,
+            "timer_start_h": self.timer_start[0],
+            "timer_start_min": self.timer_start[1],
+            "timer_end_h": self.timer_end[0],
+            "timer_end_min": self.timer_end[1],
+            "max_current": self.max_current,
+            "maximum_session_consumption": self.max_session_consumption,
+        }
+        for phase in range(1, self.phases + 1):
+            values[f"current{phase}"] = self.current
+            values[f"voltage{phase}"] = VOLTAGE
+
+        return encode_message(message, values, REQUEST_TYPE.VALUES.value)
+
+    def dlb_values(self):
+        """Encode DLB message of current state, powers in 0.01 kW."""
+        self.advance()
+        solar = self.solar_power(self.time)
+        house = self.house_power(self.time)
+        grid = house + self.power - solar
+        values = {
+            "solar_power": round(solar * 100),
+            "ev_power": round(self.power * 100),
+            "house_power": round(house * 100),
+            "grid_export": int(grid < 0),
+            "grid_power": round(abs(grid) * 100),
+        }
+
+        return encode_message(SERVER_MESSAGE.SEND_DLB, values, REQUEST_TYPE.DLB.value)
+
+    def handle(self, request):
+        """Return response to request, None if model does not handle it."""
+        try:
+            code = int(request[18:20], 16)
+        except ValueError:
+            return None
+
+        if code == REQUEST_TYPE.VALUES.value:
+            return self.values()
+        if code == REQUEST_TYPE.DLB.value:
+            return self.dlb_values() if self.dlb else None
+        if self.handle_command(code, request):
+            return encode_ack(code)
+
+        return None
@@ -1,91 +1,329 @@
-import socket
+import argparse
+import asyncio
+from collections import defaultdict
 import json
-import time
 import os
-import binascii
 import re
-from copy import deepcopy
+import socket
+import time
 
+from charger_model import ChargerModel, SimClock
 from const import SERVER_MESSAGE
 from communication import build_message, calculate_checksum
 from conversions import get_hex
-import socket
-import struct
+from network_faults import FaultConfig, LATENCY_DISTRIBUTIONS, NetworkFaults, load_fault_configs
 
 CONFIG_FILE = "messages_beny_pedrov.json"
 #CONFIG_FILE = "messages_22032025.json"
-UDP_IP = "0.0.0.0"
+UDP_IP = "127.0.0.1"
 UDP_PORT = 3333
+SERIAL = 123456789
+RELOAD_INTERVAL = 1
+STATS_INTERVAL = 5
+CACHE_SIZE = 4096
 
 def ip_to_hex(ip: str) -> str:
     """Convert an IPv4 address string to a hex string."""
-    packed_ip = socket.inet_aton(ip)  
+    packed_ip = socket.inet_aton(ip)
     hex_str = packed_ip.hex()
     return hex_str
 
-def check_message(received_message, pattern):
-    regex_pattern = pattern.replace('*', '.*')
-    
-    if re.match(regex_pattern, received_message):
-        return True
-    
-    return False
-
-def hex_to_str(hex_str):
+def load_config(config_file):
     try:
-        bytes_data = binascii.unhexlify(hex_str)
-        return bytes_data.decode('ascii', errors='ignore')
-    except (binascii.Error, UnicodeDecodeError):
-        return None
-
-def load_config():
-    try:
-        with open(CONFIG_FILE, "r") as f:
+        with open(config_file, "r") as f:
             return json.load(f)
     except Exception as e:
         print(f"Error loading config: {e}")
         return {}
 
-responses = load_config()
-last_modified = None
+def render_response(response, overrides):
+    """Render configured response to datagram, None if it cannot be rendered."""
+    if type(response) == str:
+        return (response + f"{calculate_checksum(response):02x}").encode('ascii')
+
+    if type(response) == dict:
+        mtype = SERVER_MESSAGE[response['type']]
+        params = {}
+        for key, value in response['params'].items():
+            value = overrides.get(key, value)
+            if key == "ip":
+                params[key] = ip_to_hex(value)
+            elif key == "model":
+                params[key] = value.encode().hex()
+                while len(params[key]) < 41:
+                    params[key] += '0'
+                params[key] += '11001'
+            else:
+                params[key] = get_hex(value)
+        return build_message(mtype, params=params).encode('ascii')
+
+    return None
+
+
+class ResponseTable:
+    """Request patterns of config, indexed by their literal prefix.
+
+    Patterns are hex strings where '*' matches anything, matched against the
+    start of request like re.match. Patterns are grouped by the length of
+    the literal part before the first '*', so a lookup costs one dict access
+    per distinct prefix length instead of one regex per pattern. Results are
+    cached per request, chargers are polled with the same few requests.
+    """
+
+    def __init__(self, responses):
+        self.responses = list(responses.values())
+        self._prefixes = defaultdict(lambda: defaultdict(list))
+        self._cache = {}
+
+        for index, pattern in enumerate(responses):
+            prefix = pattern.split('*', 1)[0]
+            regex = re.compile('.*'.join(map(re.escape, pattern.split('*'))))
+            self._prefixes[len(prefix)][prefix].append((index, regex))
+
+    def lookup(self, request):
+        """Return indices of responses to request, in config order."""
+        matches = self._cache.get(request)
+        if matches is not None:
+            return matches
+
+        matches = []
+        for length, patterns in self._prefixes.items():
+            for index, regex in patterns.get(request[:length], ()):
+                if regex.match(request):
+                    matches.append(index)
+        matches = tuple(sorted(matches))
+
+        if len(self._cache) < CACHE_SIZE:
+            self._cache[request] = matches
+        return matches
+
+
+class Stats:
+    """Packet counters and handling latency of all virtual chargers."""
+
+    def __init__(self):
+        self.received = 0
+        self.sent = 0
+        self.unmatched = 0
+        self.latencies = []
+        self._last = (time.monotonic(), 0)
+
+    def report(self, faults=()):
+        now = time.monotonic()
+        last_time, last_received = self._last
+        rate = (self.received - last_received) / (now - last_time)
+        self._last = (now, self.received)
+
+        latencies = sorted(self.latencies)
+        self.latencies = []
+        if latencies:
+            avg = sum(latencies) / len(latencies) * 1e6
+            p99 = latencies[int(len(latencies) * 0.99)] * 1e6
+            latency = f"latency avg {avg:.0f} us, p99 {p99:.0f} us"
+        else:
+            latency = "latency n/a"
+
+        if faults:
+            latency += (
+                f", dropped {sum(f.dropped for f in faults)}, duplicated {sum(f.duplicated for f in faults)}, "
+                f"reordered {sum(f.reordered for f in faults)}, corrupted {sum(f.corrupted for f in faults)}"
+            )
+
+        print(
+            f"{rate:.0f} packets/s, received {self.received}, sent {self.sent}, "
+            f"unmatched {self.unmatched}, {latency}"
+        )
+
 
-sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-sock.bind((UDP_IP, UDP_PORT))
+class VirtualCharger(asyncio.DatagramProtocol):
+    """Charger answering requests from the shared response table."""
 
-print(f"Listening for UDP packets on port {UDP_PORT}...")
+    def __init__(self, simulator, serial, port, model=None, verbose=False, physics=None, faults=None):
+        self.simulator = simulator
+        self.serial = serial
+        self.port = port
+        self.model = model
+        self.verbose = verbose
+        self.physics = physics
+        self.faults = faults
+        self.responses = []
 
-while True:
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def render(self, table, ip):
+        overrides = {"serial": self.serial, "ip": ip, "port": self.port}
+        if self.model:
+            overrides["model"] = self.model
+
+        self.responses = []
+        for response in table.responses:
+            try:
+                self.responses.append(render_response(response, overrides))
+            except Exception as e:
+                print(f"Error rendering response {response}: {e}")
+                self.responses.append(None)
+
+    def datagram_received(self, data, addr):
+        received = time.perf_counter()
+        stats = self.simulator.stats
+        stats.received += 1
+
+        request = data.decode('ascii', errors='ignore').strip()
+        if self.verbose:
+            print(f"{self.serial} received from {addr}: {request}")
+
+        if self.faults is not None and self.faults.drop():
+            return
+
+        response = self.physics.handle(request) if self.physics is not None else None
+        if response is not None:
+            self.send(response.encode('ascii'), addr)
+        else:
+            matches = self.simulator.table.lookup(request)
+            if not matches:
+                stats.unmatched += 1
+
+            for index in matches:
+                if self.responses[index] is not None:
+                    self.send(self.responses[index], addr)
+
+        stats.latencies.append(time.perf_counter() - received)
+
+    def send(self, response, addr):
+        """Send response, through network faults if configured."""
+        if self.faults is None:
+            self._sendto(response, addr)
+            return
+
+        loop = asyncio.get_running_loop()
+        for delay, datagram in self.faults.replies(response):
+            if delay:
+                loop.call_later(delay, self._sendto, datagram, addr)
+            else:
+                self._sendto(datagram, addr)
+
+    def _sendto(self, datagram, addr):
+        if self.transport.is_closing():
+            return
+        self.transport.sendto(datagram, addr)
+        self.simulator.stats.sent += 1
+        if self.verbose:
+            print(f"{self.serial} sent to {addr}: {datagram.decode('ascii')}")
+
+
+class Simulator:
+    """N virtual chargers on consecutive ports sharing one response table.
+
+    With a clock, values, DLB values and commands are handled by a stateful
+    ChargerModel of each charger, other requests by the response table.
+    With fault configs, requests and replies of each charger go through
+    NetworkFaults seeded by seed and charger serial.
+    """
+
+    def __init__(
+        self, config_file, host, port, count, serial, model=None, verbose=False, clock=None,
+        fault_configs=None, seed=0,
+    ):
+        self.config_file = config_file
+        self.host = host
+        self.stats = Stats()
+        self.table = ResponseTable({})
+        self.chargers = []
+        for i in range(count):
+            faults = None
+            if fault_configs is not None:
+                default, configs = fault_configs
+                config = configs.get(serial + i, default)
+                if config.enabled:
+                    faults = NetworkFaults(config, seed, serial + i)
+
+            self.chargers.append(VirtualCharger(
+                self, serial + i, port + i, model, verbose,
+                ChargerModel(serial + i, clock, model) if clock else None,
+                faults,
+            ))
+        self._modified = None
+
+    def reload(self):
+        """Reload config if file changed since last load."""
+        try:
+            modified = os.path.getmtime(self.config_file)
+        except OSError as e:
+            print(f"Error checking config file: {e}")
+            return
+
+        if modified != self._modified:
+            self._modified = modified
+            self.table = ResponseTable(load_config(self.config_file).get('responses', {}))
+            for charger in self.chargers:
+                charger.render(self.table, self.host)
+            print(f"Config reloaded, {len(self.table.responses)} responses.")
+
+    async def run(self, stats_interval=STATS_INTERVAL):
+        loop = asyncio.get_running_loop()
+        self.reload()
+        transports = []
+        try:
+            for charger in self.chargers:
+                transport, _ = await loop.create_datagram_endpoint(
+                    lambda charger=charger: charger, local_addr=(self.host, charger.port)
+                )
+                transports.append(transport)
+
+            print(
+                f"Simulating {len(self.chargers)} chargers on {self.host} ports "
+                f"{self.chargers[0].port}-{self.chargers[-1].port}..."
+            )
+
+            next_stats = loop.time() + stats_interval
+            while True:
+                await asyncio.sleep(RELOAD_INTERVAL)
+                self.reload()
+                if loop.time() >= next_stats:
+                    self.stats.report([c.faults for c in self.chargers if c.faults is not None])
+                    next_stats += stats_interval
+        finally:
+            for transport in transports:
+                transport.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Simulate Beny Wifi chargers answering from a response table.")
+    parser.add_argument("--config", default=CONFIG_FILE, help="request-response json file")
+    parser.add_argument("--host", default=UDP_IP, help="address chargers listen on")
+    parser.add_argument("--port", type=int, default=UDP_PORT, help="port of first charger")
+    parser.add_argument("--count", type=int, default=1, help="number of chargers, on consecutive ports")
+    parser.add_argument("--serial", type=int, default=SERIAL, help="serial of first charger")
+    parser.add_argument("--model", help="model reported by all chargers")
+    parser.add_argument("--stats-interval", type=float, default=STATS_INTERVAL, help="seconds between stats")
+    parser.add_argument("--stateful", action="store_true", help="answer values, DLB and commands from a charger model")
+    parser.add_argument("--speed", type=float, default=1.0, help="simulated seconds per second of stateful model")
+    parser.add_argument("--loss", type=float, default=0.0, help="probability of losing a request or reply")
+    parser.add_argument("--latency", type=float, default=0.0, help="mean reply delay in seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="spread of reply delay in seconds")
+    parser.add_argument("--distribution", choices=LATENCY_DISTRIBUTIONS, default="fixed", help="reply delay distribution")
+    parser.add_argument("--reorder", type=float, default=0.0, help="probability of holding a reply back")
+    parser.add_argument("--reorder-delay", type=float, default=0.2, help="seconds reordered replies are held back")
+    parser.add_argument("--duplicate", type=float, default=0.0, help="probability of sending a reply twice")
+    parser.add_argument("--corrupt", type=float, default=0.0, help="probability of corrupting reply checksum")
+    parser.add_argument("--faults", help="json file of per-charger fault options by serial")
+    parser.add_argument("--seed", type=int, default=0, help="random seed of network faults")
+    parser.add_argument("--verbose", action="store_true", help="print every packet")
+    args = parser.parse_args()
+
+    default = FaultConfig(
+        loss=args.loss, latency=args.latency, jitter=args.jitter, distribution=args.distribution,
+        reorder=args.reorder, reorder_delay=args.reorder_delay, duplicate=args.duplicate, corrupt=args.corrupt,
+    )
+    fault_configs = load_fault_configs(args.faults, default) if args.faults else (default, {})
+
+    clock = SimClock(args.speed) if args.stateful else None
+    simulator = Simulator(
+        args.config, args.host, args.port, args.count, args.serial, args.model, args.verbose, clock,
+        fault_configs, args.seed,
+    )
     try:
-        modified_time = time.ctime(os.path.getmtime(CONFIG_FILE))
-        if modified_time != last_modified:
-            conf = load_config()
-            last_modified = modified_time
-            print("Config reloaded.")
-    except Exception as e:
-        print(f"Error checking config file: {e}")
-
-    data, addr = sock.recvfrom(1024)
-    data = str(data.decode('ascii')).strip()
-    print(f"Received from {addr}: {data}")
-
-    response = deepcopy(conf['responses'])
-    for request, response in response.items():
-        if check_message(data, request):
-            if type(response) == str:
-                response += f"{calculate_checksum(response):02x}"
-                sock.sendto(response.encode('ascii'), addr)
-            elif type(response) == dict:
-                mtype = SERVER_MESSAGE[response['type']]
-                for key, value in response['params'].items():
-                    if key == "ip":
-                        response['params'][key] = ip_to_hex(value)
-                    elif key == "model":
-                        response['params'][key] = value.encode().hex()
-                        while len(response['params'][key]) < 41:
-                            response['params'][key] += '0'
-                        response['params'][key] += '11001'
-                    else:
-                        response['params'][key] = get_hex(value)
-                response = build_message(mtype, params=response['params'])
-                sock.sendto(response.encode('ascii'), addr)
-            print(f"Sent to {addr}: {response}")
+        asyncio.run(simulator.run(args.stats_interval))
+    except KeyboardInterrupt:
+        pass
@@ -35,7 +35,11 @@ def calculate_checksum(data: str) -> int:
     if "[checksum]" in data:
         data = data[:-len("[checksum]")]
 
-    return sum([int(data[i:i+2], 16) for i in range(0, len(data), 2)]) % 256
+    try:
+        return sum(bytes.fromhex(data)) % 256
+    except ValueError:
+        # odd number of digits, last digit is summed as it is
+        return sum([int(data[i:i+2], 16) for i in range(0, len(data), 2)]) % 256
 
 def get_checksum(data: str) -> int:
     """Get last digits containing checksum.
@@ -186,7 +190,8 @@ DLB_CHARGERS = [
     "BCP-AT1N-L-16",
     "BCP-AT2N-L-16",
     "BCP-BT1N-L-16",
-    "BCP-BT2N-L-16"
+    "BCP-BT2N-L-16",
+    "BCP-A2-L"
 ]
 
 class CHARGER_STATE(Enum):
@@ -219,11 +224,9 @@ class REQUEST_TYPE(Enum):
 
     VALUES = 112
     SETTINGS = 113
+    DLB = 123
     MODEL = 4
 
-def get_length(message, parameter):
-    header_length = message["structure"][parameter].stop - message["structure"][parameter].start
-
 class COMMON(Enum):
     """Common mapping for fixed message contents."""
 
@@ -231,10 +234,17 @@ class COMMON(Enum):
         "description": "Header of message",
         "structure": {
             "header": slice(0, 4),
-            "version": slice(4, 6),
+            "message_type": slice(4, 6),
             "message_id": slice(6, 10)
         },
     }
+    REQUEST_CODE = {
+        "description": "Request type or command code, echoed back by charger in its response",
+        "structure": {
+            "request": slice(18, 20),
+            "response": slice(10, 12)
+        },
+    }
 
 class CLIENT_MESSAGE(Enum):
     """Client message definitions. Defines structures of the messages sent to charger."""
@@ -255,6 +265,14 @@ class CLIENT_MESSAGE(Enum):
             "request_type": slice(18, 20)
         }
     }
+    REQUEST_DLB = {
+        "description": "DLB update request",
+        "hex": "55aa7b000b000[pin][request_type][checksum]",
+        "structure": {
+            "pin": slice(13,18),
+            "request_type": slice(18, 20)
+        }
+    }
     SEND_CHARGER_COMMAND = {
         "description": "Start or stop charging",
         "hex": "55aa10000c000[pin]06[charger_command][checksum]",
@@ -319,9 +337,9 @@ class CLIENT_MESSAGE(Enum):
     }
 
     # DO NOT USE, UNCONFIRMED PARAMETERS
-    SET_VALUES = {
+    SET_MAX_CURRENT = {
         "description": "Send setting values to charger",
-        "hex": "55aa10000d000[pin]6d00[max_amps][checksum]",
+        "hex": "55aa10000d000[pin]6d00[max_current][checksum]",
         "structure": {
             "pin": slice(13,18)
         }
@@ -349,23 +367,22 @@ class SERVER_MESSAGE(Enum):
         }
     }
     SEND_VALUES_1P = {
-        #55aa10001e70000000ee000000557b010000000000000006000000000365
-               #55aa10001e70000000ee000000557b010000000000000006000000000365
         "hex": "55aa700023[request_type]00000[current1][voltage1][power]00e800e80000012b6501000000000000000f00000000035e",
         "description": "Receive values from 1-phase charger",
         "structure": {
             "request_type": slice(10, 12),
-            "current1": slice(17, 18),
+            "current1": slice(14, 16),
             "voltage1": slice(18, 20),
             "power": slice(20, 24),
             "total_kwh": slice(24, 28),
+            "temperature": slice(28, 30),
             "state": slice(30, 32),
             "timer_state": slice(32, 34),
-            "max_current": slice(46, 48),
             "timer_start_h": slice(36, 38),
             "timer_start_min": slice(38, 40),
             "timer_end_h": slice(40, 42),
             "timer_end_min": slice(42, 44),
+            "max_current": slice(46, 48),
             "maximum_session_consumption": slice(48, 50)
         }
     }
@@ -381,16 +398,28 @@ class SERVER_MESSAGE(Enum):
             "voltage3": slice(28, 30),
             "power": slice(30, 34),
             "total_kwh": slice(34, 38),
+            "temperature": slice(38, 40),
             "state": slice(40, 42),
             "timer_state": slice(42, 44),
-            "max_current": slice(56, 58),
             "timer_start_h": slice(44, 46),
             "timer_start_min": slice(46, 48),
             "timer_end_h": slice(50, 52),
             "timer_end_min": slice(52, 54),
+            "max_current": slice(56, 58),
             "maximum_session_consumption": slice(58, 60)
         }
     }
+    SEND_DLB = {
+        "description": "Receive dlb values",
+        "structure": {
+            "request_type": slice(10, 12),
+            "solar_power": slice(18, 20),
+            "ev_power": slice(22, 24),
+            "house_power": slice(26, 28),
+            "grid_export": slice(28, 30),
+            "grid_power": slice(30, 32)
+        }
+    }
     ACCESS_DENIED = {
         "description": "Access denied message",
         "structure": {}
@@ -407,3 +436,22 @@ class SERVER_MESSAGE(Enum):
 
         }
     }
+
+# Message types by (message type, message id) of the message header. None
+# matches any message type. Messages sharing an id are told apart by the
+# request type echoed in the message, None being the default.
+MESSAGE_TYPES: Final = {
+    (None, 8): SERVER_MESSAGE.ACCESS_DENIED,
+    (None, 11): CLIENT_MESSAGE.REQUEST_DATA,
+    (None, 12): CLIENT_MESSAGE.SEND_CHARGER_COMMAND,
+    (None, 17): SERVER_MESSAGE.HANDSHAKE,
+    (0x7B, 17): SERVER_MESSAGE.SEND_DLB,
+    (None, 28): CLIENT_MESSAGE.SET_TIMER,
+    (None, 30): SERVER_MESSAGE.SEND_VALUES_1P,
+    (None, 32): {
+        REQUEST_TYPE.SETTINGS.value: SERVER_MESSAGE.SEND_SETTINGS,
+        None: SERVER_MESSAGE.SEND_MODEL,
+    },
+    (None, 33): SERVER_MESSAGE.SEND_DLB,
+    (None, 35): SERVER_MESSAGE.SEND_VALUES_3P,
+}
@@ -1,4 +1,4 @@
-from const import CLIENT_MESSAGE, COMMON, SERVER_MESSAGE  # noqa: D100
+from const import CLIENT_MESSAGE, COMMON, MESSAGE_TYPES, SERVER_MESSAGE  # noqa: D100
 
 
 def get_hex(data: int, length: int = 2) -> str:
@@ -126,6 +126,26 @@ def convert_pin_to_hex(pin: int) -> str:
 
     return f"{int(pin):05X}".lower()
 
+def find_message_type(message_type: int, message_id: int, code: int | None = None) -> CLIENT_MESSAGE | SERVER_MESSAGE:
+    """Find message structure from MESSAGE_TYPES table.
+
+    Args:
+        message_type (int): message type of header
+        message_id (int): message id of header
+        code (int | None): request type or command code echoed in message
+
+    Returns:
+        CLIENT_MESSAGE | SERVER_MESSAGE: message or None if message is unknown
+
+    """
+    message = MESSAGE_TYPES.get((message_type, message_id))
+    if message is None:
+        message = MESSAGE_TYPES.get((None, message_id))
+    if isinstance(message, dict):
+        message = message.get(code, message[None])
+
+    return message
+
 def get_message_type(data: str) -> CLIENT_MESSAGE | SERVER_MESSAGE:
     """Get message structure by id.
 
@@ -133,30 +153,40 @@ def get_message_type(data: str) -> CLIENT_MESSAGE | SERVER_MESSAGE:
         data (str): message as ascii hex string
 
     Returns:
-        _type_: _description_
+        CLIENT_MESSAGE | SERVER_MESSAGE: message or None if message is unknown
 
     """
+    message_type = int(data[COMMON.FIXED_PART.value["structure"]["message_type"]], 16)
     msg_int = int(data[COMMON.FIXED_PART.value["structure"]["message_id"]], 16)
+    code = None
+    if len(data) >= COMMON.REQUEST_CODE.value["structure"]["response"].stop:
+        code = get_response_code(data)
 
-    if msg_int == 11:
-        return CLIENT_MESSAGE.REQUEST_DATA
-    if msg_int == 28:
-        return CLIENT_MESSAGE.SET_TIMER
-    if msg_int == 12:
-        return CLIENT_MESSAGE.SEND_CHARGER_COMMAND
-
-    if msg_int == 8:
-        return SERVER_MESSAGE.ACCESS_DENIED
-    if msg_int == 30:
-        return SERVER_MESSAGE.SEND_VALUES_1P
-    if msg_int == 35:
-        return SERVER_MESSAGE.SEND_VALUES_3P
-    if msg_int == 17:
-        return SERVER_MESSAGE.HANDSHAKE
-    if msg_int == 32:
-        return SERVER_MESSAGE.SEND_MODEL
-
-    return None
+    return find_message_type(message_type, msg_int, code)
+
+def get_request_code(data: str) -> int:
+    """Get request type or command code from client message.
+
+    Args:
+        data (str): client message as ascii hex string
+
+    Returns:
+        int: request code
+
+    """
+    return int(data[COMMON.REQUEST_CODE.value["structure"]["request"]], 16)
+
+def get_response_code(data: str) -> int:
+    """Get request type or command code echoed in server message.
+
+    Args:
+        data (str): server message as ascii hex string
+
+    Returns:
+        int: request code
+
+    """
+    return int(data[COMMON.REQUEST_CODE.value["structure"]["response"]], 16)
 
 def get_ip(data: str) -> str:
     """Read ip from message.
@@ -0,0 +1,126 @@
+import json
+import random
+from dataclasses import dataclass, fields
+
+LATENCY_DISTRIBUTIONS = ("fixed", "uniform", "normal", "exponential")
+
+
+@dataclass
+class FaultConfig:
+    """Network faults of one virtual charger.
+
+    Probabilities are per packet. Latency is the mean one-way delay of
+    replies in seconds, spread by jitter according to distribution.
+    Reordered replies are held back by reorder_delay more, so replies sent
+    after them overtake them.
+    """
+
+    loss: float = 0.0
+    latency: float = 0.0
+    jitter: float = 0.0
+    distribution: str = "fixed"
+    reorder: float = 0.0
+    reorder_delay: float = 0.2
+    duplicate: float = 0.0
+    corrupt: float = 0.0
+
+    def __post_init__(self):
+        if self.distribution not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(f"Unknown latency distribution: {self.distribution}")
+
+    @property
+    def enabled(self):
+        return any((self.loss, self.latency, self.jitter, self.reorder, self.duplicate, self.corrupt))
+
+
+def load_fault_configs(fault_file, default):
+    """Load per-charger fault configs from json file.
+
+    File maps serials to fault options, "default" key overriding options
+    given on command line for all chargers:
+    {"default": {"loss": 0.05}, "123456790": {"latency": 0.3, "distribution": "exponential"}}
+
+    Returns:
+        tuple[FaultConfig, dict[int, FaultConfig]]: default and per-serial configs
+
+    """
+    with open(fault_file, "r") as f:
+        options = json.load(f)
+
+    names = {field.name for field in fields(FaultConfig)}
+    default_options = {name: getattr(default, name) for name in names}
+    default_options.update(options.pop("default", {}))
+    default = FaultConfig(**default_options)
+
+    configs = {}
+    for serial, charger_options in options.items():
+        configs[int(serial)] = FaultConfig(**{**default_options, **charger_options})
+
+    return default, configs
+
+
+class NetworkFaults:
+    """Seeded fault injection of one virtual charger.
+
+    Every charger draws from its own random generator seeded by seed and
+    serial, so a run is reproducible regardless of how packets of different
+    chargers interleave.
+    """
+
+    def __init__(self, config, seed, serial):
+        self.config = config
+        self.random = random.Random(f"{seed}:{serial}")
+        self.dropped = 0
+        self.duplicated = 0
+        self.reordered = 0
+        self.corrupted = 0
+
+    def drop(self):
+        """Return True if packet is lost."""
+        if self.config.loss and self.random.random() < self.config.loss:
+            self.dropped += 1
+            return True
+        return False
+
+    def delay(self):
+        """Draw one-way delay of reply in seconds."""
+        config = self.config
+        if config.distribution == "uniform":
+            delay = self.random.uniform(config.latency - config.jitter, config.latency + config.jitter)
+        elif config.distribution == "normal":
+            delay = self.random.gauss(config.latency, config.jitter)
+        elif config.distribution == "exponential":
+            delay = config.latency - config.jitter + self.random.expovariate(1 / config.jitter) if config.jitter else config.latency
+        else:
+            delay = config.latency
+
+        if config.reorder and self.random.random() < config.reorder:
+            self.reordered += 1
+            delay += config.reorder_delay
+
+        return max(delay, 0.0)
+
+    def corrupt(self, response):
+        """Return response with its checksum broken."""
+        self.corrupted += 1
+        checksum = (int(response[-2:], 16) + 1 + self.random.randrange(255)) % 256
+        return response[:-2] + f"{checksum:02x}".encode('ascii')
+
+    def replies(self, response):
+        """Return (delay, datagram) pairs sent in reply to one response."""
+        if self.drop():
+            return []
+
+        copies = 1
+        if self.config.duplicate and self.random.random() < self.config.duplicate:
+            self.duplicated += 1
+            copies = 2
+
+        replies = []
+        for _ in range(copies):
+            datagram = response
+            if self.config.corrupt and self.random.random() < self.config.corrupt:
+                datagram = self.corrupt(response)
+            replies.append((self.delay(), datagram))
+
+        return replies
@@ -1,40 +1,99 @@
+import argparse
 import json
-import sys
-from scapy.all import rdpcap, UDP, IP
+from collections import OrderedDict
+from scapy.all import PcapReader, UDP, IP
 
 PCAP_FILE = "capture.pcap"
 OUTPUT_FILE = "output.json"
+WINDOW = 1024 # requests waiting for response at most
+TIMEOUT = 10 # seconds a request waits for its response
 
-def extract_udp_pairs(pcap_file):
-    packets = rdpcap(pcap_file)
-    transactions = []
-    last_request = {}
+def iter_udp_pairs(pcap_file, window=WINDOW, timeout=TIMEOUT):
+    """Yield request-response pairs of capture, reading it packet by packet.
+
+    Requests waiting for their response are kept in a window bounded by
+    size and age, so memory does not grow with capture size.
+
+    Yields:
+        dict: time, addresses and payloads of request and response
+
+    """
+    last_request = OrderedDict()
+
+    with PcapReader(pcap_file) as packets:
+        for pkt in packets:
+            if not (pkt.haslayer(UDP) and pkt.haslayer(IP)):
+                continue
 
-    for pkt in packets:
-        if pkt.haslayer(UDP) and pkt.haslayer(IP):
             src = str(pkt[UDP].sport)
             dst = str(pkt[UDP].dport)
             payload = bytes(pkt[UDP].payload).decode(errors="ignore")  # Decode to ASCII
+            now = float(pkt.time)
 
             key = (pkt[IP].src, pkt[IP].dst, src, dst)
             reverse_key = (pkt[IP].dst, pkt[IP].src, dst, src)
 
             if key in last_request:
-                transactions.append((last_request[key], payload))
-                del last_request[key]
+                sent, request = last_request.pop(key)
+                yield {
+                    "time": sent,
+                    "client": f"{pkt[IP].dst}:{dst}",
+                    "charger": f"{pkt[IP].src}:{src}",
+                    "request": request,
+                    "response": payload,
+                    "latency": round(now - sent, 6),
+                }
             else:
-                last_request[reverse_key] = payload
+                last_request.pop(reverse_key, None)
+                last_request[reverse_key] = (now, payload)
 
-    return {req: resp for req, resp in transactions}
+            # forget requests never answered, after a late response got a
+            # chance to match its request
+            while last_request:
+                _, (sent, _) = next(iter(last_request.items()))
+                if now - sent <= timeout and len(last_request) <= window:
+                    break
+                last_request.popitem(last=False)
+
+def extract_udp_pairs(pcap_file):
+    return {pair["request"]: pair["response"] for pair in iter_udp_pairs(pcap_file)}
 
 def save_to_json(data, output_file):
     with open(output_file, "w") as f:
         json.dump({"responses": data}, f, indent=4)
     print(f"Saved {len(data)} request-response pairs to {output_file}")
 
+def convert(pcap_file, output_file=None, jsonl_file=None):
+    """Convert capture to response table json and/or json lines of all pairs.
+
+    Pairs are written to json lines as they are found. Response table only
+    keeps the last response of each distinct request.
+    """
+    responses = {}
+    count = 0
+    jsonl = open(jsonl_file, "w") if jsonl_file else None
+    try:
+        for pair in iter_udp_pairs(pcap_file):
+            count += 1
+            if output_file:
+                responses[pair["request"]] = pair["response"]
+            if jsonl:
+                jsonl.write(json.dumps(pair) + "\n")
+    finally:
+        if jsonl:
+            jsonl.close()
+
+    if jsonl_file:
+        print(f"Saved {count} request-response pairs to {jsonl_file}")
+    if output_file:
+        save_to_json(responses, output_file)
+
 if __name__ == "__main__":
-    pcap_file = sys.argv[1] if len(sys.argv) > 1 else PCAP_FILE
-    output_file = sys.argv[2] if len(sys.argv) > 2 else OUTPUT_FILE
+    parser = argparse.ArgumentParser(description="Extract UDP request-response pairs from a capture.")
+    parser.add_argument("pcap_file", nargs="?", default=PCAP_FILE, help="capture file")
+    parser.add_argument("output_file", nargs="?", default=OUTPUT_FILE, help="response table json file")
+    parser.add_argument("--jsonl", help="json lines file of all pairs, written as they are found")
+    parser.add_argument("--no-json", action="store_true", help="write json lines only")
+    args = parser.parse_args()
 
-    udp_pairs = extract_udp_pairs(pcap_file)
-    save_to_json(udp_pairs, output_file)
+    convert(args.pcap_file, None if args.no_json else args.output_file, args.jsonl)
@@ -1,5 +1,163 @@
+import argparse
+from collections import deque
+import csv
+from functools import lru_cache, partial
+import gzip
+import io
+import itertools
+import json
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
 from communication import read_message
+from const import CLIENT_MESSAGE, COMMON, SERVER_MESSAGE
+
+CHUNK_SIZE = 10000 # lines decoded by one worker task
+
+# "2025-03-22 10:00:00.123 DEBUG (MainThread) [custom_components.beny_wifi.communication] Message received: 55aa...={...}"
+TIMESTAMP = re.compile(r"^(\d{4}-\d\d-\d\d[ T]\d\d:\d\d:\d\d(?:[.,]\d+)?)")
+RECEIVED = re.compile(r"Message received: (?:b')?([0-9a-fA-F]+)")
+SENT = re.compile(r"Message sent\. Type: \w+\. Content: ([0-9a-fA-F]+)")
+HEX_LINE = re.compile(r"^\s*([0-9a-fA-F]{8,})\s*$")
+
+CSV_COLUMNS = ["time", "direction", "source", "line", "hex"] + list(dict.fromkeys(
+    name
+    for message in (COMMON.FIXED_PART, *SERVER_MESSAGE, *CLIENT_MESSAGE)
+    for name in message.value["structure"]
+)) + ["schedule", "error"]
+
+def parse_line(line):
+    """Return (time, direction, hex) of frame in log line, None if there is none."""
+    if match := RECEIVED.search(line):
+        direction = "received"
+    elif match := SENT.search(line):
+        direction = "sent"
+    elif match := HEX_LINE.match(line):
+        direction = None
+    else:
+        return None
+
+    timestamp = TIMESTAMP.match(line)
+    return (timestamp.group(1) if timestamp else None, direction, match.group(1))
+
+@lru_cache(maxsize=4096)
+def decode_hex(hex_str):
+    """Return decoded fields of frame, cached as logs repeat the same frames."""
+    try:
+        msg = read_message(hex_str)
+    except Exception as e:
+        return {"error": str(e)}
+    if msg is None:
+        return {"error": "unknown message or invalid checksum"}
+    return msg
+
+def decode_chunk(chunk):
+    """Decode frames of (source, line number, line) chunk to records."""
+    records = []
+    for source, number, line in chunk:
+        frame = parse_line(line)
+        if frame is None:
+            continue
+
+        timestamp, direction, hex_str = frame
+        record = {"time": timestamp, "direction": direction, "source": source, "line": number, "hex": hex_str}
+        record.update(decode_hex(hex_str))
+        records.append(record)
+
+    return records
+
+def format_jsonl(records):
+    return "".join(json.dumps(record, default=str) + "\n" for record in records)
+
+def format_csv(records):
+    output = io.StringIO()
+    writer = csv.DictWriter(output, CSV_COLUMNS, extrasaction="ignore")
+    for record in records:
+        writer.writerow({
+            key: json.dumps(value) if isinstance(value, (dict, list)) else value
+            for key, value in record.items()
+        })
+    return output.getvalue()
+
+FORMATS = {"jsonl": format_jsonl, "csv": format_csv}
+
+def convert_chunk(chunk, fmt):
+    """Decode chunk and format its records, returning (text, record count)."""
+    records = decode_chunk(chunk)
+    return FORMATS[fmt](records), len(records)
+
+def open_input(path):
+    if path == "-":
+        return sys.stdin
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", errors="replace")
+    return open(path, "r", errors="replace")
+
+def iter_lines(paths):
+    """Yield (source, line number, line) of all inputs."""
+    for path in paths:
+        with open_input(path) as f:
+            for number, line in enumerate(f, 1):
+                yield path, number, line
+
+def iter_chunks(lines, size=CHUNK_SIZE):
+    while chunk := list(itertools.islice(lines, size)):
+        yield chunk
+
+def convert(paths, output, fmt="jsonl", jobs=1):
+    """Decode frames of inputs and write them to output in input order.
+
+    Chunks of lines are decoded and formatted by a pool of jobs processes,
+    the main process only reads lines and writes results.
+
+    Returns:
+        int: number of frames written
+
+    """
+    if fmt == "csv":
+        csv.writer(output).writerow(CSV_COLUMNS)
+
+    chunks = iter_chunks(iter_lines(paths))
+    count = 0
+    if jobs == 1:
+        results = map(partial(convert_chunk, fmt=fmt), chunks)
+        for text, records in results:
+            output.write(text)
+            count += records
+        return count
+
+    # Executor.map would read all input up front, keep few chunks in flight instead
+    with ProcessPoolExecutor(jobs) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(convert_chunk, chunk, fmt))
+            if len(pending) >= jobs * 2:
+                text, records = pending.popleft().result()
+                output.write(text)
+                count += records
+        for future in pending:
+            text, records = future.result()
+            output.write(text)
+            count += records
+    return count
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Decode hex frames from Home Assistant debug logs, hex dumps or stdin."
+    )
+    parser.add_argument("inputs", nargs="*", default=["-"], help="log files (.gz allowed), - for stdin")
+    parser.add_argument("--format", choices=("jsonl", "csv"), default="jsonl", help="output format")
+    parser.add_argument("--output", "-o", help="output file, stdout if not given")
+    parser.add_argument("--jobs", "-j", type=int, default=os.cpu_count(), help="decoding processes")
+    args = parser.parse_args()
+
+    output = open(args.output, "w", newline="") if args.output else sys.stdout
+    try:
+        count = convert(args.inputs, output, args.format, max(args.jobs or 1, 1))
+    finally:
+        if args.output:
+            output.close()
 
-hex = "hex_heres"
-result = read_message(hex)
-print(result)
\ No newline at end of file
+    print(f"Decoded {count} frames.", file=sys.stderr)
@@ -0,0 +1,152 @@
+import argparse
+import asyncio
+import json
+import time
+
+from communication import read_message
+
+LISTEN_IP = "0.0.0.0"
+LISTEN_PORT = 3333
+CHARGER_PORT = 3333
+TRACE_FILE = "trace.jsonl"
+FLUSH_INTERVAL = 1
+
+def decode(hex_str):
+    """Decode frame with read_message, None if it is not a known message."""
+    try:
+        return read_message(hex_str)
+    except Exception:
+        return None
+
+
+class Trace:
+    """Append-only json lines trace of forwarded frames.
+
+    One record per frame:
+    {"time": 1742648000.123, "direction": "request", "client": "192.168.1.2:50000",
+     "charger": "192.168.1.10:3333", "hex": "55aa...", "decoded": {...}}
+
+    Lines are buffered and flushed once a second, so tracing does not add a
+    write to every forwarded frame.
+    """
+
+    def __init__(self, trace_file):
+        self._file = open(trace_file, "a", encoding="ascii")
+        self.frames = 0
+
+    def write(self, direction, client, charger, data):
+        hex_str = data.decode("ascii", errors="replace").strip()
+        record = {
+            "time": round(time.time(), 6),
+            "direction": direction,
+            "client": f"{client[0]}:{client[1]}",
+            "charger": f"{charger[0]}:{charger[1]}",
+            "hex": hex_str,
+            "decoded": decode(hex_str),
+        }
+        self._file.write(json.dumps(record, default=str) + "\n")
+        self.frames += 1
+
+    def flush(self):
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+class Upstream(asyncio.DatagramProtocol):
+    """Socket towards the charger for one client, forwarding replies back to it."""
+
+    def __init__(self, proxy, client):
+        self.proxy = proxy
+        self.client = client
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data, addr):
+        self.proxy.trace.write("response", self.client, addr, data)
+        self.proxy.forward(self.proxy.transport, data, self.client)
+
+
+class Proxy(asyncio.DatagramProtocol):
+    """UDP proxy forwarding frames of clients to charger and back.
+
+    Every client gets its own socket towards the charger, so replies are
+    returned to the client that sent the request.
+    """
+
+    def __init__(self, charger, trace, delay=0.0):
+        self.charger = charger
+        self.trace = trace
+        self.delay = delay
+        self._upstreams = {}
+        self._connecting = {}
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data, addr):
+        self.trace.write("request", addr, self.charger, data)
+        upstream = self._upstreams.get(addr)
+        if upstream is not None:
+            self.forward(upstream.transport, data)
+        else:
+            self._connecting.setdefault(addr, []).append(data)
+            if len(self._connecting[addr]) == 1:
+                asyncio.get_running_loop().create_task(self._connect(addr))
+
+    async def _connect(self, client):
+        loop = asyncio.get_running_loop()
+        _, upstream = await loop.create_datagram_endpoint(
+            lambda: Upstream(self, client), remote_addr=self.charger
+        )
+        self._upstreams[client] = upstream
+        for data in self._connecting.pop(client):
+            self.forward(upstream.transport, data)
+
+    def forward(self, transport, data, addr=None):
+        """Send datagram after the configured delay."""
+        if self.delay:
+            asyncio.get_running_loop().call_later(self.delay, transport.sendto, data, addr)
+        else:
+            transport.sendto(data, addr)
+
+    def close(self):
+        for upstream in self._upstreams.values():
+            upstream.transport.close()
+        self.transport.close()
+
+
+async def run(listen, charger, trace_file, delay):
+    loop = asyncio.get_running_loop()
+    trace = Trace(trace_file)
+    _, proxy = await loop.create_datagram_endpoint(
+        lambda: Proxy(charger, trace, delay), local_addr=listen
+    )
+    print(f"Proxying {listen[0]}:{listen[1]} to {charger[0]}:{charger[1]}, tracing to {trace_file}...")
+
+    try:
+        while True:
+            await asyncio.sleep(FLUSH_INTERVAL)
+            trace.flush()
+    finally:
+        proxy.close()
+        trace.close()
+        print(f"Traced {trace.frames} frames.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Forward UDP traffic to a charger and trace decoded frames.")
+    parser.add_argument("charger", help="charger ip address")
+    parser.add_argument("--charger-port", type=int, default=CHARGER_PORT, help="charger udp port")
+    parser.add_argument("--host", default=LISTEN_IP, help="address proxy listens on")
+    parser.add_argument("--port", type=int, default=LISTEN_PORT, help="port proxy listens on")
+    parser.add_argument("--trace", default=TRACE_FILE, help="json lines file frames are appended to")
+    parser.add_argument("--delay", type=float, default=0.0, help="seconds added to every forwarded frame")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(run((args.host, args.port), (args.charger, args.charger_port), args.trace, args.delay))
+    except KeyboardInterrupt:
+        pass